@@ -0,0 +1,71 @@
+"""
+Benchmark `bulk_subscription_status()` against a loop of per-account `has_active_subscription()` calls.
+
+    python benchmarks/bench_bulk_status.py [accounts]
+"""
+
+import sys
+import time
+
+import django_setup
+
+django_setup.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection, reset_queries  # noqa: E402
+
+from django_paddle_billing.entitlements import bulk_subscription_status, has_active_subscription  # noqa: E402
+from django_paddle_billing.models import Customer, Product, Subscription  # noqa: E402
+
+STATUSES = ("active", "trialing", "past_due", "canceled")
+# The per-account loop is timed on a sample and extrapolated
+LOOP_SAMPLE = 2_000
+
+
+def main(count=100_000):
+    user_model = get_user_model()
+    user_model.objects.bulk_create([user_model(username=f"account{i}") for i in range(count)], batch_size=5000)
+    account_ids = list(user_model.objects.values_list("pk", flat=True))
+    Customer.objects.create(id="ctm_benchmark", email="benchmark@example.com")
+    product = Product.objects.create(id="pro_benchmark", name="Pro", status="active")
+    Subscription.objects.bulk_create(
+        [
+            Subscription(id=f"sub_{i:026d}", customer_id="ctm_benchmark", account_id=account_id, status=STATUSES[i % 4])
+            for i, account_id in enumerate(account_ids)
+            # One account out of five has no subscription
+            if i % 5
+        ],
+        batch_size=5000,
+    )
+    Subscription.products.through.objects.bulk_create(
+        [
+            Subscription.products.through(subscription_id=subscription_id, product_id=product.pk)
+            for subscription_id in Subscription.objects.values_list("pk", flat=True)
+        ],
+        batch_size=5000,
+    )
+
+    print(f"Subscription status of {count} accounts")  # noqa: T201
+    sample = account_ids[:LOOP_SAMPLE]
+    start = time.perf_counter()
+    for account_id in sample:
+        has_active_subscription(account_id)
+    elapsed = (time.perf_counter() - start) * count / len(sample)
+    print(f"{'has_active_subscription() loop':<40} {elapsed:8.3f}s (extrapolated, {count} queries)")  # noqa: T201
+
+    connection.force_debug_cursor = True
+    reset_queries()
+    start = time.perf_counter()
+    statuses = bulk_subscription_status(account_ids)
+    elapsed = time.perf_counter() - start
+    queries = len(connection.queries)
+    connection.force_debug_cursor = False
+    print(f"{'bulk_subscription_status()':<40} {elapsed:8.3f}s ({queries} queries)")  # noqa: T201
+    if len(statuses) != count:
+        msg = f"bulk_subscription_status() returned {len(statuses)} statuses for {count} accounts"
+        raise RuntimeError(msg)
+
+
+if __name__ == "__main__":
+    with django_setup.benchmark_database():
+        main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,57 @@
+"""
+Benchmark `get_data()` on transactions loaded from the database.
+
+    python benchmarks/bench_get_data.py [count]
+"""
+
+import sys
+import time
+
+import django_setup
+
+django_setup.setup()
+
+from paddle_billing_client.models import transaction  # noqa: E402
+from payloads import transaction_payload  # noqa: E402
+
+from django_paddle_billing.models import Customer, Subscription, Transaction, parsed_data_cache  # noqa: E402
+
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s {elapsed / count * 1_000_000:8.1f}us/row")  # noqa: T201
+
+
+def main(count=10_000):
+    Customer.objects.create(id="ctm_benchmark", email="benchmark@example.com")
+    Subscription.objects.create(id="sub_benchmark", customer_id="ctm_benchmark", status="active")
+    payloads = [transaction.Transaction.model_validate(transaction_payload(i)) for i in range(count)]
+    Transaction.objects.bulk_create(
+        [
+            Transaction(
+                id=payload.id, customer_id=payload.customer_id, data=payload.dict(), custom_data=payload.custom_data
+            )
+            for payload in payloads
+        ]
+    )
+
+    parsed_data_cache.clear()
+    transactions = list(Transaction.objects.all())
+    print(f"Parsing {count} transactions")  # noqa: T201
+    timed("get_data() first call (validation)", count, lambda: [t.get_data() for t in transactions])
+    timed("get_data() repeated call (memoized)", count, lambda: [t.get_data() for t in transactions])
+
+    # Rows loaded again reuse a copy of the payload validated for the same stored `data`
+    transactions = list(Transaction.objects.all())
+    timed("get_data() after loading again", count, lambda: [t.get_data() for t in transactions])
+
+    # Instances written by webhooks and syncs reuse the payload they were built from
+    transactions = [Transaction.from_paddle_data(payload)[0] for payload in payloads]
+    timed("get_data() after from_paddle_data()", count, lambda: [t.get_data() for t in transactions])
+
+
+if __name__ == "__main__":
+    with django_setup.benchmark_database():
+        main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,74 @@
+"""
+Compare the JSON codecs of the `data` fields: bytes stored, encode and decode time per model.
+
+    python benchmarks/bench_json_codec.py [iterations]
+"""
+
+import json
+import sys
+import time
+
+import django_setup
+
+django_setup.setup()
+
+import payloads  # noqa: E402
+from paddle_billing_client.models import customer, price, product, subscription, transaction  # noqa: E402
+
+from django_paddle_billing.encoders import (  # noqa: E402
+    CompressedPaddleJSONEncoder,
+    PaddleJSONDecoder,
+    PrettyJSONEncoder,
+)
+from django_paddle_billing.settings import settings as default_settings  # noqa: E402
+
+MODELS = {
+    "Product": (product.Product, payloads.product_payload),
+    "Price": (price.Price, payloads.price_payload),
+    "Customer": (customer.Customer, payloads.customer_payload),
+    "Subscription": (subscription.Subscription, payloads.subscription_payload),
+    "Transaction": (transaction.Transaction, payloads.transaction_payload),
+}
+
+# name: (JSON_CODEC, JSON_COMPRESSION)
+CODECS = {
+    "pretty (before)": ("pretty", None),
+    "compact": ("compact", None),
+    "orjson": ("orjson", None),
+    "compact + zlib": ("compact", "zlib"),
+    "orjson + zstd": ("orjson", "zstd"),
+}
+
+
+def measure(value, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        encoded = json.dumps(value, cls=CompressedPaddleJSONEncoder)
+    encode = (time.perf_counter() - start) / iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        json.loads(encoded, cls=PaddleJSONDecoder)
+    decode = (time.perf_counter() - start) / iterations
+    return len(encoded.encode()), encode, decode
+
+
+def main(iterations=2_000):
+    # Compress every payload, whatever its size, to show the ratio on each model
+    default_settings["JSON_COMPRESSION_THRESHOLD"] = 0
+    print(f"{'model':<14}{'codec':<18}{'bytes':>8}{'encode us':>12}{'decode us':>12}")  # noqa: T201
+    for name, (model, payload) in MODELS.items():
+        value = model.model_validate(payload(1)).dict()
+        baseline = len(json.dumps(value, cls=PrettyJSONEncoder, indent=4, sort_keys=True).encode())
+        for codec, (json_codec, compression) in CODECS.items():
+            default_settings["JSON_CODEC"] = json_codec
+            default_settings["JSON_COMPRESSION"] = compression
+            size, encode, decode = measure(value, iterations)
+            print(  # noqa: T201
+                f"{name:<14}{codec:<18}{size:>8}{encode * 1e6:>12.1f}{decode * 1e6:>12.1f}"
+                f"  ({size / baseline:.0%} of pretty)"
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
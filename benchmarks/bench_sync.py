@@ -0,0 +1,143 @@
+"""
+End-to-end throughput of `sync_from_paddle` against the local fake Paddle API of `fake_paddle.py`.
+
+    python benchmarks/bench_sync.py [--customers 1000] [--latency 0.0] [--page-size 50] [--rate-limit-every 0]
+        [--fixtures recorded/] [--trace-memory] [--json out.json]
+
+Reports the rows synced per second, the queries per row and the peak memory (RSS of the process, or the peak traced
+by tracemalloc with `--trace-memory`, slower).
+"""
+
+import argparse
+import datetime as dt
+import json
+import logging
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from io import StringIO
+
+import fake_paddle
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--customers", type=int, default=1000)
+parser.add_argument("--fixtures", help="Directory of recorded <resource>.json files")
+parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each API response")
+parser.add_argument("--page-size", type=int, default=50)
+parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer 429 to every Nth API request")
+parser.add_argument("--trace-memory", action="store_true")
+parser.add_argument("--json", help="Write the results to this file")
+args = parser.parse_args()
+
+dataset = (
+    fake_paddle.load_dataset(args.fixtures) if args.fixtures else fake_paddle.generate_dataset(customers=args.customers)
+)
+server = fake_paddle.FakePaddleServer(
+    dataset, latency=args.latency, page_size=args.page_size, rate_limit_every=args.rate_limit_every
+).start()
+
+import django_setup  # noqa: E402
+
+django_setup.setup(PADDLE_API_URL=server.url, PADDLE_API_TOKEN="pdl_fake")
+
+import django  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from django_paddle_billing.models import (  # noqa: E402
+    Address,
+    Business,
+    Customer,
+    Discount,
+    Price,
+    Product,
+    Subscription,
+    SubscriptionItem,
+    Transaction,
+    TransactionItem,
+)
+
+MODELS = (
+    Product,
+    Price,
+    Discount,
+    Customer,
+    Address,
+    Business,
+    Subscription,
+    SubscriptionItem,
+    Transaction,
+    TransactionItem,
+)
+
+
+def main():
+    # The rate limited requests are counted by the server
+    logging.getLogger("django_paddle_billing.retrying").setLevel(logging.ERROR)
+    queries = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    if args.trace_memory:
+        tracemalloc.start()
+    out = StringIO()
+    start = time.perf_counter()
+    with connection.execute_wrapper(count_queries):
+        call_command("sync_from_paddle", stdout=out)
+    elapsed = time.perf_counter() - start
+    if args.trace_memory:
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    else:
+        # Kilobytes on Linux
+        peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    server.stop()
+
+    if "Successfully" not in out.getvalue():
+        print(out.getvalue())  # noqa: T201
+        return 1
+
+    rows = {model.__name__: model.objects.count() for model in MODELS}
+    total_rows = sum(rows.values())
+    results = {
+        "benchmark": "sync",
+        "date": dt.datetime.now(tz=dt.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "latency": args.latency,
+        "page_size": args.page_size,
+        "api_requests": server.requests,
+        "rate_limited": server.rate_limited,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": total_rows / elapsed,
+        "queries": queries,
+        "queries_per_row": queries / total_rows,
+        "peak_memory_mib": peak_memory / 1024 / 1024,
+        "peak_memory_source": "tracemalloc" if args.trace_memory else "rss",
+    }
+
+    for name, count in rows.items():
+        print(f"{name:<20} {count:>10} rows")  # noqa: T201
+    print(f"{'API requests':<20} {server.requests:>10} ({server.rate_limited} rate limited)")  # noqa: T201
+    print(f"{'Sync':<20} {elapsed:>10.2f}s {results['rows_per_second']:.0f} rows/s")  # noqa: T201
+    print(f"{'Queries':<20} {queries:>10} {results['queries_per_row']:.2f} per row")  # noqa: T201
+    memory = f"{results['peak_memory_mib']:.1f} MiB ({results['peak_memory_source']})"
+    print(f"{'Peak memory':<20} {memory:>10}")  # noqa: T201
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    with django_setup.benchmark_database():
+        status = main()
+    sys.exit(status)
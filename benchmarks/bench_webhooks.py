@@ -0,0 +1,175 @@
+"""
+Webhook throughput of `PaddleWebhookView` for each supported event type, with signed payloads and no network.
+
+    python benchmarks/bench_webhooks.py [--events 200] [--workers 8] [--mode sequential|concurrent|all]
+        [--json out.json]
+
+The sequential mode posts the webhooks one by one with the Django test client, the concurrent mode posts them from a
+pool of `--workers` threads, each with its own client and database connection. Set `BENCHMARK_DATABASE_ENGINE`...
+(see `django_setup.py`) to run against PostgreSQL. `--json` writes the results for comparison between releases.
+"""
+
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import django_setup
+
+SECRET_KEY = "pdl_ntfset_benchmark"
+CLIENT_IP = "127.0.0.1"
+
+# The threads of an in-memory SQLite database share a cache with table level locks, use a file instead
+if os.environ.get("BENCHMARK_DATABASE_ENGINE", "django.db.backends.sqlite3") == "django.db.backends.sqlite3":
+    os.environ.setdefault("BENCHMARK_DATABASE_TEST_NAME", os.path.join(tempfile.gettempdir(), "bench_webhooks.sqlite3"))
+
+django_setup.setup(PADDLE_SECRET_KEY=SECRET_KEY, PADDLE_IPS=[CLIENT_IP], PADDLE_SANDBOX=False)
+
+import django  # noqa: E402
+import payloads  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from django_paddle_billing.models import Customer, Price, Product, Subscription  # noqa: E402
+from django_paddle_billing.views import PaddleWebhookView  # noqa: E402
+
+# Entity indexes of each run, so that the concurrent run updates rows created by the sequential one
+FIRST_INDEX = 1
+
+
+def create_fixtures():
+    Customer.objects.create(id="ctm_benchmark", email="benchmark@example.com")
+    Product.objects.create(id="pro_benchmark", name="Pro", status="active")
+    Price.objects.create(id=f"pri_{0:026d}", product_id="pro_benchmark")
+    Subscription.objects.create(id="sub_benchmark", customer_id="ctm_benchmark", status="active")
+
+
+def build_requests(event_type, count):
+    requests = []
+    for index in range(FIRST_INDEX, FIRST_INDEX + count):
+        body = payloads.notification_body(event_type, index)
+        requests.append((body, payloads.sign(body, SECRET_KEY)))
+    return requests
+
+
+def post(client, body, signature):
+    start = time.perf_counter()
+    response = client.post(
+        "/webhook/",
+        body,
+        content_type="application/json",
+        HTTP_PADDLE_SIGNATURE=signature,
+        HTTP_X_FORWARDED_FOR=CLIENT_IP,
+    )
+    return time.perf_counter() - start, response.status_code == HTTPStatus.OK
+
+
+def summarize(mode, event_type, latencies, errors, elapsed):
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "mode": mode,
+        "event_type": event_type,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+    }
+
+
+def run_sequential(event_type, requests):
+    client = Client(raise_request_exception=False)
+    latencies = []
+    errors = 0
+    start = time.perf_counter()
+    for body, signature in requests:
+        latency, ok = post(client, body, signature)
+        latencies.append(latency)
+        errors += not ok
+    return summarize("sequential", event_type, latencies, errors, time.perf_counter() - start)
+
+
+def run_concurrent(event_type, requests, workers):
+    local = threading.local()
+
+    def task(body, signature):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = Client(raise_request_exception=False)
+        return post(client, body, signature)
+
+    barrier = threading.Barrier(workers)
+
+    def close_connections():
+        # One task per worker thread: the connections are closed by the threads that opened them
+        barrier.wait()
+        connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        start = time.perf_counter()
+        results = list(executor.map(task, *zip(*requests)))
+        elapsed = time.perf_counter() - start
+        for future in [executor.submit(close_connections) for _ in range(workers)]:
+            future.result()
+
+    latencies = [latency for latency, _ in results]
+    errors = sum(not ok for _, ok in results)
+    return summarize("concurrent", event_type, latencies, errors, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200, help="Webhooks per event type")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--mode", choices=["sequential", "concurrent", "all"], default="all")
+    parser.add_argument("--event-type", action="append", help="Only benchmark these event types")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    event_types = args.event_type or list(PaddleWebhookView.SUPPORTED_WEBHOOKS)
+    modes = ["sequential", "concurrent"] if args.mode == "all" else [args.mode]
+    create_fixtures()
+
+    results = []
+    print(f"{'mode':<12} {'event type':<32} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")  # noqa: T201
+    for mode in modes:
+        for event_type in event_types:
+            requests = build_requests(event_type, args.events)
+            if mode == "sequential":
+                result = run_sequential(event_type, requests)
+            else:
+                result = run_concurrent(event_type, requests, args.workers)
+            results.append(result)
+            print(  # noqa: T201
+                f"{mode:<12} {event_type:<32} {result['rps']:9.1f} {result['p50_ms']:9.2f} {result['p99_ms']:9.2f}"
+                f" {result['errors']:7d}"
+            )
+
+    if args.json:
+        report = {
+            "benchmark": "webhooks",
+            "date": dt.datetime.now(tz=dt.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "events_per_type": args.events,
+            "workers": args.workers,
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if any(result["errors"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    with django_setup.benchmark_database():
+        status = main()
+    sys.exit(status)
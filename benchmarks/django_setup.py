@@ -0,0 +1,52 @@
+"""
+Configure a standalone Django project for the benchmark scripts.
+
+The database defaults to an in-memory SQLite database; set `BENCHMARK_DATABASE_ENGINE`,
+`BENCHMARK_DATABASE_NAME`, ... to run against another database, e.g. a local PostgreSQL.
+Like the test runner, the benchmarks run in a separate `test_` database created for the run,
+`BENCHMARK_DATABASE_TEST_NAME` overrides its name (e.g. a file for a SQLite database shared by threads).
+"""
+
+import contextlib
+import os
+
+import django
+from django.conf import settings
+from django.test.utils import setup_databases, teardown_databases
+
+
+def setup(**paddle_billing_settings):
+    if not settings.configured:
+        settings.configure(
+            SECRET_KEY="django-paddle-billing-benchmarks",
+            INSTALLED_APPS=[
+                "django.contrib.auth",
+                "django.contrib.contenttypes",
+                "django_paddle_billing",
+            ],
+            DATABASES={
+                "default": {
+                    "ENGINE": os.environ.get("BENCHMARK_DATABASE_ENGINE", "django.db.backends.sqlite3"),
+                    "NAME": os.environ.get("BENCHMARK_DATABASE_NAME", ":memory:"),
+                    "USER": os.environ.get("BENCHMARK_DATABASE_USER", ""),
+                    "PASSWORD": os.environ.get("BENCHMARK_DATABASE_PASSWORD", ""),
+                    "HOST": os.environ.get("BENCHMARK_DATABASE_HOST", ""),
+                    "PORT": os.environ.get("BENCHMARK_DATABASE_PORT", ""),
+                    "TEST": {"NAME": os.environ.get("BENCHMARK_DATABASE_TEST_NAME")},
+                }
+            },
+            DEFAULT_AUTO_FIELD="django.db.models.BigAutoField",
+            ROOT_URLCONF="django_paddle_billing.urls",
+            USE_TZ=True,
+            PADDLE_BILLING=paddle_billing_settings,
+        )
+    django.setup()
+
+
+@contextlib.contextmanager
+def benchmark_database():
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
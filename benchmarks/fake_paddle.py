@@ -0,0 +1,215 @@
+"""
+Local stand-in for the Paddle API, serving the paginated list endpoints used by `sync_from_paddle`.
+
+    python benchmarks/fake_paddle.py [--customers 1000] [--port 8099] [--latency 0.05] [--page-size 50]
+        [--rate-limit-every 20] [--fixtures recorded/]
+
+The entities are generated by `payloads.py`, or loaded from `<resource>.json` files of recorded entities (addresses
+and businesses carrying their `customer_id`). Point `PADDLE_BILLING["PADDLE_API_URL"]` at the printed URL.
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import payloads
+
+RESOURCES = ("products", "prices", "discounts", "customers", "addresses", "businesses", "subscriptions", "transactions")
+# Query parameters filtering the lists, on the field of the same name
+FILTERS = ("customer_id", "subscription_id", "status", "price_id", "product_id")
+MAX_PAGE_SIZE = 200
+
+
+def generate_dataset(customers=1000, products=10, subscriptions_per_customer=1, transactions_per_subscription=3):
+    dataset = {resource: [] for resource in RESOURCES}
+    for i in range(products):
+        dataset["products"].append(payloads.product_payload(i))
+        dataset["prices"].append(payloads.price_payload(i, product_id=payloads.product_payload(i)["id"]))
+        dataset["discounts"].append(payloads.discount_payload(i))
+
+    subscription_index = 0
+    transaction_index = 0
+    for i in range(customers):
+        customer = {**payloads.customer_payload(i), "custom_data": None}
+        address = {**payloads.address_payload(i), "customer_id": customer["id"]}
+        dataset["customers"].append(customer)
+        dataset["addresses"].append(address)
+        dataset["businesses"].append({**payloads.business_payload(i), "customer_id": customer["id"]})
+
+        for _ in range(subscriptions_per_customer):
+            price = dataset["prices"][subscription_index % products]
+            subscription = payloads.subscription_payload(subscription_index, customer_id=customer["id"])
+            subscription.update(custom_data=None, address_id=address["id"])
+            subscription["items"][0]["price"] = price
+            dataset["subscriptions"].append(subscription)
+            subscription_index += 1
+
+            for _ in range(transactions_per_subscription):
+                transaction = payloads.transaction_payload(
+                    transaction_index, customer_id=customer["id"], subscription_id=subscription["id"]
+                )
+                transaction.update(custom_data=None, address_id=address["id"])
+                transaction["items"][0]["price"] = {**transaction["items"][0]["price"], **price}
+                line_item = transaction["details"]["line_items"][0]
+                line_item["price_id"] = price["id"]
+                line_item["product"] = {**line_item["product"], "id": price["product_id"]}
+                dataset["transactions"].append(transaction)
+                transaction_index += 1
+    return dataset
+
+
+def load_dataset(directory):
+    dataset = {resource: [] for resource in RESOURCES}
+    for resource in RESOURCES:
+        path = Path(directory) / f"{resource}.json"
+        if path.exists():
+            dataset[resource] = json.loads(path.read_text())
+    return dataset
+
+
+class FakePaddleServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, dataset, *, host="127.0.0.1", port=0, latency=0.0, page_size=50, rate_limit_every=0):
+        super().__init__((host, port), FakePaddleHandler)
+        self.dataset = dataset
+        self.latency = latency
+        self.page_size = page_size
+        self.rate_limit_every = rate_limit_every
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+        self.lists = {}
+        # Addresses and businesses are listed by customer
+        self.by_customer = {resource: defaultdict(list) for resource in ("addresses", "businesses")}
+        for resource, entities in self.by_customer.items():
+            for entity in dataset[resource]:
+                entities[entity["customer_id"]].append(entity)
+
+    def get_list(self, path, entities, query):
+        """Entities matching the filters of the query and their positions by ID, cached for the next pages"""
+        filters = tuple((key, query[key]) for key in FILTERS if key in query)
+        key = (path, filters)
+        cached = self.lists.get(key)
+        if cached is None:
+            for field, value in filters:
+                accepted = set(value.split(","))
+                entities = [entity for entity in entities if entity.get(field) in accepted]
+            cached = self.lists[key] = (entities, {entity["id"]: i for i, entity in enumerate(entities)})
+        return cached
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class FakePaddleHandler(BaseHTTPRequestHandler):
+    server: FakePaddleServer
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def send_json(self, status, body, headers=None):
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def get_entities(self, path):
+        parts = path.strip("/").split("/")
+        if len(parts) == 1 and parts[0] in self.server.dataset:
+            return self.server.dataset[parts[0]]
+        if len(parts) == 3 and parts[0] == "customers" and parts[2] in self.server.by_customer:  # noqa: PLR2004
+            return self.server.by_customer[parts[2]].get(parts[1], [])
+        return None
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            rate_limited = server.rate_limit_every and server.requests % server.rate_limit_every == 0
+            server.rate_limited += bool(rate_limited)
+        if server.latency:
+            time.sleep(server.latency)
+        if rate_limited:
+            error = {"type": "request_error", "code": "too_many_requests", "detail": "Too many requests"}
+            self.send_json(429, {"error": error}, headers={"Retry-After": "0"})
+            return
+
+        url = urlparse(self.path)
+        entities = self.get_entities(url.path)
+        if entities is None:
+            self.send_json(404, {"error": {"type": "request_error", "code": "not_found", "detail": url.path}})
+            return
+
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        entities, positions = self.server.get_list(url.path, entities, query)
+        start = positions.get(query["after"], len(entities) - 1) + 1 if "after" in query else 0
+        page_size = min(int(query.get("per_page", server.page_size)), MAX_PAGE_SIZE)
+        page = entities[start : start + page_size]
+        has_more = start + page_size < len(entities)
+        next_url = f"{server.url}{url.path}?{urlencode({**query, 'after': page[-1]['id']})}" if page else None
+
+        self.send_json(
+            200,
+            {
+                "data": page,
+                "meta": {
+                    "request_id": f"req_{server.requests:026d}",
+                    "pagination": {
+                        "per_page": page_size,
+                        "next": next_url,
+                        "has_more": has_more,
+                        "estimated_total": len(entities),
+                    },
+                },
+            },
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--fixtures", help="Directory of recorded <resource>.json files")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each response")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer 429 to every Nth request")
+    args = parser.parse_args()
+
+    dataset = load_dataset(args.fixtures) if args.fixtures else generate_dataset(customers=args.customers)
+    server = FakePaddleServer(
+        dataset,
+        port=args.port,
+        latency=args.latency,
+        page_size=args.page_size,
+        rate_limit_every=args.rate_limit_every,
+    )
+    print(f"Fake Paddle API on {server.url}")  # noqa: T201
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
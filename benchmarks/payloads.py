@@ -0,0 +1,284 @@
+"""Realistic Paddle payloads for the benchmark scripts"""
+
+import hashlib
+import hmac
+import json
+import time
+
+
+def transaction_payload(index: int, customer_id="ctm_benchmark", subscription_id="sub_benchmark") -> dict:
+    totals = {"subtotal": "1000", "discount": "0", "tax": "200", "total": "1200"}
+    return {
+        "id": f"txn_{index:026d}",
+        "status": "completed",
+        "customer_id": customer_id,
+        "address_id": "add_benchmark",
+        "business_id": None,
+        "custom_data": {"account_id": str(index)},
+        "currency_code": "USD",
+        "origin": "subscription_recurring",
+        "subscription_id": subscription_id,
+        "invoice_id": f"inv_{index:026d}",
+        "invoice_number": f"123-{index}",
+        "collection_mode": "automatic",
+        "discount_id": None,
+        "billing_period": {"starts_at": "2024-01-01T00:00:00Z", "ends_at": "2024-02-01T00:00:00Z"},
+        "items": [
+            {
+                "price": {
+                    "id": "pri_benchmark",
+                    "product_id": "pro_benchmark",
+                    "description": "Monthly",
+                    "unit_price": {"amount": "1000", "currency_code": "USD"},
+                    "tax_mode": "account_setting",
+                    "billing_cycle": {"interval": "month", "frequency": 1},
+                },
+                "quantity": 1,
+            }
+        ],
+        "details": {
+            "tax_rates_used": [{"tax_rate": "0.2", "totals": totals}],
+            "totals": {
+                **totals,
+                "credit": "0",
+                "balance": "0",
+                "grand_total": "1200",
+                "fee": "60",
+                "earnings": "940",
+                "currency_code": "USD",
+            },
+            "line_items": [
+                {
+                    "id": f"txnitm_{index:026d}",
+                    "price_id": "pri_benchmark",
+                    "quantity": 1,
+                    "tax_rate": "0.2",
+                    "unit_totals": totals,
+                    "totals": totals,
+                    "product": {"id": "pro_benchmark", "name": "Pro", "tax_category": "saas", "status": "active"},
+                }
+            ],
+        },
+        "payments": [
+            {
+                "amount": "1200",
+                "status": "captured",
+                "captured_at": "2024-01-01T00:00:10Z",
+                "method_details": {"type": "card", "card": {"type": "visa", "last4": "4242"}},
+            }
+        ],
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:10Z",
+        "billed_at": "2024-01-01T00:00:05Z",
+    }
+
+
+def product_payload(index: int) -> dict:
+    return {
+        "id": f"pro_{index:026d}",
+        "name": f"Product {index}",
+        "tax_category": "saas",
+        "description": "A product used by the benchmarks",
+        "image_url": "https://example.com/product.png",
+        "custom_data": {"features": ["reports", "exports"]},
+        "status": "active",
+        "type": "standard",
+        "created_at": "2024-01-01T00:00:00Z",
+    }
+
+
+def price_payload(index: int, product_id="pro_benchmark") -> dict:
+    return {
+        "id": f"pri_{index:026d}",
+        "product_id": product_id,
+        "name": "Monthly",
+        "description": "Monthly subscription",
+        "type": "standard",
+        "unit_price": {"amount": "1000", "currency_code": "USD"},
+        "unit_price_overrides": [
+            {"country_codes": ["FR", "DE"], "unit_price": {"amount": "900", "currency_code": "EUR"}},
+        ],
+        "billing_cycle": {"interval": "month", "frequency": 1},
+        "trial_period": None,
+        "tax_mode": "account_setting",
+        "quantity": {"minimum": 1, "maximum": 100},
+        "status": "active",
+        "custom_data": None,
+    }
+
+
+def customer_payload(index: int) -> dict:
+    return {
+        "id": f"ctm_{index:026d}",
+        "name": f"Customer {index}",
+        "email": f"customer{index}@example.com",
+        "marketing_consent": False,
+        "status": "active",
+        "locale": "en",
+        "custom_data": {"account_id": str(index)},
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+def subscription_payload(index: int, customer_id="ctm_benchmark") -> dict:
+    return {
+        "id": f"sub_{index:026d}",
+        "status": "active",
+        "customer_id": customer_id,
+        "address_id": None,
+        "business_id": None,
+        "currency_code": "USD",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+        "started_at": "2024-01-01T00:00:00Z",
+        "first_billed_at": "2024-01-01T00:00:00Z",
+        "next_billed_at": "2024-02-01T00:00:00Z",
+        "collection_mode": "automatic",
+        "current_billing_period": {"starts_at": "2024-01-01T00:00:00Z", "ends_at": "2024-02-01T00:00:00Z"},
+        "billing_cycle": {"interval": "month", "frequency": 1},
+        "items": [
+            {
+                "status": "active",
+                "quantity": 1,
+                "recurring": True,
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z",
+                "previously_billed_at": "2024-01-01T00:00:00Z",
+                "next_billed_at": "2024-02-01T00:00:00Z",
+                "price": price_payload(0),
+            }
+        ],
+        "custom_data": {"account_id": str(index)},
+        "management_urls": {
+            "update_payment_method": "https://example.com/update",
+            "cancel": "https://example.com/cancel",
+        },
+    }
+
+
+def address_payload(index: int) -> dict:
+    return {
+        "id": f"add_{index:026d}",
+        "description": "Head office",
+        "first_line": "1 Infinite Loop",
+        "second_line": None,
+        "city": "Cupertino",
+        "postal_code": "95014",
+        "region": "CA",
+        "country_code": "US",
+        "custom_data": None,
+        "status": "active",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+def business_payload(index: int) -> dict:
+    return {
+        "id": f"biz_{index:026d}",
+        "name": f"Business {index}",
+        "company_number": f"{index:09d}",
+        "tax_identifier": f"FR{index:011d}",
+        "status": "active",
+        "contacts": [{"name": f"Contact {index}", "email": f"contact{index}@example.com"}],
+        "custom_data": None,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+def discount_payload(index: int) -> dict:
+    return {
+        "id": f"dsc_{index:026d}",
+        "status": "active",
+        "description": f"Discount {index}",
+        "enabled_for_checkout": True,
+        "code": f"CODE{index}",
+        "type": "percentage",
+        "amount": "10",
+        "currency_code": None,
+        "recur": True,
+        "maximum_recurring_intervals": 3,
+        "usage_limit": None,
+        "restrict_to": None,
+        "expires_at": None,
+        "custom_data": None,
+        "times_used": 0,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+def adjustment_payload(index: int, transaction_id="txn_benchmark") -> dict:
+    return {
+        "id": f"adj_{index:026d}",
+        "action": "refund",
+        "transaction_id": transaction_id,
+        "subscription_id": "sub_benchmark",
+        "customer_id": "ctm_benchmark",
+        "reason": "Refund requested by the customer",
+        "currency_code": "USD",
+        "status": "pending_approval",
+        "items": [{"item_id": f"txnitm_{index:026d}", "type": "full", "amount": "1200"}],
+        "totals": {"subtotal": "1000", "tax": "200", "total": "1200", "fee": "60", "earnings": "940"},
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+def payout_payload(index: int) -> dict:
+    return {"id": f"pay_{index:026d}", "status": "paid", "amount": "100000", "currency_code": "USD"}
+
+
+def report_payload(index: int) -> dict:
+    return {
+        "id": f"rep_{index:026d}",
+        "status": "ready",
+        "rows": 100,
+        "type": "transactions",
+        "filters": [],
+        "expires_at": "2024-02-01T00:00:00Z",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+def entity_payload(event_type: str, index: int) -> dict:
+    """Payload of the entity of a webhook, `event_type` being e.g. `subscription.updated`"""
+    entity, _, _ = event_type.partition(".")
+    if entity == "subscription":
+        # Accounts are not created by the benchmarks
+        return {**subscription_payload(index), "custom_data": None}
+    if entity == "transaction":
+        return {**transaction_payload(index), "custom_data": None}
+    return {
+        "address": address_payload,
+        "adjustment": adjustment_payload,
+        "business": business_payload,
+        "customer": customer_payload,
+        "discount": discount_payload,
+        "payout": payout_payload,
+        "price": price_payload,
+        "product": product_payload,
+        "report": report_payload,
+    }[entity](index)
+
+
+def notification_body(event_type: str, index: int, occurred_at="2024-01-01T00:00:00Z") -> bytes:
+    return json.dumps(
+        {
+            "event_id": f"evt_{index:026d}",
+            "notification_id": f"ntf_{index:026d}",
+            "event_type": event_type,
+            "occurred_at": occurred_at,
+            "data": entity_payload(event_type, index),
+        }
+    ).encode()
+
+
+def sign(body: bytes, secret_key: str, timestamp=None) -> str:
+    """`Paddle-Signature` header of a webhook body"""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    signature = hmac.new(secret_key.encode(), f"{timestamp}:".encode() + body, hashlib.sha256).hexdigest()
+    return f"ts={timestamp};h1={signature}"
@@ -0,0 +1,308 @@
+"""
+Out-of-order and concurrent webhooks for the same entities, checking that the newest `occurred_at` always wins.
+
+    python benchmarks/stress_webhooks.py [--entities 50] [--versions 6] [--duplicates 0.3] [--workers 16]
+        [--seed 0] [--json out.json]
+
+Each subscription, transaction and customer gets `--versions` successive states, delivered as signed webhooks
+(`subscription.updated`, `subscription.past_due`, `transaction.paid`, ...) shuffled, partly duplicated, from a pool of
+`--workers` threads. Failed deliveries are retried like Paddle does. The script reports the throughput, the time spent
+waiting for row locks, the lock timeouts and deadlocks, and exits 1 when a row does not hold its newest state.
+
+Row locks need a real database: set `BENCHMARK_DATABASE_ENGINE=django.db.backends.postgresql`, ... (see
+`django_setup.py`). SQLite locks the whole database, its "database is locked" errors are counted as lock timeouts.
+"""
+
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import django_setup
+
+SECRET_KEY = "pdl_ntfset_benchmark"
+CLIENT_IP = "127.0.0.1"
+OCCURRED_AT = dt.datetime(2024, 7, 1, tzinfo=dt.timezone.utc)
+
+# Successive states of each entity and the event announcing them
+SUBSCRIPTION_EVENTS = (
+    ("active", "subscription.updated"),
+    ("past_due", "subscription.past_due"),
+    ("active", "subscription.activated"),
+    ("paused", "subscription.paused"),
+    ("active", "subscription.resumed"),
+    ("canceled", "subscription.canceled"),
+)
+TRANSACTION_EVENTS = (
+    ("draft", "transaction.created"),
+    ("ready", "transaction.ready"),
+    ("billed", "transaction.billed"),
+    ("past_due", "transaction.past_due"),
+    ("paid", "transaction.paid"),
+    ("completed", "transaction.completed"),
+)
+LOCK_ERRORS = ("database is locked", "lock timeout", "lock wait timeout", "could not obtain lock")
+DEADLOCK_ERRORS = ("deadlock",)
+
+if os.environ.get("BENCHMARK_DATABASE_ENGINE", "django.db.backends.sqlite3") == "django.db.backends.sqlite3":
+    os.environ.setdefault("BENCHMARK_DATABASE_TEST_NAME", os.path.join(tempfile.gettempdir(), "stress.sqlite3"))
+
+django_setup.setup(PADDLE_SECRET_KEY=SECRET_KEY, PADDLE_IPS=[CLIENT_IP], PADDLE_SANDBOX=False)
+
+import django  # noqa: E402
+import payloads  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from django_paddle_billing import synthetic  # noqa: E402
+from django_paddle_billing.models import Customer, Subscription, Transaction  # noqa: E402
+
+
+class Delivery:
+    def __init__(self, model, entity_id, version, event_type, data):
+        self.model = model
+        self.entity_id = entity_id
+        self.version = version
+        self.occurred_at = OCCURRED_AT + dt.timedelta(seconds=version)
+        body = {
+            "event_id": f"evt_{entity_id}_{version}",
+            "notification_id": f"ntf_{entity_id}_{version}",
+            "event_type": event_type,
+            "occurred_at": self.occurred_at.isoformat().replace("+00:00", "Z"),
+            "data": data,
+        }
+        self.body = json.dumps(body).encode()
+        self.data = data
+
+
+def build_deliveries(bundles, versions):
+    """All the versions of every entity, the expected final state being the last one"""
+    deliveries = []
+    for bundle in bundles:
+        for version in range(versions):
+            data = {**bundle.customer.model_dump(mode="json"), "name": f"{bundle.customer.name} v{version}"}
+            deliveries.append(Delivery(Customer, bundle.customer.id, version, "customer.updated", data))
+        for _subscription in bundle.subscriptions:
+            for version in range(versions):
+                status, event_type = SUBSCRIPTION_EVENTS[version % len(SUBSCRIPTION_EVENTS)]
+                data = _subscription.model_dump(mode="json")
+                data["status"] = status
+                # The quantity of the first item tells the versions apart
+                data["items"][0]["quantity"] = version + 1
+                deliveries.append(Delivery(Subscription, _subscription.id, version, event_type, data))
+        # The first transaction is created by the events, the next ones are updated
+        for _transaction in bundle.transactions[:2]:
+            for version in range(versions):
+                status, event_type = TRANSACTION_EVENTS[version % len(TRANSACTION_EVENTS)]
+                data = {**_transaction.model_dump(mode="json"), "status": status}
+                deliveries.append(Delivery(Transaction, _transaction.id, version, event_type, data))
+    return deliveries
+
+
+def create_fixtures(generator, bundles):
+    synthetic.load_catalog(generator.catalog)
+    synthetic.bulk_load([bundle._replace(transactions=bundle.transactions[1:]) for bundle in bundles])
+
+
+def classify(exc_info) -> str:
+    message = str(exc_info[1]).lower() if exc_info else ""
+    if any(error in message for error in DEADLOCK_ERRORS):
+        return "deadlock"
+    if any(error in message for error in LOCK_ERRORS):
+        return "lock_timeout"
+    return "error"
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.failures = Counter()
+        self.lock_waits = []
+        self.undelivered = []
+
+    def add(self, latencies, failures, lock_waits):
+        with self.lock:
+            self.latencies.extend(latencies)
+            self.failures.update(failures)
+            self.lock_waits.extend(lock_waits)
+
+
+def run(deliveries, workers, max_attempts, lock_wait_threshold):
+    stats = Stats()
+    local = threading.local()
+
+    def deliver(delivery):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = Client(raise_request_exception=False)
+        lock_waits = []
+
+        def time_locks(execute, sql, params, many, context):
+            if "FOR UPDATE" not in sql:
+                return execute(sql, params, many, context)
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                lock_waits.append(time.perf_counter() - start)
+
+        latencies = []
+        failures = Counter()
+        signature = payloads.sign(delivery.body, SECRET_KEY)
+        for attempt in range(max_attempts):
+            start = time.perf_counter()
+            with connection.execute_wrapper(time_locks):
+                response = client.post(
+                    "/webhook/",
+                    delivery.body,
+                    content_type="application/json",
+                    HTTP_PADDLE_SIGNATURE=signature,
+                    HTTP_X_FORWARDED_FOR=CLIENT_IP,
+                )
+            latencies.append(time.perf_counter() - start)
+            if response.status_code == 200:  # noqa: PLR2004
+                break
+            failures[classify(getattr(response, "exc_info", None))] += 1
+            # Paddle retries with a backoff
+            time.sleep(0.01 * 2**attempt * random.random())  # noqa: S311
+        else:
+            with stats.lock:
+                stats.undelivered.append(delivery)
+        stats.add(latencies, failures, [wait for wait in lock_waits if wait >= lock_wait_threshold])
+
+    barrier = threading.Barrier(workers)
+
+    def close_connections():
+        barrier.wait()
+        connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        start = time.perf_counter()
+        list(executor.map(deliver, deliveries))
+        elapsed = time.perf_counter() - start
+        for future in [executor.submit(close_connections) for _ in range(workers)]:
+            future.result()
+    return stats, elapsed
+
+
+def verify(deliveries) -> list[str]:
+    """Entities whose row does not hold the state of their newest event"""
+    newest = {}
+    for delivery in deliveries:
+        key = (delivery.model, delivery.entity_id)
+        if key not in newest or delivery.version > newest[key].version:
+            newest[key] = delivery
+
+    rows = {
+        model: model.objects.in_bulk([entity_id for _model, entity_id in newest if _model is model])
+        for model in (Customer, Subscription, Transaction)
+    }
+    mismatches = []
+    for (model, entity_id), delivery in newest.items():
+        row = rows[model].get(entity_id)
+        if row is None:
+            mismatches.append(f"{model.__name__} {entity_id}: missing")
+            continue
+        if row.occurred_at != delivery.occurred_at:
+            mismatches.append(f"{model.__name__} {entity_id}: occurred_at {row.occurred_at} != {delivery.occurred_at}")
+        if model is Customer and row.name != delivery.data["name"]:
+            mismatches.append(f"Customer {entity_id}: name {row.name!r} != {delivery.data['name']!r}")
+        if model is not Customer and row.status != delivery.data["status"]:
+            mismatches.append(f"{model.__name__} {entity_id}: status {row.status} != {delivery.data['status']}")
+        if model is Subscription:
+            first_item = delivery.data["items"][0]
+            item = row.items.filter(price_id=first_item["price"]["id"]).first()
+            if item is None or item.quantity != first_item["quantity"]:
+                quantity = item.quantity if item else None
+                mismatches.append(f"Subscription {entity_id}: quantity {quantity} != {first_item['quantity']}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=50, help="Customers, with their subscriptions and transactions")
+    parser.add_argument("--versions", type=int, default=6, help="States delivered for each entity")
+    parser.add_argument("--duplicates", type=float, default=0.3, help="Share of the events delivered twice")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--max-attempts", type=int, default=10, help="Deliveries of an event before giving up")
+    parser.add_argument("--lock-wait-threshold", type=float, default=0.005, help="Seconds counted as a lock wait")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)  # noqa: S311
+    generator = synthetic.DatasetGenerator(seed=args.seed, products=5, discounts=0, months=3)
+    bundles = [bundle for bundle in generator.generate(args.entities) if bundle.subscriptions]
+    create_fixtures(generator, bundles)
+
+    deliveries = build_deliveries(bundles, args.versions)
+    deliveries += rng.sample(deliveries, int(len(deliveries) * args.duplicates))
+    rng.shuffle(deliveries)
+
+    stats, elapsed = run(deliveries, args.workers, args.max_attempts, args.lock_wait_threshold)
+    mismatches = verify(deliveries)
+
+    quantiles = statistics.quantiles(stats.latencies, n=100, method="inclusive")
+    results = {
+        "benchmark": "stress_webhooks",
+        "date": dt.datetime.now(tz=dt.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "workers": args.workers,
+        "events": len(deliveries),
+        "requests": len(stats.latencies),
+        "seconds": elapsed,
+        "events_per_second": len(deliveries) / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "retries": len(stats.latencies) - len(deliveries),
+        "lock_timeouts": stats.failures["lock_timeout"],
+        "deadlocks": stats.failures["deadlock"],
+        "errors": stats.failures["error"],
+        "lock_waits": len(stats.lock_waits),
+        "lock_wait_seconds": sum(stats.lock_waits),
+        "undelivered": len(stats.undelivered),
+        "mismatches": len(mismatches),
+    }
+
+    for name in (
+        "events",
+        "requests",
+        "events_per_second",
+        "p50_ms",
+        "p99_ms",
+        "retries",
+        "lock_timeouts",
+        "deadlocks",
+        "errors",
+        "lock_waits",
+        "lock_wait_seconds",
+        "undelivered",
+        "mismatches",
+    ):
+        value = results[name]
+        print(f"{name:<20} {value:>12.2f}" if isinstance(value, float) else f"{name:<20} {value:>12}")  # noqa: T201
+    for mismatch in mismatches[:20]:
+        print(mismatch)  # noqa: T201
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 1 if mismatches or stats.undelivered else 0
+
+
+if __name__ == "__main__":
+    with django_setup.benchmark_database():
+        status = main()
+    sys.exit(status)
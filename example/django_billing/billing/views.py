@@ -10,7 +10,7 @@ router = Router()
 @router.get("/products", response=ProductSubscriptionSchema)
 def products(request):
     products = Product.objects.values("id", "name", "created_at", "updated_at", "status")
-    subscriptions = Subscription.objects.filter(account_id=1).prefetch_related("products").all()
+    subscriptions = Subscription.objects.for_account(1).with_products()
     result = {"products": list(products), "subscriptions": list(subscriptions)}
 
     return result
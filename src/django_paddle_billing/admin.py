@@ -1,19 +1,27 @@
+import json
 import typing
 
 from django.conf import settings
 from django.contrib import admin
 from django.db import models
+from django.db.models import Prefetch
+from django.utils.html import format_html
 
 from django_paddle_billing import settings as app_settings
+from django_paddle_billing.encoders import PrettyJSONEncoder
 from django_paddle_billing.models import (
     Address,
     Business,
     Customer,
+    DailyMetrics,
     Discount,
     Price,
     Product,
     Subscription,
+    SubscriptionItem,
     Transaction,
+    TransactionItem,
+    WebhookEvent,
 )
 
 # Check if unfold is in installed apps
@@ -23,6 +31,44 @@ else:
     from django.contrib.admin import ModelAdmin, StackedInline, TabularInline
 
 
+class PaddleSearchMixin:
+    """Route the changelist search box through the model's `PaddleSearchQuerySet.search()`"""
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return queryset.search(search_term), False
+
+
+class PrettyJSONMixin:
+    """
+    Display the JSON fields indented on read-only change pages,
+    whatever the `JSON_CODEC` used to store them.
+    """
+
+    pretty_json_fields: typing.ClassVar = ("data", "custom_data")
+
+    def get_fields(self, request, obj=None):
+        fields = super().get_fields(request, obj)
+        if obj is None or self.has_change_permission(request, obj):
+            return fields
+        return [f"pretty_{name}" if name in self.pretty_json_fields else name for name in fields]
+
+    @staticmethod
+    def _pretty_json(value):
+        if value is None:
+            return "-"
+        return format_html("<pre>{}</pre>", json.dumps(value, cls=PrettyJSONEncoder, indent=4, sort_keys=True))
+
+    @admin.display(description="Data")
+    def pretty_data(self, obj):
+        return self._pretty_json(obj.data)
+
+    @admin.display(description="Custom data")
+    def pretty_custom_data(self, obj):
+        return self._pretty_json(obj.custom_data)
+
+
 class AddressInline(StackedInline):
     model = Address
     extra = 1
@@ -60,9 +106,22 @@ class TransactionInline(TabularInline):
     show_change_link = True
 
 
+class SubscriptionItemInline(TabularInline):
+    model = SubscriptionItem
+    extra = 0
+    can_delete = False
+
+
+class TransactionItemInline(TabularInline):
+    model = TransactionItem
+    extra = 0
+    can_delete = False
+
+
 @admin.register(Address)
-class AddressAdmin(ModelAdmin):
+class AddressAdmin(PrettyJSONMixin, ModelAdmin):
     list_display = ["customer_email", "country_code", "postal_code", "status"]
+    list_select_related = ["customer"]
     inlines = (SubscriptionInline,)
     formfield_overrides: typing.ClassVar = {
         models.JSONField: {"widget": app_settings.ADMIN_JSON_EDITOR_WIDGET},
@@ -90,7 +149,7 @@ class AddressAdmin(ModelAdmin):
 
 
 @admin.register(Business)
-class BusinessAdmin(ModelAdmin):
+class BusinessAdmin(PrettyJSONMixin, ModelAdmin):
     list_display = [
         "name",
         "company_number",
@@ -129,7 +188,7 @@ class BusinessAdmin(ModelAdmin):
 
 
 @admin.register(Product)
-class ProductAdmin(ModelAdmin):
+class ProductAdmin(PrettyJSONMixin, ModelAdmin):
     list_display = [
         "name",
         "status",
@@ -146,7 +205,7 @@ class ProductAdmin(ModelAdmin):
 
 
 @admin.register(Price)
-class PriceAdmin(ModelAdmin):
+class PriceAdmin(PrettyJSONMixin, ModelAdmin):
     list_display = [
         "name",
         "unit_price",
@@ -194,7 +253,7 @@ class PriceAdmin(ModelAdmin):
 
 
 @admin.register(Discount)
-class DiscountAdmin(ModelAdmin):
+class DiscountAdmin(PrettyJSONMixin, ModelAdmin):
     list_display = [
         "discount_description",
         "amount",
@@ -252,7 +311,7 @@ class DiscountAdmin(ModelAdmin):
 
 
 @admin.register(Subscription)
-class SubscriptionAdmin(ModelAdmin):
+class SubscriptionAdmin(PaddleSearchMixin, PrettyJSONMixin, ModelAdmin):
     list_display = [
         "customer_email",
         "name",
@@ -260,7 +319,10 @@ class SubscriptionAdmin(ModelAdmin):
         "next_payment",
         "status",
     ]
+    list_select_related = ["customer"]
+    search_fields = ["id", "customer__email", "customer__name"]
     inlines = (
+        SubscriptionItemInline,
         TransactionInline,
         ProductInline,
     )
@@ -313,13 +375,14 @@ class SubscriptionAdmin(ModelAdmin):
 
 
 @admin.register(Customer)
-class CustomerAdmin(ModelAdmin):
+class CustomerAdmin(PaddleSearchMixin, PrettyJSONMixin, ModelAdmin):
     list_display = [
         "email",
         "name",
         "status",
         "created_at",
     ]
+    search_fields = ["id", "email", "name"]
     inlines = (
         AddressInline,
         BusinessInline,
@@ -339,12 +402,21 @@ class CustomerAdmin(ModelAdmin):
 
 
 @admin.register(Transaction)
-class TransactionAdmin(ModelAdmin):
+class TransactionAdmin(PrettyJSONMixin, ModelAdmin):
     list_display = ["customer_email", "payment_amount", "payment_method", "date_paid", "products", "status"]
+    inlines = (TransactionItemInline,)
     formfield_overrides: typing.ClassVar = {
         models.JSONField: {"widget": app_settings.ADMIN_JSON_EDITOR_WIDGET},
     }
 
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("customer")
+            .prefetch_related(Prefetch("items", queryset=TransactionItem.objects.select_related("product")))
+        )
+
     def has_change_permission(self, request, obj=None):
         return not app_settings.ADMIN_READONLY
 
@@ -356,6 +428,8 @@ class TransactionAdmin(ModelAdmin):
         return ""
 
     def payment_amount(self, obj=None):
+        if obj and obj.total is not None:
+            return obj.total / 100
         if obj and obj.data:
             try:
                 return int(obj.data["details"]["totals"]["total"]) / 100
@@ -383,16 +457,69 @@ class TransactionAdmin(ModelAdmin):
         return ""
 
     def products(self, obj=None):
-        if obj and obj.data:
-            items = obj.data.get("items", [])
-            # return items
-            products = Product.objects.filter(id__in=[item["price"]["product_id"] for item in items])
-            return ", ".join([product.name for product in products])
+        if obj:
+            return ", ".join([item.product.name for item in obj.items.all() if item.product])
         return ""
 
     products.short_description = "Product(s)"
 
     def status(self, obj=None):
+        if obj and obj.status:
+            return obj.status
         if obj and obj.data:
             return obj.data.get("status", "")
         return ""
+
+
+@admin.register(DailyMetrics)
+class DailyMetricsAdmin(ModelAdmin):
+    list_display = [
+        "date",
+        "currency_code",
+        "mrr",
+        "arr",
+        "active_count",
+        "new_mrr",
+        "expansion_mrr",
+        "contraction_mrr",
+        "churned_mrr",
+        "new_count",
+        "churned_count",
+    ]
+    list_filter = ["currency_code"]
+    date_hierarchy = "date"
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_levels()
+
+    @admin.display(description="MRR", ordering="mrr")
+    def mrr(self, obj):
+        return obj.mrr
+
+    @admin.display(description="Active", ordering="active_count")
+    def active_count(self, obj):
+        return obj.active_count
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(PrettyJSONMixin, ModelAdmin):
+    list_display = ["event_type", "entity_id", "status", "attempts", "occurred_at", "received_at", "processed_at"]
+    list_filter = ["status", "event_type"]
+    search_fields = ["event_id", "entity_id"]
+    pretty_json_fields: typing.ClassVar = ("payload",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Payload")
+    def pretty_payload(self, obj):
+        return self._pretty_json(obj.payload)
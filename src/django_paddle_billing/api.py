@@ -0,0 +1,256 @@
+"""
+Read-only REST API, requires djangorestframework (`pip install django-paddle-billing[api]`).
+
+    urlpatterns = [path("billing/api/", include("django_paddle_billing.api"))]
+
+- Lists are paginated with a cursor on the primary key, `?updated_after=` returns the rows changed since a time.
+- `?fields=id,status,data` selects the returned fields, `data` is only returned when requested.
+- `POST subscription-status/` returns the subscription state of many accounts at once.
+- Responses carry an ETag and a Last-Modified header derived from the `updated_at` of the rows of the page, conditional
+  requests (`If-None-Match`, `If-Modified-Since`) get a 304 without any row being serialized, and without reading the
+  other pages. Every write to the rows must bump `updated_at`, including `update()` and `bulk_update()`.
+"""
+
+import hashlib
+from typing import ClassVar
+
+from django.core.exceptions import ValidationError
+from django.db.models import Prefetch
+from django.urls import path
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.utils.module_loading import import_string
+from rest_framework import exceptions, routers, serializers, viewsets
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from django_paddle_billing import entitlements
+from django_paddle_billing import settings as app_settings
+from django_paddle_billing.models import Customer, Price, Product, Subscription, Transaction
+
+# Fields only returned when requested with `?fields=`
+DEFERRED_FIELDS = ("data",)
+
+
+class PaddleCursorPagination(CursorPagination):
+    # Paddle ids are unique and indexed, a stable cursor whatever the table size
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class SparseFieldsSerializer(serializers.ModelSerializer):
+    """Serializer returning the fields listed in the `fields` query parameter, or all but `DEFERRED_FIELDS`"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = get_requested_fields(self.context.get("request"), self.fields)
+        for name in set(self.fields) - requested:
+            self.fields.pop(name)
+
+
+def get_requested_fields(request, available) -> set[str]:
+    value = request.query_params.get("fields") if request is not None else None
+    if not value:
+        return set(available) - set(DEFERRED_FIELDS)
+    return {name.strip() for name in value.split(",")} & set(available)
+
+
+class CustomerSerializer(SparseFieldsSerializer):
+    class Meta:
+        model = Customer
+        fields = ("id", "email", "name", "custom_data", "data", "created_at", "updated_at", "occurred_at")
+
+
+class ProductSerializer(SparseFieldsSerializer):
+    class Meta:
+        model = Product
+        fields = ("id", "name", "status", "custom_data", "data", "created_at", "updated_at", "occurred_at")
+
+
+class PriceSerializer(SparseFieldsSerializer):
+    class Meta:
+        model = Price
+        fields = ("id", "product", "custom_data", "data", "created_at", "updated_at", "occurred_at")
+
+
+class SubscriptionSerializer(SparseFieldsSerializer):
+    class Meta:
+        model = Subscription
+        fields = (
+            "id",
+            "customer",
+            "account",
+            "status",
+            "products",
+            "mrr",
+            "currency_code",
+            "custom_data",
+            "data",
+            "created_at",
+            "updated_at",
+            "occurred_at",
+        )
+
+
+class TransactionSerializer(SparseFieldsSerializer):
+    class Meta:
+        model = Transaction
+        fields = (
+            "id",
+            "customer",
+            "subscription",
+            "status",
+            "currency_code",
+            "subtotal",
+            "tax",
+            "total",
+            "billed_at",
+            "custom_data",
+            "data",
+            "created_at",
+            "updated_at",
+            "occurred_at",
+        )
+
+
+class PaddlePermissionsMixin:
+    def get_permissions(self):
+        return [import_string(permission)() for permission in app_settings.API_PERMISSION_CLASSES]
+
+
+class PaddleReadOnlyViewSet(PaddlePermissionsMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only viewset with sparse fields and conditional GET.
+
+    `filter_fields` maps query parameters to lookups, e.g. {"status": "status"} filters on `?status=active`.
+    """
+
+    pagination_class = PaddleCursorPagination
+    # Served by the `updated_at` indexes, for clients polling the changes
+    common_filter_fields: ClassVar[dict[str, str]] = {"updated_after": "updated_at__gte"}
+    filter_fields: ClassVar[dict[str, str]] = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        for param, lookup in {**self.common_filter_fields, **self.filter_fields}.items():
+            value = self.request.query_params.get(param)
+            if value is not None:
+                try:
+                    queryset = queryset.filter(**{lookup: value})
+                except (ValidationError, ValueError) as e:
+                    raise exceptions.ValidationError({param: str(e)}) from e
+        requested = get_requested_fields(self.request, self.get_serializer_class().Meta.fields)
+        deferred = [name for name in DEFERRED_FIELDS if name not in requested]
+        if deferred:
+            queryset = queryset.defer(*deferred)
+        return queryset
+
+    def get_conditional_response(self, rows, links=()):
+        """Return a 304 response when the client copy of `rows` is current, or the validators to send with them"""
+        last_modified = max((row.updated_at for row in rows), default=None)
+        # The query string selects the rows and fields of the response, the ids reveal deletions and the links of
+        # the page the rows added after it
+        versions = ",".join(f"{row.pk}@{row.updated_at.isoformat()}" for row in rows)
+        key = f"{self.request.get_full_path()}:{':'.join(link or '' for link in links)}:{versions}"
+        etag = quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+        # HTTP dates are in seconds: until the second of the last change is over, another change could happen in the
+        # same second and not be newer than the Last-Modified sent, so only the ETag (in microseconds) is sent
+        timestamp = None
+        if last_modified and int(last_modified.timestamp()) < int(timezone.now().timestamp()):
+            timestamp = int(last_modified.timestamp())
+
+        response = get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+        return response, etag, timestamp
+
+    def set_validators(self, response, etag, timestamp):
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        # The validators are computed from the page already read, not from the whole filtered table
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        links = (self.paginator.get_next_link(), self.paginator.get_previous_link())
+        not_modified, etag, timestamp = self.get_conditional_response(page, links)
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(page, many=True)
+        return self.set_validators(self.get_paginated_response(serializer.data), etag, timestamp)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        not_modified, etag, timestamp = self.get_conditional_response([instance])
+        if not_modified is not None:
+            return not_modified
+        return self.set_validators(Response(self.get_serializer(instance).data), etag, timestamp)
+
+
+class CustomerViewSet(PaddleReadOnlyViewSet):
+    queryset = Customer.objects.all()
+    serializer_class = CustomerSerializer
+    filter_fields: ClassVar = {"email": "email"}
+
+
+class ProductViewSet(PaddleReadOnlyViewSet):
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    filter_fields: ClassVar = {"status": "status"}
+
+
+class PriceViewSet(PaddleReadOnlyViewSet):
+    queryset = Price.objects.all()
+    serializer_class = PriceSerializer
+    filter_fields: ClassVar = {"product": "product_id"}
+
+
+class SubscriptionViewSet(PaddleReadOnlyViewSet):
+    queryset = Subscription.objects.prefetch_related(Prefetch("products", queryset=Product.objects.only("id")))
+    serializer_class = SubscriptionSerializer
+    filter_fields: ClassVar = {"account": "account_id", "customer": "customer_id", "status": "status"}
+
+
+class TransactionViewSet(PaddleReadOnlyViewSet):
+    queryset = Transaction.objects.all()
+    serializer_class = TransactionSerializer
+    filter_fields: ClassVar = {
+        "customer": "customer_id",
+        "subscription": "subscription_id",
+        "status": "status",
+        "billed_after": "billed_at__gte",
+        "billed_before": "billed_at__lt",
+    }
+
+
+class BulkSubscriptionStatusSerializer(serializers.Serializer):
+    account_ids = serializers.ListField(child=serializers.CharField(), max_length=100_000)
+
+
+class BulkSubscriptionStatusView(PaddlePermissionsMixin, APIView):
+    """POST {"account_ids": [...]}, returns {account_id: {"status": ..., "active": ..., "products": [...]}}"""
+
+    def post(self, request):
+        serializer = BulkSubscriptionStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            statuses = entitlements.bulk_subscription_status(serializer.validated_data["account_ids"])
+        except ValidationError as e:
+            raise exceptions.ValidationError({"account_ids": e.messages}) from e
+        return Response({str(account_id): status for account_id, status in statuses.items()})
+
+
+router = routers.DefaultRouter()
+router.register("customers", CustomerViewSet)
+router.register("products", ProductViewSet)
+router.register("prices", PriceViewSet)
+router.register("subscriptions", SubscriptionViewSet)
+router.register("transactions", TransactionViewSet)
+
+urlpatterns = [
+    path("subscription-status/", BulkSubscriptionStatusView.as_view(), name="bulk-subscription-status"),
+    *router.urls,
+]
@@ -0,0 +1,109 @@
+"""
+Archival of old transaction payloads to compressed cold storage.
+
+The `data` blob of each archived transaction is appended to a gzip compressed JSON lines file per month of creation at
+Paddle (`transactions-YYYY-MM.jsonl.gz`), then cleared in the database. The summary columns (customer, subscription,
+billed_at, custom_data, ...) stay queryable.
+"""
+
+import datetime as dt
+import gzip
+import json
+import logging
+import os
+from collections import defaultdict
+from pathlib import Path
+
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from django_paddle_billing import settings as app_settings
+from django_paddle_billing.exceptions import DjangoPaddleBillingError
+
+logger = logging.getLogger(__name__)
+
+
+def get_archive_dir(archive_dir=None) -> Path:
+    archive_dir = archive_dir or app_settings.TRANSACTION_ARCHIVE_DIR
+    if not archive_dir:
+        msg = 'No archive directory, set PADDLE_BILLING["TRANSACTION_ARCHIVE_DIR"]'
+        raise DjangoPaddleBillingError(msg)
+    return Path(archive_dir)
+
+
+def get_archive_path(archive_dir: Path, month: dt.date) -> Path:
+    return archive_dir / f"transactions-{month:%Y-%m}.jsonl.gz"
+
+
+def get_archive_month(transaction) -> dt.date:
+    return timezone.localdate(transaction.paddle_created_at, dt.timezone.utc).replace(day=1)
+
+
+def _append(path: Path, lines: list[str]) -> None:
+    # Each append adds a gzip member, readers see the concatenation of all of them
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="ab") as archive:
+            archive.write("".join(lines).encode())
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def archive_transactions(before: dt.datetime, archive_dir=None, batch_size=1000, using="default") -> int:
+    """
+    Archive the payloads of the transactions created at Paddle before `before`, return the number of archived
+    transactions.
+
+    Payloads are written and synced to disk before they are cleared in the database, so an interrupted run
+    loses nothing: the next run archives the remaining rows, duplicates being resolved by `load_archived_data`.
+    """
+    Transaction = apps.get_model("django_paddle_billing", "Transaction")
+    archive_dir = get_archive_dir(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+
+    queryset = (
+        Transaction.objects.using(using)
+        .filter(paddle_created_at__lt=before, archived_at=None)
+        .exclude(data=None)
+        .order_by("paddle_created_at", "pk")
+        .only("id", "paddle_created_at", "data")
+    )
+    archived = 0
+    while True:
+        batch = list(queryset[:batch_size])
+        if not batch:
+            break
+        lines_by_month = defaultdict(list)
+        for _transaction in batch:
+            month = get_archive_month(_transaction)
+            line = json.dumps({"id": _transaction.pk, "data": _transaction.data}, cls=DjangoJSONEncoder)
+            lines_by_month[month].append(line + "\n")
+        for month, lines in lines_by_month.items():
+            _append(get_archive_path(archive_dir, month), lines)
+
+        # `updated_at` is bumped as by `save()`, it is the validator of the API responses
+        now = timezone.now()
+        Transaction.objects.using(using).filter(pk__in=[_transaction.pk for _transaction in batch]).update(
+            data=None, archived_at=now, updated_at=now
+        )
+        archived += len(batch)
+        logger.info("Archive: %s transactions archived", archived)
+    return archived
+
+
+def load_archived_data(transaction, archive_dir=None) -> dict | None:
+    """Read the archived payload of a transaction, scanning the file of its creation month"""
+    path = get_archive_path(get_archive_dir(archive_dir), get_archive_month(transaction))
+    if not path.exists():
+        return None
+
+    data = None
+    with gzip.open(path, "rt") as archive:
+        for line in archive:
+            # Cheap prefilter before decoding the line
+            if transaction.pk not in line:
+                continue
+            entry = json.loads(line)
+            if entry["id"] == transaction.pk:
+                data = entry["data"]
+    return data
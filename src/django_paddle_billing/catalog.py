@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.cache import caches
+from django.db import transaction
+from paddle_billing_client.models import price, product
+
+from django_paddle_billing import settings as app_settings
+from django_paddle_billing.routers import primary_alias
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_KEY = "paddle_billing:catalog:version"
+
+
+class Catalog:
+    """Parsed products and prices, indexed by ID, product and currency"""
+
+    def __init__(self, products: list[product.Product], prices: list[price.Price]):
+        self.products: dict[str, product.Product] = {_product.id: _product for _product in products}
+        self.prices: dict[str, price.Price] = {_price.id: _price for _price in prices}
+        self.prices_by_product: dict[str, list[price.Price]] = defaultdict(list)
+        self.prices_by_currency: dict[str, list[price.Price]] = defaultdict(list)
+        for _price in prices:
+            self.prices_by_product[_price.product_id].append(_price)
+            self.prices_by_currency[_price.unit_price.currency_code].append(_price)
+
+    def get_product(self, product_id) -> product.Product | None:
+        return self.products.get(product_id)
+
+    def get_price(self, price_id) -> price.Price | None:
+        return self.prices.get(price_id)
+
+    def get_prices_for_product(self, product_id) -> list[price.Price]:
+        return self.prices_by_product.get(product_id, [])
+
+    def get_prices_for_currency(self, currency_code) -> list[price.Price]:
+        return self.prices_by_currency.get(currency_code, [])
+
+
+_lock = threading.Lock()
+_catalog: Catalog | None = None
+_catalog_version = None
+
+
+def _get_cache():
+    return caches[app_settings.CATALOG_CACHE]
+
+
+def get_version():
+    """Current catalog version, shared by all processes through the `CATALOG_CACHE`"""
+    cache = _get_cache()
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(VERSION_CACHE_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_CACHE_KEY)
+    return version
+
+
+def load_catalog() -> Catalog:
+    Product = apps.get_model("django_paddle_billing", "Product")
+    Price = apps.get_model("django_paddle_billing", "Price")
+
+    # Kept until the next version, read from the database written to as a replica may lag behind
+    products = Product.objects.db_manager(primary_alias(Product)).exclude(data=None).only("data")
+    prices = Price.objects.db_manager(primary_alias(Price)).exclude(data=None).only("data")
+    return Catalog([_product.get_data() for _product in products], [_price.get_data() for _price in prices])
+
+
+def get_catalog() -> Catalog:
+    """
+    Return the in-process catalog, rebuilding it when another process (or a webhook in this one)
+    bumped the shared version. Reads cost one cache lookup, no database query and no validation.
+    """
+    global _catalog, _catalog_version  # noqa: PLW0603
+
+    version = get_version()
+    catalog = _catalog
+    if catalog is not None and _catalog_version == version:
+        return catalog
+
+    with _lock:
+        if _catalog is None or _catalog_version != version:
+            logger.debug("Catalog: loading version %s", version)
+            _catalog = load_catalog()
+            _catalog_version = version
+        return _catalog
+
+
+def warm_catalog() -> None:
+    """Load the catalog before the first read, e.g. from the worker startup hook of the server"""
+    get_catalog()
+
+
+def invalidate_catalog(using=None) -> None:
+    """Bump the shared version once the transaction on `using` commits, so that no process reloads the old rows"""
+    transaction.on_commit(lambda: _get_cache().set(VERSION_CACHE_KEY, time.time_ns(), None), using=using)
@@ -0,0 +1,83 @@
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.core.cache import caches
+
+from django_paddle_billing import settings as app_settings
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapse the concurrent calls sharing a key into one execution within the process:
+    the first caller runs the function, the others wait for it and get the same result or exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+
+# Shared by the `refresh_from_paddle()` calls of the process
+refresh_flight = SingleFlight()
+
+
+@contextmanager
+def cache_lock(key, timeout=None, wait=None):
+    """
+    Lock shared by the processes using the same `REFRESH_LOCK_CACHE`, built on the atomic `cache.add()`.
+
+    Yields whether the lock was acquired within `wait` seconds. The lock expires after `timeout` seconds
+    so a crashed holder cannot block the others forever.
+    """
+    cache = caches[app_settings.REFRESH_LOCK_CACHE]
+    timeout = app_settings.REFRESH_LOCK_TIMEOUT if timeout is None else timeout
+    wait = timeout if wait is None else wait
+    token = uuid.uuid4().hex
+
+    deadline = time.monotonic() + wait
+    acquired = cache.add(key, token, timeout)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(0.05)
+        acquired = cache.add(key, token, timeout)
+    try:
+        yield acquired
+    finally:
+        # The lock may have expired and been taken by another process meanwhile
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
@@ -0,0 +1,174 @@
+"""
+In-process parallel processing of the webhooks, keeping the events of each entity in order.
+
+Each event is assigned one of `WEBHOOK_DISPATCH_LANES` lanes by the ID of its entity (subscription, transaction,
+customer, ...). A lane is a thread consuming a bounded queue, so the events of an entity are processed one at a time in
+the order submitted, while the events of different entities are processed in parallel. Processing the events of an
+entity in parallel would apply them in any order, and `validate_occurred_at()` would then skip the older ones.
+
+When a lane is full, `submit()` waits up to `WEBHOOK_DISPATCH_SUBMIT_TIMEOUT` seconds and raises
+`DispatchLaneFullError`: the webhook view then answers 503 and Paddle delivers the event again later. Paddle got its
+200 before a receiver fails, so `dispatch_webhook()` stores the failed events in the webhook queue, where the
+`process_webhook_queue` workers retry them. `shutdown()` stops accepting events and, by default, drains the queued
+ones; the default dispatcher is drained when the process exits. The events acknowledged but not processed yet are lost
+if the process is killed, use `WEBHOOK_QUEUE` with `process_webhook_queue --lanes` when they must survive a crash.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+
+from django.db import close_old_connections, connections
+
+from django_paddle_billing import monitoring, tracing, webhook_queue
+from django_paddle_billing import settings as app_settings
+from django_paddle_billing.exceptions import DjangoPaddleBillingError
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class DispatchLaneFullError(DjangoPaddleBillingError):
+    pass
+
+
+def send_webhook(event_type, payload, occurred_at=None, sender=None) -> None:
+    """Send the signal of a webhook event, measured by `monitoring` and traced"""
+    # The views import this module
+    from django_paddle_billing.views import PaddleWebhookView  # noqa: PLC0415
+
+    signal = PaddleWebhookView.SUPPORTED_WEBHOOKS[event_type]
+    with monitoring.track_webhook() as tracker:
+        tracker.event_type = event_type
+        with tracker.dispatch(), tracing.span("paddle.webhook", paddle__event_type=event_type):
+            signal.send(sender=sender or PaddleWebhookView, payload=payload, occurred_at=occurred_at)
+
+
+def dispatch_webhook(notification: dict, event_type, payload, occurred_at=None) -> None:
+    """Send the signal of a webhook event in a lane, storing the event in the webhook queue when a receiver fails"""
+    try:
+        send_webhook(event_type, payload, occurred_at)
+    except Exception:
+        # Paddle will not deliver the event again, the `process_webhook_queue` workers retry it
+        logger.exception("Dispatch: %s failed, stored in the webhook queue", event_type)
+        webhook_queue.enqueue(notification)
+
+
+class OrderedDispatcher:
+    """Run the functions submitted with the same key one at a time in order, and different keys in parallel"""
+
+    def __init__(self, lanes=None, queue_size=None, submit_timeout=None, name="paddle-dispatch"):
+        self.lane_count = lanes or app_settings.WEBHOOK_DISPATCH_LANES
+        if self.lane_count < 1:
+            msg = "OrderedDispatcher needs at least one lane"
+            raise DjangoPaddleBillingError(msg)
+        queue_size = app_settings.WEBHOOK_DISPATCH_QUEUE_SIZE if queue_size is None else queue_size
+        self.submit_timeout = app_settings.WEBHOOK_DISPATCH_SUBMIT_TIMEOUT if submit_timeout is None else submit_timeout
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in range(self.lane_count)]
+        self.threads = [
+            threading.Thread(target=self._run, args=(lane,), name=f"{name}-{i}", daemon=True)
+            for i, lane in enumerate(self.queues)
+        ]
+        self.lock = threading.Lock()
+        # Notified when the last pending `submit()` has queued its function
+        self.submitted = threading.Condition(self.lock)
+        self.submitting = 0
+        self.closed = False
+        for thread in self.threads:
+            thread.start()
+
+    def get_lane(self, key) -> int:
+        return webhook_queue.get_partition(str(key), self.lane_count)
+
+    def submit(self, key, func, *args, **kwargs) -> Future:
+        """Queue `func(*args, **kwargs)` in the lane of `key`, waiting up to `submit_timeout` for room"""
+        future = Future()
+        with self.lock:
+            if self.closed:
+                msg = "The dispatcher is shut down"
+                raise DjangoPaddleBillingError(msg)
+            self.submitting += 1
+        # Without the lock, so that the other lanes are not blocked by a full one. `shutdown()` waits for the pending
+        # submits before stopping the lanes, the function is always queued before the stop marker.
+        try:
+            self.queues[self.get_lane(key)].put((future, func, args, kwargs), timeout=self.submit_timeout)
+        except queue.Full:
+            msg = f"Dispatch lane of {key} is full"
+            raise DispatchLaneFullError(msg) from None
+        finally:
+            with self.lock:
+                self.submitting -= 1
+                if not self.submitting:
+                    self.submitted.notify_all()
+        return future
+
+    def pending(self) -> int:
+        """Number of queued functions, not started yet"""
+        return sum(lane.qsize() for lane in self.queues)
+
+    def shutdown(self, *, drain=True, timeout=None) -> None:
+        """Stop accepting functions, run the queued ones (or cancel them) and stop the lanes"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.submitted.wait_for(lambda: not self.submitting)
+        if not drain:
+            for lane in self.queues:
+                while True:
+                    try:
+                        item = lane.get_nowait()
+                    except queue.Empty:
+                        break
+                    item[0].cancel()
+        for lane in self.queues:
+            lane.put(_STOP)
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def _run(self, lane) -> None:
+        try:
+            while True:
+                item = lane.get()
+                if item is _STOP:
+                    return
+                future, func, args, kwargs = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    logger.exception("Dispatch: %s failed", getattr(func, "__name__", func))
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+                finally:
+                    close_old_connections()
+        finally:
+            connections.close_all()
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> OrderedDispatcher:
+    """Dispatcher of the webhook view, created on first use and drained when the process exits"""
+    global _dispatcher  # noqa: PLW0603
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = OrderedDispatcher()
+            atexit.register(_dispatcher.shutdown)
+        return _dispatcher
+
+
+def shutdown(*, drain=True, timeout=None) -> None:
+    """Drain-on-shutdown hook, e.g. from the `worker_exit` hook of gunicorn"""
+    global _dispatcher
+    with _dispatcher_lock:
+        dispatcher, _dispatcher = _dispatcher, None
+    if dispatcher is not None:
+        dispatcher.shutdown(drain=drain, timeout=timeout)
@@ -1,9 +1,101 @@
 # SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
 #
 # SPDX-License-Identifier: MIT
+import base64
+import json
+import zlib
+
+from django.core.exceptions import ImproperlyConfigured
 from django.core.serializers.json import DjangoJSONEncoder
 
+from django_paddle_billing import settings as app_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Key of the JSON object wrapping a compressed payload: {"__paddle_billing_compressed__": "zlib", "data": "<base64>"}
+COMPRESSED_KEY = "__paddle_billing_compressed__"
+
 
 class PrettyJSONEncoder(DjangoJSONEncoder):
     def __init__(self, *args, indent, sort_keys, **kwargs):
         super().__init__(*args, indent=4, sort_keys=True, **kwargs)
+
+
+class PaddleJSONEncoder(DjangoJSONEncoder):
+    """
+    Encoder of the JSON fields, configured by `PADDLE_BILLING["JSON_CODEC"]`:
+    - "compact": no indentation nor spaces after separators
+    - "orjson": compact output encoded by orjson, falls back to "compact" when it is not installed
+    - "pretty": the historical `PrettyJSONEncoder` output
+    """
+
+    def __init__(self, *args, indent=None, separators=None, sort_keys=False, **kwargs):
+        if app_settings.JSON_CODEC == "pretty":
+            super().__init__(*args, indent=4, sort_keys=True, **kwargs)
+        else:
+            super().__init__(*args, separators=(",", ":"), **kwargs)
+
+    def encode(self, o):
+        if app_settings.JSON_CODEC == "orjson" and orjson is not None:
+            return orjson.dumps(
+                o,
+                default=self.default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            ).decode()
+        return super().encode(o)
+
+
+class CompressedPaddleJSONEncoder(PaddleJSONEncoder):
+    """
+    `PaddleJSONEncoder` compressing payloads larger than `JSON_COMPRESSION_THRESHOLD` bytes when
+    `JSON_COMPRESSION` is "zlib" or "zstd" (falls back to zlib when zstandard is not installed).
+
+    Compressed payloads are stored as a small JSON object, decoded transparently by `PaddleJSONDecoder`,
+    but their keys can no longer be queried in SQL (`data__contains`, `data__status`, ...) nor served by the
+    GIN indexes on `data`.
+    """
+
+    def encode(self, o):
+        encoded = super().encode(o)
+        method = app_settings.JSON_COMPRESSION
+        if not method or len(encoded) < app_settings.JSON_COMPRESSION_THRESHOLD:
+            return encoded
+
+        if method == "zstd" and zstandard is not None:
+            compressed = zstandard.ZstdCompressor().compress(encoded.encode())
+        else:
+            method = "zlib"
+            compressed = zlib.compress(encoded.encode())
+        return json.dumps(
+            {COMPRESSED_KEY: method, "data": base64.b64encode(compressed).decode()}, separators=(",", ":")
+        )
+
+
+class PaddleJSONDecoder(json.JSONDecoder):
+    """Decoder of the JSON fields, using orjson when configured and inflating compressed payloads"""
+
+    def decode(self, s, *args, **kwargs):
+        if app_settings.JSON_CODEC == "orjson" and orjson is not None:
+            value = orjson.loads(s)
+        else:
+            value = super().decode(s, *args, **kwargs)
+
+        if isinstance(value, dict) and COMPRESSED_KEY in value:
+            compressed = base64.b64decode(value["data"])
+            if value[COMPRESSED_KEY] == "zstd":
+                if zstandard is None:
+                    msg = "A zstd compressed payload was read, install django-paddle-billing[zstd] to decode it"
+                    raise ImproperlyConfigured(msg)
+                raw = zstandard.ZstdDecompressor().decompress(compressed)
+            else:
+                raw = zlib.decompress(compressed)
+            return self.decode(raw.decode())
+        return value
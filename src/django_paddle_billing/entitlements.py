@@ -0,0 +1,134 @@
+from django.apps import apps
+from django.core.cache import caches
+from django.db import transaction
+
+from django_paddle_billing import settings as app_settings
+from django_paddle_billing.routers import primary_alias
+from django_paddle_billing.utils import get_account_model
+
+CACHE_KEY_PREFIX = "paddle_billing:entitlements"
+# Number of account ids per IN list of `bulk_subscription_status`, below the SQLite and Oracle parameter limits
+BULK_CHUNK_SIZE = 900
+# Reported status of accounts with several subscriptions, from the most to the least favorable
+STATUS_PRIORITY = ("active", "trialing", "past_due", "paused", "canceled")
+# Attribute holding the snapshot on the account instance, so repeated checks within a request are free
+MEMO_ATTRIBUTE = "_paddle_billing_entitlements"
+
+
+def _get_cache():
+    return caches[app_settings.ENTITLEMENTS_CACHE]
+
+
+def _get_account_id(account):
+    return getattr(account, "pk", account)
+
+
+def get_cache_key(account_id) -> str:
+    return f"{CACHE_KEY_PREFIX}:{account_id}"
+
+
+def _load_entitlements(account_id) -> tuple[str, ...]:
+    Subscription = apps.get_model("django_paddle_billing", "Subscription")
+
+    # Cached until the next invalidation, read from the database written to as a replica may lag behind
+    product_ids = (
+        Subscription.objects.db_manager(primary_alias(Subscription))
+        .filter(account_id=account_id, status__in=app_settings.ENTITLEMENT_STATUSES)
+        .values_list("products__id", flat=True)
+        .distinct()
+    )
+    return tuple(sorted(product_id for product_id in product_ids if product_id is not None))
+
+
+def get_entitlements(account) -> frozenset[str]:
+    """
+    Return the IDs of the products the account has a subscription to, in one of the
+    `ENTITLEMENT_STATUSES`.
+
+    `account` can be an account instance or its primary key. The snapshot is cached per account in
+    the `ENTITLEMENTS_CACHE` and, when an instance is given, memoized on it for the rest of the request.
+    """
+    memo = getattr(account, MEMO_ATTRIBUTE, None)
+    if memo is not None:
+        return memo
+
+    account_id = _get_account_id(account)
+    if account_id is None:
+        return frozenset()
+
+    cache = _get_cache()
+    cache_key = get_cache_key(account_id)
+    snapshot = cache.get(cache_key)
+    if snapshot is None:
+        snapshot = _load_entitlements(account_id)
+        cache.set(cache_key, snapshot, app_settings.ENTITLEMENTS_CACHE_TIMEOUT)
+
+    entitlements = frozenset(snapshot)
+    if hasattr(account, "pk"):
+        setattr(account, MEMO_ATTRIBUTE, entitlements)
+    return entitlements
+
+
+def has_active_subscription(account, product_id=None) -> bool:
+    """Check if the account is entitled to `product_id`, or to any product when it is omitted"""
+    entitlements = get_entitlements(account)
+    if product_id is None:
+        return bool(entitlements)
+    return product_id in entitlements
+
+
+def invalidate_entitlements(account_id, using=None) -> None:
+    """
+    Drop the cached snapshot of the account once the transaction on `using` commits, so that a concurrent check
+    cannot cache the state before the commit again.
+    """
+    if account_id is None:
+        return
+    cache_key = get_cache_key(account_id)
+    transaction.on_commit(lambda: _get_cache().delete(cache_key), using=using)
+
+
+def _status_rank(status) -> int:
+    try:
+        return STATUS_PRIORITY.index(status)
+    except ValueError:
+        return len(STATUS_PRIORITY)
+
+
+def bulk_subscription_status(account_ids, chunk_size=BULK_CHUNK_SIZE) -> dict:
+    """
+    Return the subscription state of many accounts at once, one query per `chunk_size` accounts:
+    {account_id: {"status": "active" | ... | None, "active": bool, "products": [product_id, ...]}}
+
+    `status` is the most favorable status of the account subscriptions, `active` and `products` consider the
+    subscriptions in `ENTITLEMENT_STATUSES` like `get_entitlements()`. Every requested account is in the result.
+    """
+    Subscription = apps.get_model("django_paddle_billing", "Subscription")
+
+    # Ids received as strings (query strings, JSON keys) are converted to the type returned by the database
+    to_python = get_account_model()._meta.pk.to_python
+    account_ids = list(dict.fromkeys(to_python(account_id) for account_id in account_ids))
+    entitlement_statuses = set(app_settings.ENTITLEMENT_STATUSES)
+    statuses = {}
+    active = set()
+    products = {}
+    for start in range(0, len(account_ids), chunk_size):
+        chunk = account_ids[start : start + chunk_size]
+        rows = Subscription.objects.filter(account_id__in=chunk).values_list("account_id", "status", "products__id")
+        for account_id, status, product_id in rows.iterator():
+            current = statuses.get(account_id)
+            if current is None or _status_rank(status) < _status_rank(current):
+                statuses[account_id] = status
+            if status in entitlement_statuses:
+                active.add(account_id)
+                if product_id is not None:
+                    products.setdefault(account_id, set()).add(product_id)
+
+    return {
+        account_id: {
+            "status": statuses.get(account_id),
+            "active": account_id in active,
+            "products": sorted(products.get(account_id, ())),
+        }
+        for account_id in account_ids
+    }
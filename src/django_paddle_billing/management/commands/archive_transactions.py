@@ -0,0 +1,47 @@
+import datetime as dt
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from django_paddle_billing import archive
+from django_paddle_billing.exceptions import DjangoPaddleBillingError
+
+
+class Command(BaseCommand):
+    help = "Move the payloads of old transactions to compressed files, keeping their summary columns"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            type=dt.date.fromisoformat,
+            help="Archive the transactions created at Paddle before this date (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--older-than-months",
+            type=int,
+            default=12,
+            help="Archive the transactions created at Paddle before the first day of the month, N months ago",
+        )
+        parser.add_argument("--archive-dir", help='Defaults to PADDLE_BILLING["TRANSACTION_ARCHIVE_DIR"]')
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        before = options["before"]
+        if before is None:
+            before = timezone.localdate(timezone.now(), dt.timezone.utc).replace(day=1)
+            for _ in range(options["older_than_months"]):
+                before = (before - dt.timedelta(days=1)).replace(day=1)
+        before = dt.datetime.combine(before, dt.time.min, tzinfo=dt.timezone.utc)
+
+        try:
+            archived = archive.archive_transactions(
+                before,
+                archive_dir=options["archive_dir"],
+                batch_size=options["batch_size"],
+                using=options["database"],
+            )
+        except DjangoPaddleBillingError as e:
+            raise CommandError(e) from e
+        self.stdout.write(self.style.SUCCESS(f"{archived} transactions created before {before:%Y-%m-%d} archived"))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from django_paddle_billing.models import Subscription, SubscriptionItem, Transaction, TransactionItem
+
+
+class Command(BaseCommand):
+    help = "Fill the subscription and transaction items from the stored Paddle data"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        subscriptions = Subscription.objects.exclude(data=None).only("id", "data")
+        count = self.backfill(subscriptions, SubscriptionItem, SubscriptionItem.replace_for_subscriptions, batch_size)
+        self.stdout.write(f"Subscription items filled for {count} subscriptions")
+
+        transactions = Transaction.objects.exclude(data=None).only("id", "data", "billed_at")
+        count = self.backfill(transactions, TransactionItem, TransactionItem.replace_for_transactions, batch_size)
+        self.stdout.write(f"Transaction items filled for {count} transactions")
+
+        self.stdout.write(self.style.SUCCESS("Successfully filled the items"))
+
+    def backfill(self, queryset, item_model, replace, batch_size) -> int:
+        count = 0
+        batch = {}
+        for instance in queryset.order_by("pk").iterator(batch_size):
+            try:
+                batch[instance] = item_model.build_from_paddle_data(instance, instance.get_data())
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f"{instance.pk}: {e}"))
+                continue
+            if len(batch) >= batch_size:
+                replace(batch)
+                count += len(batch)
+                batch = {}
+        replace(batch)
+        return count + len(batch)
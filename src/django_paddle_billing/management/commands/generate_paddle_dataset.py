@@ -0,0 +1,56 @@
+import datetime as dt
+import time
+
+from django.core.management.base import BaseCommand
+
+from django_paddle_billing import mrr, synthetic
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic dataset of customers, subscriptions and transactions for scale testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--customers", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=0, help="Same seed, same dataset")
+        parser.add_argument("--products", type=int, default=20)
+        parser.add_argument("--discounts", type=int, default=10)
+        parser.add_argument("--months", type=int, default=24, help="Months of transaction history")
+        parser.add_argument(
+            "--end-date",
+            type=dt.date.fromisoformat,
+            help="Last day of the transaction history (default: today)",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Customers inserted per transaction")
+        parser.add_argument(
+            "--use-from-paddle-data",
+            action="store_true",
+            help="Insert through from_paddle_data() like the sync, instead of bulk inserts (much slower)",
+        )
+        parser.add_argument("--rebuild-metrics", action="store_true", help="Rebuild the MRR metrics afterwards")
+
+    def handle(self, *args, **options):
+        end = None
+        if options["end_date"]:
+            end = dt.datetime.combine(options["end_date"], dt.time(23, 59), tzinfo=dt.timezone.utc)
+        generator = synthetic.DatasetGenerator(
+            seed=options["seed"],
+            products=options["products"],
+            discounts=options["discounts"],
+            months=options["months"],
+            end=end,
+        )
+        synthetic.load_catalog(generator.catalog)
+        load = synthetic.load_with_from_paddle_data if options["use_from_paddle_data"] else synthetic.bulk_load
+
+        start = time.perf_counter()
+        rows = 0
+        customers = 0
+        for bundles in synthetic.batched(generator.generate(options["customers"]), options["batch_size"]):
+            rows += load(bundles)
+            customers += len(bundles)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"{customers} customers, {rows} rows ({rows / elapsed:.0f} rows/s)")
+
+        if options["rebuild_metrics"]:
+            mrr.rebuild_metrics(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Successfully generated {customers} customers and {rows} rows"))
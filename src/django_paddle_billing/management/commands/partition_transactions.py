@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from django_paddle_billing import partitioning
+from django_paddle_billing import settings as app_settings
+from django_paddle_billing.exceptions import DjangoPaddleBillingError
+
+
+class Command(BaseCommand):
+    help = "Partition the transaction table by Paddle creation month (PostgreSQL) and create the upcoming partitions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Convert the existing table to a partitioned table, locking it while the rows are copied",
+        )
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=app_settings.TRANSACTION_PARTITION_MONTHS_AHEAD,
+            help="Number of future monthly partitions to create",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        try:
+            if options["convert"]:
+                partitioning.convert_to_partitioned(months_ahead=options["months_ahead"], using=using)
+                self.stdout.write(self.style.SUCCESS("Transaction table converted to a partitioned table"))
+            elif not partitioning.is_partitioned(using):
+                msg = "The transaction table is not partitioned, run the command with --convert first"
+                raise CommandError(msg)
+
+            created = partitioning.create_future_partitions(months_ahead=options["months_ahead"], using=using)
+        except DjangoPaddleBillingError as e:
+            raise CommandError(e) from e
+
+        for name in created:
+            self.stdout.write(f"Created partition {name}")
+        self.stdout.write(self.style.SUCCESS(f"{len(created)} partitions created"))
@@ -0,0 +1,101 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_paddle_billing import dispatch, webhook_queue
+from django_paddle_billing import settings as app_settings
+
+
+class Command(BaseCommand):
+    help = "Process the webhooks queued with WEBHOOK_QUEUE, run one or more workers on each node"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--worker-id", help="Name of the worker holding the leases (default: host:pid)")
+        parser.add_argument("--partitions", help="Partitions processed by this worker, e.g. 0-15,32 (default: all)")
+        parser.add_argument("--batch-size", type=int, help="Events claimed at once (default: WEBHOOK_QUEUE_BATCH_SIZE)")
+        parser.add_argument(
+            "--lease-seconds", type=int, help="Lease of the claimed events (default: WEBHOOK_QUEUE_LEASE_SECONDS)"
+        )
+        parser.add_argument(
+            "--lanes", type=int, default=1, help="Events processed in parallel, the events of an entity stay in order"
+        )
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument("--purge-days", type=int, help="Delete the events processed more than N days ago")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+
+    def handle(self, *args, **options):
+        try:
+            partitions = webhook_queue.parse_partitions(options["partitions"])
+        except ValueError as e:
+            msg = f"Invalid --partitions: {options['partitions']}"
+            raise CommandError(msg) from e
+        worker_id = options["worker_id"] or webhook_queue.get_worker_id()
+
+        self.stopping = False
+        self.lease_seconds = options["lease_seconds"]
+        self.dispatcher = None
+        if options["lanes"] > 1:
+            # A batch is processed before the next one is claimed, the lanes never hold more than a batch
+            batch_size = options["batch_size"] or app_settings.WEBHOOK_QUEUE_BATCH_SIZE
+            self.dispatcher = dispatch.OrderedDispatcher(options["lanes"], queue_size=batch_size, name="paddle-queue")
+        handlers = {signum: signal.signal(signum, self.stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            processed, failed = self.work(worker_id, partitions, options)
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+            if self.dispatcher is not None:
+                self.dispatcher.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully processed {processed} events ({failed} failed)"))
+
+    def work(self, worker_id, partitions, options) -> tuple[int, int]:
+        processed = 0
+        failed = 0
+        while not self.stopping:
+            events = webhook_queue.claim(
+                worker_id, partitions, batch_size=options["batch_size"], lease_seconds=options["lease_seconds"]
+            )
+            for succeeded in self.process(events, worker_id):
+                if succeeded is None:
+                    # Given back on shutdown, or claimed by another worker after the lease expired
+                    continue
+                if succeeded:
+                    processed += 1
+                else:
+                    failed += 1
+            if events:
+                continue
+            if options["purge_days"] is not None:
+                webhook_queue.purge(options["purge_days"])
+            if options["once"]:
+                break
+            time.sleep(options["poll_interval"])
+        return processed, failed
+
+    def process(self, events, worker_id) -> list[bool]:
+        if self.dispatcher is not None:
+            # A batch holds at most one event per entity, the lanes keep the order across batches
+            futures = [
+                self.dispatcher.submit(event.entity_id, self.process_event, event, worker_id) for event in events
+            ]
+            return [future.result() for future in futures]
+        results = []
+        for i, event in enumerate(events):
+            if self.stopping:
+                # Drain: give back the events not started
+                webhook_queue.release(events[i:], worker_id)
+                break
+            results.append(webhook_queue.process(event, worker_id, self.lease_seconds))
+        return results
+
+    def process_event(self, event, worker_id) -> bool | None:
+        if self.stopping:
+            # Drain: give back the events not started
+            webhook_queue.release([event], worker_id)
+            return None
+        return webhook_queue.process(event, worker_id, self.lease_seconds)
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from django_paddle_billing import mrr
+
+
+class Command(BaseCommand):
+    help = "Recompute the MRR of the subscriptions and the daily metrics from scratch"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rows = mrr.rebuild_metrics(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Successfully rebuilt {rows} daily metrics"))
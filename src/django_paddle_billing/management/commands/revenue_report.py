@@ -0,0 +1,54 @@
+import datetime as dt
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_paddle_billing import reporting
+
+
+def _date(value):
+    return dt.datetime.combine(dt.date.fromisoformat(value), dt.time.min, dt.timezone.utc)
+
+
+def _list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class Command(BaseCommand):
+    help = "Export the revenue of the billed transactions, aggregated by the database, as CSV or JSON lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=_date, required=True, help="First billing day (YYYY-MM-DD)")
+        parser.add_argument("--end", type=_date, required=True, help="Day after the last billing day (YYYY-MM-DD)")
+        parser.add_argument(
+            "--group-by",
+            type=_list,
+            default=["day", "currency"],
+            help=f"Comma separated dimensions among: {', '.join(reporting.GROUP_BY_CHOICES)}",
+        )
+        parser.add_argument("--status", type=_list, help='Defaults to PADDLE_BILLING["REVENUE_STATUSES"]')
+        parser.add_argument("--chunk", choices=reporting.CHUNK_CHOICES, default="month")
+        parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+        parser.add_argument("--output", default="-", help="Output file, defaults to the standard output")
+
+    def handle(self, *args, **options):
+        try:
+            rows = reporting.iter_revenue_report(
+                options["start"],
+                options["end"],
+                options["group_by"],
+                chunk=options["chunk"],
+                statuses=options["status"],
+            )
+            if options["output"] == "-":
+                count = self.write(rows, self.stdout, options)
+            else:
+                with open(options["output"], "w", newline="") as stream:
+                    count = self.write(rows, stream, options)
+        except ValueError as e:
+            raise CommandError(e) from e
+        self.stderr.write(self.style.SUCCESS(f"{count} rows exported"))
+
+    def write(self, rows, stream, options) -> int:
+        if options["format"] == "csv":
+            return reporting.write_csv(rows, stream, reporting.get_columns(options["group_by"]))
+        return reporting.write_jsonl(rows, stream)
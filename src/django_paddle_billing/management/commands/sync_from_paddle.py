@@ -1,59 +1,105 @@
-from django.core.management.base import BaseCommand
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_paddle_billing import profiling, retrying, routers, tracing
+from django_paddle_billing import settings as app_settings
 
 
 class Command(BaseCommand):
     help = "Sync data from Paddle"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            help="Database to sync into, requires django_paddle_billing.routers.PaddleBillingRouter",
+        )
+        parser.add_argument("--profile", action="store_true", help="Profile the sync with cProfile")
+        parser.add_argument(
+            "--profile-memory", action="store_true", help="Also trace the memory allocations, implies --profile"
+        )
+        parser.add_argument("--profile-dir", help="Directory of the profile stats (default: PROFILE_DIR)")
+        parser.add_argument("--profile-top", type=int, help="Number of hot functions to print (default: PROFILE_TOP)")
+
     def handle(self, *args, **options):
+        database = options["database"]
+        if database is not None and not routers.is_installed():
+            msg = "--database requires django_paddle_billing.routers.PaddleBillingRouter in DATABASE_ROUTERS"
+            raise CommandError(msg)
+
+        with ExitStack() as stack:
+            # Waiting for the rate limits blocks no request here
+            stack.enter_context(retrying.retry_rate_limited())
+            if database is not None:
+                stack.enter_context(routers.use_database(database))
+            if not (options["profile"] or options["profile_memory"]):
+                self.sync()
+                return
+            with profiling.profile(
+                "sync_from_paddle", memory=options["profile_memory"], profile_dir=options["profile_dir"]
+            ) as profile:
+                self.sync()
+        top = options["profile_top"] or app_settings.PROFILE_TOP
+        self.stdout.write(profile.report(limit=top))
+
+    def sync(self):
         try:
             # ----------------
             # Address
             from django_paddle_billing.models import Address
 
-            Address.sync_from_paddle()
+            with tracing.sync_span("Address"):
+                Address.sync_from_paddle()
 
             # ----------------
             # Business
             from django_paddle_billing.models import Business
 
-            Business.sync_from_paddle()
+            with tracing.sync_span("Business"):
+                Business.sync_from_paddle()
 
             # ----------------
             # Products
             from django_paddle_billing.models import Product
 
-            Product.sync_from_paddle()
+            with tracing.sync_span("Product"):
+                Product.sync_from_paddle()
             # products = Product.objects.all()
 
             # ----------------
             # Prices
             from django_paddle_billing.models import Price
 
-            Price.sync_from_paddle()
+            with tracing.sync_span("Price"):
+                Price.sync_from_paddle()
 
             # ----------------
             # Discounts
             from django_paddle_billing.models import Discount
 
-            Discount.sync_from_paddle()
+            with tracing.sync_span("Discount"):
+                Discount.sync_from_paddle()
 
             # ----------------
             # Customers
             from django_paddle_billing.models import Customer
 
-            Customer.sync_from_paddle()
+            with tracing.sync_span("Customer"):
+                Customer.sync_from_paddle()
 
             # ----------------
             # Subscriptions
             from django_paddle_billing.models import Subscription
 
-            Subscription.sync_from_paddle()
+            with tracing.sync_span("Subscription"):
+                Subscription.sync_from_paddle()
 
             # ----------------
             # Transactions
             from django_paddle_billing.models import Transaction
 
-            Transaction.sync_from_paddle()
+            with tracing.sync_span("Transaction"):
+                Transaction.sync_from_paddle()
 
             self.stdout.write(self.style.SUCCESS("Successfully synced data from Paddle"))
 
@@ -0,0 +1,62 @@
+import django.db.models.fields.json
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+from django_paddle_billing.operations import AddIndexConcurrentlyIfSupported, RunPostgreSQLConcurrently
+
+# Trigram GIN indexes matching the SQL generated by `icontains` on PostgreSQL: UPPER("column") LIKE UPPER(%s)
+TRIGRAM_INDEXES = [
+    ("paddle_customer_email_trgm_idx", "django_paddle_billing_customer", "email"),
+    ("paddle_customer_name_trgm_idx", "django_paddle_billing_customer", "name"),
+]
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL, which cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("django_paddle_billing", "0003_discount"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name="customer",
+            index=models.Index(fields=["email"], name="paddle_customer_email_idx"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="customer",
+            index=models.Index(fields=["name"], name="paddle_customer_name_idx"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="customer",
+            index=models.Index(
+                django.db.models.functions.comparison.Cast(
+                    django.db.models.fields.json.KeyTextTransform("account_id", "custom_data"),
+                    output_field=models.TextField(),
+                ),
+                name="paddle_customer_account_id_idx",
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="subscription",
+            index=models.Index(
+                django.db.models.functions.comparison.Cast(
+                    django.db.models.fields.json.KeyTextTransform("account_id", "custom_data"),
+                    output_field=models.TextField(),
+                ),
+                name="paddle_subscr_account_id_idx",
+            ),
+        ),
+        RunPostgreSQLConcurrently(
+            sql=[
+                "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+                *(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" '
+                    f'USING gin (UPPER("{column}") gin_trgm_ops)'
+                    for name, table, column in TRIGRAM_INDEXES
+                ),
+            ],
+            reverse_sql=[f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"' for name, _, _ in TRIGRAM_INDEXES],
+        ),
+    ]
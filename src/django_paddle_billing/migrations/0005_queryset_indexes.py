@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+BATCH_SIZE = 1000
+
+
+def backfill_billed_at(apps, schema_editor):
+    Transaction = apps.get_model("django_paddle_billing", "Transaction")
+    db_alias = schema_editor.connection.alias
+
+    # `updated_at` is bumped as by `save()`, it is the validator of the API responses
+    now = timezone.now()
+    batch = []
+    for transaction in Transaction.objects.using(db_alias).exclude(data=None).only("id", "data").iterator(BATCH_SIZE):
+        billed_at = transaction.data.get("billed_at")
+        if billed_at:
+            transaction.billed_at = parse_datetime(billed_at)
+            transaction.updated_at = now
+            batch.append(transaction)
+        if len(batch) >= BATCH_SIZE:
+            Transaction.objects.using(db_alias).bulk_update(batch, ["billed_at", "updated_at"])
+            batch = []
+    Transaction.objects.using(db_alias).bulk_update(batch, ["billed_at", "updated_at"])
+
+
+class Migration(migrations.Migration):
+    # The indexes used by the querysets are built concurrently in 0006, outside of this transaction
+
+    dependencies = [
+        ("django_paddle_billing", "0004_search_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="billed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_billed_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+import django.db.models.fields.json
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+from django_paddle_billing.operations import AddIndexConcurrentlyIfSupported, RunPostgreSQLConcurrently
+
+
+def gin_index(name, table):
+    # Serves `data__contains` lookups on PostgreSQL
+    return RunPostgreSQLConcurrently(
+        sql=f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" USING gin ("data" jsonb_path_ops)',
+        reverse_sql=f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"',
+    )
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL, which cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("django_paddle_billing", "0005_queryset_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name="subscription",
+            index=models.Index(fields=["account", "status"], name="paddle_subscr_account_status"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="transaction",
+            index=models.Index(fields=["customer", "created_at"], name="paddle_txn_customer_created"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="transaction",
+            index=models.Index(fields=["subscription", "created_at"], name="paddle_txn_subscr_created"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="transaction",
+            index=models.Index(fields=["billed_at"], name="paddle_txn_billed_at"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="subscription",
+            index=models.Index(fields=["status"], name="paddle_subscr_status"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="subscription",
+            index=models.Index(fields=["occurred_at"], name="paddle_subscr_occurred_at"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="transaction",
+            index=models.Index(fields=["occurred_at"], name="paddle_txn_occurred_at"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="transaction",
+            index=models.Index(
+                django.db.models.functions.comparison.Cast(
+                    django.db.models.fields.json.KeyTextTransform("account_id", "custom_data"),
+                    output_field=models.TextField(),
+                ),
+                name="paddle_txn_account_id_idx",
+            ),
+        ),
+        # Serve the `?updated_after=` filter of the API
+        AddIndexConcurrentlyIfSupported(
+            model_name="customer",
+            index=models.Index(fields=["updated_at"], name="paddle_customer_updated_at"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="price",
+            index=models.Index(fields=["updated_at"], name="paddle_price_updated_at"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="product",
+            index=models.Index(fields=["updated_at"], name="paddle_product_updated_at"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="subscription",
+            index=models.Index(fields=["updated_at"], name="paddle_subscr_updated_at"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="transaction",
+            index=models.Index(fields=["updated_at"], name="paddle_txn_updated_at"),
+        ),
+        gin_index("paddle_subscr_data_gin", "django_paddle_billing_subscription"),
+        gin_index("paddle_txn_data_gin", "django_paddle_billing_transaction"),
+    ]
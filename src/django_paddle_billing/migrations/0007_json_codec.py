@@ -0,0 +1,178 @@
+from django.db import migrations, models
+
+import django_paddle_billing.encoders
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_paddle_billing", "0006_concurrent_indexes"),
+    ]
+
+    # The encoder and decoder are not part of the database schema, only the migration state changes
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="address",
+                    name="custom_data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.PaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="address",
+                    name="data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.CompressedPaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="business",
+                    name="custom_data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.PaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="business",
+                    name="data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.CompressedPaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="customer",
+                    name="custom_data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.PaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="customer",
+                    name="data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.CompressedPaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="discount",
+                    name="custom_data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.PaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="discount",
+                    name="data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.CompressedPaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="price",
+                    name="custom_data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.PaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="price",
+                    name="data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.CompressedPaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="product",
+                    name="custom_data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.PaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="product",
+                    name="data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.CompressedPaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="subscription",
+                    name="custom_data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.PaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="subscription",
+                    name="data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.CompressedPaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="transaction",
+                    name="custom_data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.PaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="transaction",
+                    name="data",
+                    field=models.JSONField(
+                        blank=True,
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.CompressedPaddleJSONEncoder,
+                        null=True,
+                    ),
+                ),
+            ],
+        ),
+    ]
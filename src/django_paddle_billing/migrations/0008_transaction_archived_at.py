@@ -0,0 +1,55 @@
+import django.utils.timezone
+from django.db import migrations, models
+from django.utils.dateparse import parse_datetime
+
+from django_paddle_billing.operations import AddIndexConcurrentlyIfSupported, RunInTransaction
+
+BATCH_SIZE = 1000
+
+
+def backfill_paddle_created_at(apps, schema_editor):
+    Transaction = apps.get_model("django_paddle_billing", "Transaction")
+    db_alias = schema_editor.connection.alias
+
+    batch = []
+    queryset = Transaction.objects.using(db_alias).only("id", "created_at", "data")
+    for transaction in queryset.iterator(BATCH_SIZE):
+        created_at = (transaction.data or {}).get("created_at")
+        # Without a payload, the transaction keeps the time it was synced
+        transaction.paddle_created_at = (parse_datetime(created_at) if created_at else None) or transaction.created_at
+        batch.append(transaction)
+        if len(batch) >= BATCH_SIZE:
+            Transaction.objects.using(db_alias).bulk_update(batch, ["paddle_created_at"])
+            batch = []
+    Transaction.objects.using(db_alias).bulk_update(batch, ["paddle_created_at"])
+
+
+class Migration(migrations.Migration):
+    # The index is built concurrently on PostgreSQL, which cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("django_paddle_billing", "0007_json_codec"),
+    ]
+
+    operations = [
+        RunInTransaction(
+            [
+                migrations.AddField(
+                    model_name="transaction",
+                    name="archived_at",
+                    field=models.DateTimeField(blank=True, null=True),
+                ),
+                migrations.AddField(
+                    model_name="transaction",
+                    name="paddle_created_at",
+                    field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+                ),
+                migrations.RunPython(backfill_paddle_created_at, migrations.RunPython.noop),
+            ]
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="transaction",
+            index=models.Index(fields=["paddle_created_at"], name="paddle_txn_paddle_created"),
+        ),
+    ]
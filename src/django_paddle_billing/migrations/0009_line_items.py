@@ -0,0 +1,110 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_paddle_billing", "0008_transaction_archived_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubscriptionItem",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("status", models.CharField(blank=True, max_length=20)),
+                ("quantity", models.PositiveIntegerField(default=1)),
+                ("recurring", models.BooleanField(default=True)),
+                ("unit_amount", models.BigIntegerField(default=0)),
+                ("currency_code", models.CharField(blank=True, max_length=3)),
+                (
+                    "price",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="subscription_items",
+                        to="django_paddle_billing.price",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="subscription_items",
+                        to="django_paddle_billing.product",
+                    ),
+                ),
+                (
+                    "subscription",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="items",
+                        to="django_paddle_billing.subscription",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["product", "subscription"], name="paddle_subitem_product_subscr"),
+                    models.Index(fields=["price", "subscription"], name="paddle_subitem_price_subscr"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="TransactionItem",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("line_item_id", models.CharField(blank=True, max_length=50, null=True)),
+                ("quantity", models.PositiveIntegerField(default=1)),
+                ("subtotal", models.BigIntegerField(default=0)),
+                ("discount", models.BigIntegerField(default=0)),
+                ("tax", models.BigIntegerField(default=0)),
+                ("total", models.BigIntegerField(default=0)),
+                ("currency_code", models.CharField(blank=True, max_length=3)),
+                ("billed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "price",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="transaction_items",
+                        to="django_paddle_billing.price",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="transaction_items",
+                        to="django_paddle_billing.product",
+                    ),
+                ),
+                (
+                    "transaction",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="items",
+                        to="django_paddle_billing.transaction",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["product", "billed_at"], name="paddle_txnitem_product_billed"),
+                    models.Index(fields=["price", "billed_at"], name="paddle_txnitem_price_billed"),
+                ],
+            },
+        ),
+    ]
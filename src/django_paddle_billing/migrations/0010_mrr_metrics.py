@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_paddle_billing", "0009_line_items"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="subscription",
+            name="currency_code",
+            field=models.CharField(blank=True, max_length=3),
+        ),
+        migrations.AddField(
+            model_name="subscription",
+            name="mrr",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name="DailyMetrics",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("currency_code", models.CharField(max_length=3)),
+                ("new_mrr", models.BigIntegerField(default=0)),
+                ("expansion_mrr", models.BigIntegerField(default=0)),
+                ("contraction_mrr", models.BigIntegerField(default=0)),
+                ("churned_mrr", models.BigIntegerField(default=0)),
+                ("new_count", models.IntegerField(default=0)),
+                ("churned_count", models.IntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "Daily metrics",
+                "constraints": [
+                    models.UniqueConstraint(fields=("currency_code", "date"), name="paddle_metrics_currency_date")
+                ],
+            },
+        ),
+    ]
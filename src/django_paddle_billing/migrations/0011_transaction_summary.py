@@ -0,0 +1,97 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+from django_paddle_billing.operations import AddIndexConcurrentlyIfSupported, RunInTransaction
+
+BATCH_SIZE = 1000
+
+
+def _amount(totals, name):
+    try:
+        return int(totals[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def backfill_summary(apps, schema_editor):
+    Transaction = apps.get_model("django_paddle_billing", "Transaction")
+    db_alias = schema_editor.connection.alias
+    fields = ["address_id", "status", "currency_code", "subtotal", "tax", "total", "updated_at"]
+    # `updated_at` is bumped as by `save()`, it is the validator of the API responses
+    now = timezone.now()
+
+    batch = []
+    for transaction in Transaction.objects.using(db_alias).exclude(data=None).only("id", "data").iterator(BATCH_SIZE):
+        totals = (transaction.data.get("details") or {}).get("totals")
+        transaction.address_id = transaction.data.get("address_id")
+        transaction.status = transaction.data.get("status") or ""
+        transaction.currency_code = transaction.data.get("currency_code") or ""
+        transaction.subtotal = _amount(totals, "subtotal")
+        transaction.tax = _amount(totals, "tax")
+        transaction.total = _amount(totals, "total")
+        transaction.updated_at = now
+        batch.append(transaction)
+        if len(batch) >= BATCH_SIZE:
+            Transaction.objects.using(db_alias).bulk_update(batch, fields)
+            batch = []
+    Transaction.objects.using(db_alias).bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+    # The index is built concurrently on PostgreSQL, which cannot run inside a transaction. The columns and their
+    # backfill are applied together in one.
+    atomic = False
+
+    dependencies = [
+        ("django_paddle_billing", "0010_mrr_metrics"),
+    ]
+
+    operations = [
+        RunInTransaction(
+            [
+                migrations.AddField(
+                    model_name="transaction",
+                    name="address",
+                    field=models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="transactions",
+                        to="django_paddle_billing.address",
+                    ),
+                ),
+                migrations.AddField(
+                    model_name="transaction",
+                    name="currency_code",
+                    field=models.CharField(blank=True, max_length=3),
+                ),
+                migrations.AddField(
+                    model_name="transaction",
+                    name="status",
+                    field=models.CharField(blank=True, max_length=20),
+                ),
+                migrations.AddField(
+                    model_name="transaction",
+                    name="subtotal",
+                    field=models.BigIntegerField(blank=True, null=True),
+                ),
+                migrations.AddField(
+                    model_name="transaction",
+                    name="tax",
+                    field=models.BigIntegerField(blank=True, null=True),
+                ),
+                migrations.AddField(
+                    model_name="transaction",
+                    name="total",
+                    field=models.BigIntegerField(blank=True, null=True),
+                ),
+                migrations.RunPython(backfill_summary, migrations.RunPython.noop),
+            ]
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="transaction",
+            index=models.Index(fields=["status", "billed_at"], name="paddle_txn_status_billed"),
+        ),
+    ]
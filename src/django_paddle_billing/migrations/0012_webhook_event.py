@@ -0,0 +1,58 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+import django_paddle_billing.encoders
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_paddle_billing", "0011_transaction_summary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WebhookEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("event_id", models.CharField(max_length=50, unique=True)),
+                ("event_type", models.CharField(max_length=50)),
+                ("occurred_at", models.DateTimeField(blank=True, null=True)),
+                ("entity_id", models.CharField(max_length=50)),
+                ("partition", models.PositiveSmallIntegerField()),
+                (
+                    "payload",
+                    models.JSONField(
+                        decoder=django_paddle_billing.encoders.PaddleJSONDecoder,
+                        encoder=django_paddle_billing.encoders.PaddleJSONEncoder,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("available_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("leased_by", models.CharField(blank=True, default="", max_length=100)),
+                ("lease_expires_at", models.DateTimeField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("received_at", models.DateTimeField(auto_now_add=True)),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["status", "partition", "id"], name="paddle_webhook_claim_idx"),
+                    models.Index(fields=["entity_id", "id"], name="paddle_webhook_entity_idx"),
+                ],
+            },
+        ),
+    ]
@@ -1,10 +1,18 @@
+import datetime as dt
+import hashlib
 import logging
-from typing import Iterator, TypeVar
+import threading
+from collections import OrderedDict
+from typing import ClassVar, Iterator, TypeVar
 
 from apiclient import HeaderAuthentication
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import IntegrityError, models, router
+from django.db.models.query_utils import DeferredAttribute
+from django.db.transaction import atomic
 from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from paddle_billing_client.client import PaddleApiClient
 from paddle_billing_client.models import (
     address,
@@ -18,16 +26,38 @@ from paddle_billing_client.models import (
 )
 from paddle_billing_client.pagination import paginate
 
-from django_paddle_billing import settings, signals
-from django_paddle_billing.encoders import PrettyJSONEncoder
+from django_paddle_billing import (
+    archive,
+    catalog,
+    concurrency,
+    entitlements,
+    monitoring,
+    mrr,
+    retrying,
+    settings,
+    signals,
+    tracing,
+)
+from django_paddle_billing.encoders import CompressedPaddleJSONEncoder, PaddleJSONDecoder, PaddleJSONEncoder
 from django_paddle_billing.exceptions import DjangoPaddleBillingError
+from django_paddle_billing.querysets import (
+    CustomerQuerySet,
+    DailyMetricsQuerySet,
+    SubscriptionQuerySet,
+    TransactionQuerySet,
+    custom_data_key,
+)
+from django_paddle_billing.routers import primary_alias
 from django_paddle_billing.utils import get_account_model
 
 logger = logging.getLogger(__name__)
 
-paddle_client = PaddleApiClient(
-    base_url=settings.PADDLE_API_URL,
-    authentication_method=HeaderAuthentication(token=settings.PADDLE_API_TOKEN),
+paddle_client = tracing.TracedPaddleClient(
+    PaddleApiClient(
+        base_url=settings.PADDLE_API_URL,
+        authentication_method=HeaderAuthentication(token=settings.PADDLE_API_TOKEN),
+        request_strategy=retrying.RetryingRequestStrategy(),
+    )
 )
 
 UserModel = get_user_model()
@@ -35,6 +65,85 @@ UserModel = get_user_model()
 T = TypeVar("T", bound="PaddleBaseModel")
 
 
+class PaddleDataAttribute(DeferredAttribute):
+    """`data` attribute dropping the model memoized by `get_data()` when a new value is assigned"""
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+        instance.__dict__.pop("_parsed_data", None)
+
+
+class PaddleData(dict):
+    """`data` as loaded from the database, with a digest of the stored JSON document"""
+
+    __slots__ = ("digest",)
+
+
+class PaddleDataField(models.JSONField):
+    descriptor_class = PaddleDataAttribute
+
+    def from_db_value(self, value, expression, connection):
+        data = super().from_db_value(value, expression, connection)
+        if isinstance(value, str) and type(data) is dict:
+            data = PaddleData(data)
+            data.digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        return data
+
+    def deconstruct(self):
+        # Only the instances behave differently, migrations keep a plain JSONField
+        name, _, args, kwargs = super().deconstruct()
+        return name, "django.db.models.JSONField", args, kwargs
+
+
+class ParsedDataCache:
+    """
+    Validated `data` of the rows read recently, by model, primary key and digest of the stored JSON document, so that
+    loading a row again from the database does not validate its payload again. Each row gets a shallow copy of the
+    cached model: assigning its fields does not affect the other rows, its nested models are shared.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    @staticmethod
+    def get_key(instance):
+        # Only `data` loaded from the database has a digest, not the values assigned since
+        digest = getattr(instance.__dict__.get("data"), "digest", None)
+        if digest is None or instance.pk is None:
+            return None
+        return instance._meta.label_lower, instance.pk, digest
+
+    def get(self, instance):
+        key = self.get_key(instance)
+        if key is None:
+            return None
+        with self.lock:
+            parsed_data = self.entries.get(key)
+            if parsed_data is None:
+                return None
+            self.entries.move_to_end(key)
+        return parsed_data.model_copy()
+
+    def set(self, instance, parsed_data) -> None:
+        key = self.get_key(instance)
+        if key is None or not settings.PARSED_DATA_CACHE_SIZE:
+            return
+        with self.lock:
+            # Keep a copy of its own, the row is free to assign the fields of the model it was given
+            self.entries[key] = parsed_data.model_copy()
+            self.entries.move_to_end(key)
+            while len(self.entries) > settings.PARSED_DATA_CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+parsed_data_cache = ParsedDataCache()
+
+
 class PaddleBaseModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(auto_now=True, editable=False)
@@ -43,6 +152,23 @@ class PaddleBaseModel(models.Model):
     class Meta:
         abstract = True
 
+    def _get_data(self, model):
+        """
+        Validate `data` with the given pydantic model, once per instance, and once per stored version of the row while
+        it stays in the `parsed_data_cache`. Treat the nested models of the returned one as read-only.
+        Mutating the `data` dict in place is not detected, assign a new value instead.
+        """
+        if self.data is None:
+            return None
+        parsed_data = self.__dict__.get("_parsed_data")
+        if parsed_data is None:
+            parsed_data = parsed_data_cache.get(self)
+            if parsed_data is None:
+                parsed_data = model.model_validate(self.data)
+                parsed_data_cache.set(self, parsed_data)
+            self.__dict__["_parsed_data"] = parsed_data
+        return parsed_data
+
     def validate_occurred_at(self, occurred_at) -> bool:
         # Check if occurred_at is later than the current one
         if occurred_at is not None and self.occurred_at is not None and occurred_at < self.occurred_at:
@@ -50,71 +176,156 @@ class PaddleBaseModel(models.Model):
                 f"{self.__class__.__name__}: The event is invalid, occurred_at is earlier"
                 " than the current one - SKIP UPDATE"
             )
+            monitoring.mark_stale()
             return False
         return True
 
     @classmethod
-    def update_or_create(cls: type[T], query, defaults, occurred_at=None) -> tuple[T, bool]:
-        created = False
-        try:
-            instance = cls.objects.get(**query)
-            valid = instance.validate_occurred_at(occurred_at)
-            if not valid:
-                return instance, created
+    def update_or_create(cls: type[T], query, defaults, occurred_at=None, parsed_data=None) -> tuple[T, bool]:
+        """
+        Apply an event to the row, unless a later one was already applied.
 
-        except cls.DoesNotExist:
-            instance = cls(**query)
-            created = True
+        The row is locked until the end of the transaction, so concurrent events for the same entity are applied
+        one at a time and the newest `occurred_at` wins whatever their order of arrival.
+        """
+        created = False
+        using = router.db_for_write(cls)
+        with atomic(using=using, savepoint=False):
+            try:
+                # Read from the database written to, a replica may lag behind
+                instance = cls.objects.db_manager(using).select_for_update().get(**query)
+                valid = instance.validate_occurred_at(occurred_at)
+                if not valid:
+                    return instance, created
+
+            except cls.DoesNotExist:
+                instance = cls(**query)
+                created = True
+
+            for k, v in defaults.items():
+                setattr(instance, k, v)
+
+            if occurred_at is not None:
+                instance.occurred_at = occurred_at
+
+            # `data` was built from this already validated model, `get_data()` can reuse it as is
+            if parsed_data is not None:
+                instance.__dict__["_parsed_data"] = parsed_data
+
+            if not created:
+                instance.save(using=using)
+            else:
+                try:
+                    with atomic(using=using):
+                        instance.save(using=using, force_insert=True)
+                except IntegrityError:
+                    # Created by a concurrent event meanwhile, apply this one to the row it created
+                    return cls.update_or_create(query, defaults, occurred_at, parsed_data)
 
-        for k, v in defaults.items():
-            setattr(instance, k, v)
+        return instance, created
 
-        if occurred_at is not None:
-            instance.occurred_at = occurred_at
+    @classmethod
+    def api_get_data(cls, pk):
+        """Fetch the entity from the Paddle API, as a `paddle_billing_client` model"""
+        msg = f"{cls.__name__} cannot be fetched individually from Paddle"
+        raise NotImplementedError(msg)
 
-        instance.save()
+    @classmethod
+    def refresh_from_paddle(cls: type[T], pk, max_age=None) -> T:
+        """
+        Fetch the entity from Paddle and store it, unless the local row was updated less than `max_age` seconds
+        ago (default: `REFRESH_MAX_AGE`, 0 always fetches).
+
+        Concurrent refreshes of the same entity share one API call: within the process by waiting for the
+        first caller, across processes through a lock in the `REFRESH_LOCK_CACHE`.
+        """
+        max_age = settings.REFRESH_MAX_AGE if max_age is None else max_age
+        key = f"{cls._meta.label_lower}:{pk}"
+
+        def get_fresh(since):
+            return cls.objects.filter(pk=pk, updated_at__gte=since).first()
+
+        if max_age:
+            instance = get_fresh(timezone.now() - dt.timedelta(seconds=max_age))
+            if instance is not None:
+                return instance
+
+        def refresh():
+            started_at = timezone.now()
+            with concurrency.cache_lock(f"paddle_billing:refresh:{key}") as acquired:
+                if not acquired:
+                    logger.warning("Refresh: lock wait timed out for %s, fetching anyway", key)
+                # Another process held the lock and may have refreshed the entity meanwhile
+                instance = get_fresh(started_at)
+                if instance is not None:
+                    return instance
+                instance, _, error = cls.from_paddle_data(cls.api_get_data(pk))
+                if error:
+                    raise DjangoPaddleBillingError(error)
+                cls.after_refresh(instance)
+                return instance
+
+        return concurrency.refresh_flight.do(key, refresh)
 
-        return instance, created
+    @classmethod
+    def after_refresh(cls, instance) -> None:
+        """Called by `refresh_from_paddle()` once the entity was fetched again, not when the local row was fresh"""
 
 
 class Product(PaddleBaseModel):
     id = models.CharField(max_length=50, primary_key=True)
-    data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
-    custom_data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
+    data = PaddleDataField(null=True, blank=True, encoder=CompressedPaddleJSONEncoder, decoder=PaddleJSONDecoder)
+    custom_data = models.JSONField(null=True, blank=True, encoder=PaddleJSONEncoder, decoder=PaddleJSONDecoder)
     name = models.CharField(max_length=255)
     status = models.CharField(max_length=10, choices=[("active", "Active"), ("archived", "Archived")])
 
     class Meta:
-        pass
+        indexes: ClassVar = [
+            models.Index(fields=["updated_at"], name="paddle_product_updated_at"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.pk} - {self.name}"
 
     def get_data(self) -> product.Product | None:
-        if self.data is None:
-            return None
-        return product.Product.model_validate(self.data)
+        return self._get_data(product.Product)
 
     @classmethod
     def api_list_products(cls) -> product.ProductsResponse:
         return paddle_client.list_products()
 
+    @classmethod
+    def api_get_data(cls, pk) -> product.Product:
+        return paddle_client.get_product(pk).data
+
+    @classmethod
+    def after_refresh(cls, _instance) -> None:
+        catalog.invalidate_catalog(using=primary_alias(cls))
+
     @classmethod
     def api_list_products_generator(cls, **kwargs) -> Iterator[product.ProductsResponse]:
-        yield from paginate(paddle_client.list_products, query_params=product.ProductQueryParams(**kwargs))
+        yield from tracing.paginate(
+            cls.__name__, paginate(paddle_client.list_products, query_params=product.ProductQueryParams(**kwargs))
+        )
+
+    @classmethod
+    def defaults_from_paddle_data(cls, data) -> dict:
+        return {
+            "name": data.name,
+            "status": data.status,
+            "data": data.dict(),
+            "custom_data": data.custom_data,
+        }
 
     @classmethod
+    @tracing.from_paddle_data
     def from_paddle_data(cls, data, occurred_at=None) -> tuple["Product | None", bool, Exception | None]:
         try:
             _product, created = cls.update_or_create(
                 query={"pk": data.id},
-                defaults={
-                    "name": data.name,
-                    "status": data.status,
-                    "data": data.dict(),
-                    "custom_data": data.custom_data,
-                },
+                defaults=cls.defaults_from_paddle_data(data),
                 occurred_at=occurred_at,
+                parsed_data=data,
             )
             return _product, created, None
         except Exception as e:
@@ -136,45 +347,60 @@ class Product(PaddleBaseModel):
                 else:
                     updated += 1
             logger.info("Product sync progress --- synced: %s, created: %s, errors: %s", updated, created, error)
+        catalog.invalidate_catalog(using=primary_alias(cls))
         return created, updated
 
 
 class Price(PaddleBaseModel):
     id = models.CharField(max_length=50, primary_key=True)
-    data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
-    custom_data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
+    data = PaddleDataField(null=True, blank=True, encoder=CompressedPaddleJSONEncoder, decoder=PaddleJSONDecoder)
+    custom_data = models.JSONField(null=True, blank=True, encoder=PaddleJSONEncoder, decoder=PaddleJSONDecoder)
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="prices")
 
     class Meta:
-        pass
+        indexes: ClassVar = [
+            models.Index(fields=["updated_at"], name="paddle_price_updated_at"),
+        ]
 
     def __str__(self) -> str:
         return str(self.pk)
 
     def get_data(self) -> price.Price | None:
-        if self.data is None:
-            return None
-        return price.Price.model_validate(self.data)
+        return self._get_data(price.Price)
 
     @classmethod
     def api_list_prices(cls) -> price.PricesResponse:
         return paddle_client.list_prices()
 
+    @classmethod
+    def api_get_data(cls, pk) -> price.Price:
+        return paddle_client.get_price(pk).data
+
+    @classmethod
+    def after_refresh(cls, _instance) -> None:
+        catalog.invalidate_catalog(using=primary_alias(cls))
+
     @classmethod
     def api_list_prices_generator(cls, **kwargs) -> Iterator[price.PricesResponse]:
-        yield from paginate(paddle_client.list_prices, **kwargs)
+        yield from tracing.paginate(cls.__name__, paginate(paddle_client.list_prices, **kwargs))
 
     @classmethod
+    def defaults_from_paddle_data(cls, data) -> dict:
+        return {
+            "product_id": data.product_id,
+            "data": data.dict(),
+            "custom_data": data.custom_data,
+        }
+
+    @classmethod
+    @tracing.from_paddle_data
     def from_paddle_data(cls, data, occurred_at=None) -> tuple["Price | None", bool, Exception | None]:
         try:
             _price, created = cls.update_or_create(
                 query={"pk": data.id},
-                defaults={
-                    "product_id": data.product_id,
-                    "data": data.dict(),
-                    "custom_data": data.custom_data,
-                },
+                defaults=cls.defaults_from_paddle_data(data),
                 occurred_at=occurred_at,
+                parsed_data=data,
             )
             return _price, created, None
         except Exception as e:
@@ -196,13 +422,14 @@ class Price(PaddleBaseModel):
                 else:
                     updated += 1
             logger.info("Price sync progress --- synced: %s, created: %s, errors: %s", updated, created, error)
+        catalog.invalidate_catalog(using=primary_alias(cls))
         return created, updated
 
 
 class Discount(PaddleBaseModel):
     id = models.CharField(max_length=50, primary_key=True)
-    data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
-    custom_data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
+    data = PaddleDataField(null=True, blank=True, encoder=CompressedPaddleJSONEncoder, decoder=PaddleJSONDecoder)
+    custom_data = models.JSONField(null=True, blank=True, encoder=PaddleJSONEncoder, decoder=PaddleJSONDecoder)
 
     class Meta:
         pass
@@ -211,28 +438,39 @@ class Discount(PaddleBaseModel):
         return str(self.pk)
 
     def get_data(self) -> discount.Discount | None:
-        if self.data is None:
-            return None
-        return discount.Discount.model_validate(self.data)
+        return self._get_data(discount.Discount)
 
     @classmethod
     def api_list_discounts(cls) -> discount.DiscountsResponse:
         return paddle_client.list_discounts()
 
+    @classmethod
+    def api_get_data(cls, pk) -> discount.Discount:
+        return paddle_client.get_discount(pk).data
+
     @classmethod
     def api_list_discounts_generator(cls, **kwargs) -> Iterator[discount.DiscountsResponse]:
-        yield from paginate(paddle_client.list_discounts, query_params=discount.DiscountQueryParams(**kwargs))
+        yield from tracing.paginate(
+            cls.__name__,
+            paginate(paddle_client.list_discounts, query_params=discount.DiscountQueryParams(**kwargs)),
+        )
+
+    @classmethod
+    def defaults_from_paddle_data(cls, data) -> dict:
+        return {
+            "data": data.dict(),
+            "custom_data": data.custom_data,
+        }
 
     @classmethod
+    @tracing.from_paddle_data
     def from_paddle_data(cls, data, occurred_at=None) -> tuple["Discount | None", bool, Exception | None]:
         try:
             _discount, created = cls.update_or_create(
                 query={"pk": data.id},
-                defaults={
-                    "data": data.dict(),
-                    "custom_data": data.custom_data,
-                },
+                defaults=cls.defaults_from_paddle_data(data),
                 occurred_at=occurred_at,
+                parsed_data=data,
             )
             return _discount, created, None
         except Exception as e:
@@ -259,8 +497,8 @@ class Discount(PaddleBaseModel):
 
 class Customer(PaddleBaseModel):
     id = models.CharField(max_length=50, primary_key=True)
-    data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
-    custom_data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
+    data = PaddleDataField(null=True, blank=True, encoder=CompressedPaddleJSONEncoder, decoder=PaddleJSONDecoder)
+    custom_data = models.JSONField(null=True, blank=True, encoder=PaddleJSONEncoder, decoder=PaddleJSONDecoder)
     name = models.CharField(max_length=255, null=True, blank=True)
     email = models.EmailField()
     user = models.ForeignKey(
@@ -270,34 +508,51 @@ class Customer(PaddleBaseModel):
         related_name="customers",
     )
 
+    objects = CustomerQuerySet.as_manager()
+
     class Meta:
-        pass
+        indexes: ClassVar = [
+            models.Index(fields=["email"], name="paddle_customer_email_idx"),
+            models.Index(fields=["name"], name="paddle_customer_name_idx"),
+            models.Index(custom_data_key("account_id"), name="paddle_customer_account_id_idx"),
+            models.Index(fields=["updated_at"], name="paddle_customer_updated_at"),
+        ]
 
     def __str__(self) -> str:
         return str(self.pk)
 
     def get_data(self) -> customer.Customer | None:
-        if self.data is None:
-            return None
-        return customer.Customer.model_validate(self.data)
+        return self._get_data(customer.Customer)
 
     @classmethod
     def api_list_customers(cls) -> customer.CustomersResponse:
         return paddle_client.list_customers()
 
+    @classmethod
+    def api_get_data(cls, pk) -> customer.Customer:
+        return paddle_client.get_customer(pk).data
+
     @classmethod
     def api_list_customers_generator(cls, **kwargs) -> Iterator[customer.CustomersResponse]:
-        yield from paginate(paddle_client.list_customers, query_params=customer.CustomerQueryParams(**kwargs))
+        yield from tracing.paginate(
+            cls.__name__,
+            paginate(paddle_client.list_customers, query_params=customer.CustomerQueryParams(**kwargs)),
+        )
+
+    @classmethod
+    def defaults_from_paddle_data(cls, data) -> dict:
+        return {
+            "name": data.name,
+            "email": data.email,
+            "data": data.dict(),
+            "custom_data": data.custom_data,
+        }
 
     @classmethod
+    @tracing.from_paddle_data
     def from_paddle_data(cls, data, occurred_at=None) -> tuple["Customer | None", bool, Exception | None]:
         try:
-            defaults = {
-                "name": data.name,
-                "email": data.email,
-                "data": data.dict(),
-                "custom_data": data.custom_data,
-            }
+            defaults = cls.defaults_from_paddle_data(data)
             user = UserModel.objects.filter(email=data.email).first()
             if user is not None:
                 defaults["user_id"] = user.pk
@@ -306,6 +561,7 @@ class Customer(PaddleBaseModel):
                 query={"pk": data.id},
                 defaults=defaults,
                 occurred_at=occurred_at,
+                parsed_data=data,
             )
 
             return instance, created, None
@@ -313,7 +569,13 @@ class Customer(PaddleBaseModel):
             return None, False, e
 
     @classmethod
-    def sync_from_paddle(cls, include_addresses=True, include_businesses=True, include_subscriptions=True) -> None:
+    def sync_from_paddle(
+        cls,
+        # Public signature, the flags may be passed positionally by existing callers
+        include_addresses=True,  # noqa: FBT002
+        include_businesses=True,  # noqa: FBT002
+        include_subscriptions=True,  # noqa: FBT002
+    ) -> None:
         logger.info("Sync Customers from Paddle")
         created = 0
         updated = 0
@@ -364,11 +626,21 @@ class Customer(PaddleBaseModel):
             logger.info("Subscription sync progress --- synced: %s", count)
 
 
+def _get_customer_id(model, pk) -> str:
+    # Addresses and businesses are fetched through their customer, only known from the stored row
+    using = primary_alias(model)
+    customer_id = model.objects.db_manager(using).filter(pk=pk).values_list("customer_id", flat=True).first()
+    if customer_id is None:
+        msg = f"{model.__name__} {pk} has no known customer, it cannot be fetched from Paddle"
+        raise DjangoPaddleBillingError(msg)
+    return customer_id
+
+
 class Address(PaddleBaseModel):
     id = models.CharField(max_length=50, primary_key=True)
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name="addresses", null=True, blank=True)
-    data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
-    custom_data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
+    data = PaddleDataField(null=True, blank=True, encoder=CompressedPaddleJSONEncoder, decoder=PaddleJSONDecoder)
+    custom_data = models.JSONField(null=True, blank=True, encoder=PaddleJSONEncoder, decoder=PaddleJSONDecoder)
     country_code = models.CharField(max_length=2)
 
     class Meta:
@@ -378,9 +650,11 @@ class Address(PaddleBaseModel):
         return str(self.pk)
 
     def get_data(self) -> address.Address | None:
-        if self.data is None:
-            return None
-        return address.Address.model_validate(self.data)
+        return self._get_data(address.Address)
+
+    @classmethod
+    def api_get_data(cls, pk) -> address.Address:
+        return paddle_client.get_address_for_customer(_get_customer_id(cls, pk), pk).data
 
     @classmethod
     def api_list_addresses_for_customer(cls, customer_id) -> address.AddressesResponse:
@@ -388,30 +662,41 @@ class Address(PaddleBaseModel):
 
     @classmethod
     def api_list_addresses_for_customer_generator(cls, customer_id, **kwargs) -> Iterator[address.AddressesResponse]:
-        yield from paginate(
-            paddle_client.list_addresses_for_customer,
-            customer_id=customer_id,
-            query_params=address.AddressQueryParams(**kwargs),
+        yield from tracing.paginate(
+            cls.__name__,
+            paginate(
+                paddle_client.list_addresses_for_customer,
+                customer_id=customer_id,
+                query_params=address.AddressQueryParams(**kwargs),
+            ),
         )
 
     @classmethod
+    def defaults_from_paddle_data(cls, data, customer_id=None) -> dict:
+        defaults = {
+            "data": data.dict(),
+            "custom_data": data.custom_data,
+            "country_code": data.country_code,
+        }
+        if customer_id is not None:
+            defaults["customer_id"] = customer_id
+        elif getattr(data, "customer_id", None) is not None:
+            # `paddle_billing_client` addresses have no `customer_id` field
+            defaults["customer_id"] = data.customer_id
+        return defaults
+
+    @classmethod
+    @tracing.from_paddle_data
     def from_paddle_data(
         cls, data, customer_id=None, occurred_at=None
     ) -> tuple["Address | None", bool, Exception | None]:
         try:
-            defaults = {
-                "data": data.dict(),
-                "custom_data": data.custom_data,
-                "country_code": data.country_code,
-            }
-            if customer_id is not None:
-                defaults["customer_id"] = customer_id
-            elif data.customer_id is not None:
-                defaults["customer_id"] = data.customer_id
+            defaults = cls.defaults_from_paddle_data(data, customer_id)
             _address, created = cls.update_or_create(
                 query={"pk": data.id},
                 defaults=defaults,
                 occurred_at=occurred_at,
+                parsed_data=data,
             )
             return _address, created, None
         except Exception as e:
@@ -430,8 +715,8 @@ class Address(PaddleBaseModel):
 class Business(PaddleBaseModel):
     id = models.CharField(max_length=50, primary_key=True)
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name="businesses", null=True, blank=True)
-    data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
-    custom_data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
+    data = PaddleDataField(null=True, blank=True, encoder=CompressedPaddleJSONEncoder, decoder=PaddleJSONDecoder)
+    custom_data = models.JSONField(null=True, blank=True, encoder=PaddleJSONEncoder, decoder=PaddleJSONDecoder)
 
     class Meta:
         pass
@@ -440,9 +725,11 @@ class Business(PaddleBaseModel):
         return str(self.pk)
 
     def get_data(self) -> business.Business | None:
-        if self.data is None:
-            return None
-        return business.Business.model_validate(self.data)
+        return self._get_data(business.Business)
+
+    @classmethod
+    def api_get_data(cls, pk) -> business.Business:
+        return paddle_client.get_business_for_customer(_get_customer_id(cls, pk), pk).data
 
     @classmethod
     def api_list_businesses_for_customer(cls, customer_id) -> business.BusinessesResponse:
@@ -450,25 +737,35 @@ class Business(PaddleBaseModel):
 
     @classmethod
     def api_list_businesses_for_customer_generator(cls, customer_id, **kwargs) -> Iterator[business.BusinessesResponse]:
-        yield from paginate(
-            paddle_client.list_businesses_for_customer,
-            customer_id=customer_id,
-            query_params=business.BusinessQueryParams(**kwargs),
+        yield from tracing.paginate(
+            cls.__name__,
+            paginate(
+                paddle_client.list_businesses_for_customer,
+                customer_id=customer_id,
+                query_params=business.BusinessQueryParams(**kwargs),
+            ),
         )
 
     @classmethod
+    def defaults_from_paddle_data(cls, data, customer_id=None) -> dict:
+        defaults = {
+            "data": data.dict(),
+            "custom_data": data.custom_data,
+        }
+        if customer_id is not None:
+            defaults["customer_id"] = customer_id
+        return defaults
+
+    @classmethod
+    @tracing.from_paddle_data
     def from_paddle_data(cls, data, customer_id, occurred_at=None) -> tuple["Business | None", bool, Exception | None]:
         try:
-            defaults = {
-                "data": data.dict(),
-                "custom_data": data.custom_data,
-            }
-            if customer_id is not None:
-                defaults["customer_id"] = customer_id
+            defaults = cls.defaults_from_paddle_data(data, customer_id)
             _business, created = cls.update_or_create(
                 query={"pk": data.id},
                 defaults=defaults,
                 occurred_at=occurred_at,
+                parsed_data=data,
             )
             return _business, created, None
         except Exception as e:
@@ -486,8 +783,8 @@ class Business(PaddleBaseModel):
 
 class Subscription(PaddleBaseModel):
     id = models.CharField(max_length=50, primary_key=True)
-    data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
-    custom_data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
+    data = PaddleDataField(null=True, blank=True, encoder=CompressedPaddleJSONEncoder, decoder=PaddleJSONDecoder)
+    custom_data = models.JSONField(null=True, blank=True, encoder=PaddleJSONEncoder, decoder=PaddleJSONDecoder)
     account = models.ForeignKey(
         to=get_account_model(),
         null=True,
@@ -512,17 +809,26 @@ class Subscription(PaddleBaseModel):
         ],
     )
     products = models.ManyToManyField(Product, related_name="subscriptions")
+    # Monthly recurring amount in the lowest denomination of `currency_code`, maintained for the MRR metrics
+    mrr = models.BigIntegerField(default=0)
+    currency_code = models.CharField(max_length=3, blank=True)
+
+    objects = SubscriptionQuerySet.as_manager()
 
     class Meta:
-        pass
+        indexes: ClassVar = [
+            models.Index(fields=["account", "status"], name="paddle_subscr_account_status"),
+            models.Index(fields=["status"], name="paddle_subscr_status"),
+            models.Index(fields=["occurred_at"], name="paddle_subscr_occurred_at"),
+            models.Index(custom_data_key("account_id"), name="paddle_subscr_account_id_idx"),
+            models.Index(fields=["updated_at"], name="paddle_subscr_updated_at"),
+        ]
 
     def __str__(self) -> str:
         return str(self.pk)
 
     def get_data(self) -> subscription.Subscription | None:
-        if self.data is None:
-            return None
-        return subscription.Subscription.model_validate(self.data)
+        return self._get_data(subscription.Subscription)
 
     @classmethod
     def api_list_subscriptions(cls) -> subscription.SubscriptionsResponse:
@@ -530,8 +836,9 @@ class Subscription(PaddleBaseModel):
 
     @classmethod
     def api_list_subscriptions_generator(cls, **kwargs) -> Iterator[subscription.SubscriptionsResponse]:
-        yield from paginate(
-            paddle_client.list_subscriptions, query_params=subscription.SubscriptionQueryParams(**kwargs)
+        yield from tracing.paginate(
+            cls.__name__,
+            paginate(paddle_client.list_subscriptions, query_params=subscription.SubscriptionQueryParams(**kwargs)),
         )
 
     @classmethod
@@ -539,6 +846,25 @@ class Subscription(PaddleBaseModel):
         return paddle_client.get_subscription(subscription_id)
 
     @classmethod
+    def api_get_data(cls, pk) -> subscription.Subscription:
+        return cls.api_get_subscription(pk).data
+
+    @classmethod
+    def defaults_from_paddle_data(cls, data) -> dict:
+        mrr_amount, currency_code = mrr.compute_mrr(data)
+        return {
+            "customer_id": data.customer_id,
+            "address_id": data.address_id,
+            "business_id": data.business_id,
+            "status": data.status,
+            "mrr": mrr_amount,
+            "currency_code": currency_code,
+            "data": data.dict(),
+            "custom_data": data.custom_data,
+        }
+
+    @classmethod
+    @tracing.from_paddle_data
     def from_paddle_data(cls, data, occurred_at=None) -> tuple["Subscription | None", bool, Exception | str | None]:
         account_id = None
         try:
@@ -552,23 +878,38 @@ class Subscription(PaddleBaseModel):
                 return None, False, error
 
         try:
-            defaults = {
-                "customer_id": data.customer_id,
-                "address_id": data.address_id,
-                "business_id": data.business_id,
-                "status": data.status,
-                "data": data.dict(),
-                "custom_data": data.custom_data,
-            }
+            defaults = cls.defaults_from_paddle_data(data)
             if account_id is not None:
                 defaults["account_id"] = account_id
-            _subscription, created = cls.update_or_create(
-                query={"pk": data.id},
-                defaults=defaults,
-                occurred_at=occurred_at,
-            )
-            product_ids = [item.price.product_id for item in data.items]
-            _subscription.products.set(product_ids)
+            using = router.db_for_write(cls)
+            # The products, items and metrics are updated under the lock of the subscription row
+            with atomic(using=using, savepoint=False):
+                previous = (
+                    cls.objects.db_manager(using)
+                    .select_for_update()
+                    .filter(pk=data.id)
+                    .only("account_id", "status", "mrr", "currency_code")
+                    .first()
+                )
+                previous_state = mrr.get_state(previous)
+                _subscription, created = cls.update_or_create(
+                    query={"pk": data.id},
+                    defaults=defaults,
+                    occurred_at=occurred_at,
+                    parsed_data=data,
+                )
+                product_ids = [item.price.product_id for item in data.items]
+                _subscription.products.set(product_ids)
+                # Items and metrics are left untouched by stale events
+                if occurred_at is None or _subscription.occurred_at == occurred_at:
+                    SubscriptionItem.replace_for_subscriptions(
+                        {_subscription: SubscriptionItem.build_from_paddle_data(_subscription, data)}
+                    )
+                    mrr.record_change(previous_state, mrr.get_state(_subscription), occurred_at)
+                # Including the previous account when the subscription moved to another one
+                entitlements.invalidate_entitlements(_subscription.account_id, using=using)
+                if previous is not None and previous.account_id != _subscription.account_id:
+                    entitlements.invalidate_entitlements(previous.account_id, using=using)
             return _subscription, created, None
         except Exception as e:
             return None, False, e
@@ -594,45 +935,107 @@ class Subscription(PaddleBaseModel):
 
 class Transaction(PaddleBaseModel):
     id = models.CharField(max_length=50, primary_key=True)
-    data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
-    custom_data = models.JSONField(null=True, blank=True, encoder=PrettyJSONEncoder)
+    data = PaddleDataField(null=True, blank=True, encoder=CompressedPaddleJSONEncoder, decoder=PaddleJSONDecoder)
+    custom_data = models.JSONField(null=True, blank=True, encoder=PaddleJSONEncoder, decoder=PaddleJSONDecoder)
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name="transactions")
     subscription = models.ForeignKey(
         Subscription, on_delete=models.CASCADE, related_name="transactions", null=True, blank=True
     )
+    billed_at = models.DateTimeField(null=True, blank=True)
+    # Summary columns of `data` for the reports, amounts in the lowest denomination of `currency_code`
+    address = models.ForeignKey(
+        "Address",
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        related_name="transactions",
+        db_constraint=False,
+    )
+    status = models.CharField(max_length=20, blank=True)
+    currency_code = models.CharField(max_length=3, blank=True)
+    subtotal = models.BigIntegerField(null=True, blank=True)
+    tax = models.BigIntegerField(null=True, blank=True)
+    total = models.BigIntegerField(null=True, blank=True)
+    # Set when `data` has been moved to cold storage by the `archive_transactions` command
+    archived_at = models.DateTimeField(null=True, blank=True)
+    # Creation time at Paddle, unlike `created_at` it does not depend on when the transaction was synced. It is the
+    # partition key of a partitioned table and the month of the archives.
+    paddle_created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    objects = TransactionQuerySet.as_manager()
 
     class Meta:
-        pass
+        indexes: ClassVar = [
+            models.Index(fields=["customer", "created_at"], name="paddle_txn_customer_created"),
+            models.Index(fields=["subscription", "created_at"], name="paddle_txn_subscr_created"),
+            models.Index(fields=["billed_at"], name="paddle_txn_billed_at"),
+            models.Index(fields=["status", "billed_at"], name="paddle_txn_status_billed"),
+            models.Index(fields=["occurred_at"], name="paddle_txn_occurred_at"),
+            models.Index(custom_data_key("account_id"), name="paddle_txn_account_id_idx"),
+            models.Index(fields=["paddle_created_at"], name="paddle_txn_paddle_created"),
+            models.Index(fields=["updated_at"], name="paddle_txn_updated_at"),
+        ]
 
     def __str__(self) -> str:
         return str(self.pk)
 
     def get_data(self) -> transaction.Transaction | None:
-        if self.data is None:
-            return None
-        return transaction.Transaction.model_validate(self.data)
+        return self._get_data(transaction.Transaction)
+
+    def get_archived_data(self) -> dict | None:
+        return archive.load_archived_data(self)
 
     @classmethod
     def api_list_transactions(cls) -> transaction.TransactionsResponse:
         return paddle_client.list_transactions()
 
+    @classmethod
+    def api_get_data(cls, pk) -> transaction.Transaction:
+        return paddle_client.get_transaction(pk).data
+
     @classmethod
     def api_list_transactions_generator(cls, **kwargs) -> Iterator[transaction.TransactionsResponse]:
-        yield from paginate(paddle_client.list_transactions, query_params=transaction.TransactionQueryParams(**kwargs))
+        yield from tracing.paginate(
+            cls.__name__,
+            paginate(paddle_client.list_transactions, query_params=transaction.TransactionQueryParams(**kwargs)),
+        )
+
+    @classmethod
+    def defaults_from_paddle_data(cls, data) -> dict:
+        totals = data.details.totals
+        return {
+            "customer_id": data.customer_id,
+            "subscription_id": data.subscription_id,
+            "billed_at": parse_datetime(data.billed_at) if data.billed_at else None,
+            "address_id": data.address_id,
+            "status": data.status or "",
+            "currency_code": data.currency_code or "",
+            "subtotal": _amount(totals.subtotal) if totals else None,
+            "tax": _amount(totals.tax) if totals else None,
+            "total": _amount(totals.total) if totals else None,
+            "data": data.dict(),
+            "archived_at": None,
+            "custom_data": data.custom_data,
+            **({"paddle_created_at": data.created_at} if data.created_at else {}),
+        }
 
     @classmethod
+    @tracing.from_paddle_data
     def from_paddle_data(cls, data, occurred_at=None) -> tuple["Transaction | None", bool, Exception | None]:
         try:
-            _transaction, created = cls.update_or_create(
-                query={"pk": data.id},
-                defaults={
-                    "customer_id": data.customer_id,
-                    "subscription_id": data.subscription_id,
-                    "data": data.dict(),
-                    "custom_data": data.custom_data,
-                },
-                occurred_at=occurred_at,
-            )
+            # The items are replaced under the lock of the transaction row
+            with atomic(using=router.db_for_write(cls), savepoint=False):
+                _transaction, created = cls.update_or_create(
+                    query={"pk": data.id},
+                    defaults=cls.defaults_from_paddle_data(data),
+                    occurred_at=occurred_at,
+                    parsed_data=data,
+                )
+                # Items are left untouched by stale events
+                if occurred_at is None or _transaction.occurred_at == occurred_at:
+                    TransactionItem.replace_for_transactions(
+                        {_transaction: TransactionItem.build_from_paddle_data(_transaction, data)}
+                    )
             return _transaction, created, None
         except Exception as e:
             logger.info(e)
@@ -676,9 +1079,216 @@ class Transaction(PaddleBaseModel):
         return created, updated
 
 
+def _amount(value) -> int:
+    # Paddle amounts are strings in the lowest denomination of the currency
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class TransactionItem(models.Model):
+    """Line item of a transaction, copied from `data["details"]["line_items"]`"""
+
+    # Transactions may be partitioned, which rules out foreign key constraints referencing them
+    transaction = models.ForeignKey(Transaction, on_delete=models.CASCADE, related_name="items", db_constraint=False)
+    line_item_id = models.CharField(max_length=50, null=True, blank=True)
+    # Prices and products may be received after the transaction
+    price = models.ForeignKey(
+        Price,
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        related_name="transaction_items",
+        db_constraint=False,
+    )
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        related_name="transaction_items",
+        db_constraint=False,
+    )
+    quantity = models.PositiveIntegerField(default=1)
+    subtotal = models.BigIntegerField(default=0)
+    discount = models.BigIntegerField(default=0)
+    tax = models.BigIntegerField(default=0)
+    total = models.BigIntegerField(default=0)
+    currency_code = models.CharField(max_length=3, blank=True)
+    billed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes: ClassVar = [
+            models.Index(fields=["product", "billed_at"], name="paddle_txnitem_product_billed"),
+            models.Index(fields=["price", "billed_at"], name="paddle_txnitem_price_billed"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.transaction_id} - {self.price_id}"
+
+    @classmethod
+    def build_from_paddle_data(cls, _transaction, data) -> list["TransactionItem"]:
+        return [
+            cls(
+                transaction=_transaction,
+                line_item_id=line_item.id,
+                price_id=line_item.price_id,
+                product_id=line_item.product.id,
+                quantity=line_item.quantity,
+                subtotal=_amount(line_item.totals.subtotal),
+                discount=_amount(line_item.totals.discount),
+                tax=_amount(line_item.totals.tax),
+                total=_amount(line_item.totals.total),
+                currency_code=data.currency_code or "",
+                billed_at=_transaction.billed_at,
+            )
+            for line_item in data.details.line_items or []
+        ]
+
+    @classmethod
+    def replace_for_transactions(cls, items_by_transaction: dict) -> None:
+        """Replace the items of the given transactions, {transaction: [TransactionItem, ...]}"""
+        with atomic(using=router.db_for_write(cls)):
+            cls.objects.filter(transaction__in=list(items_by_transaction)).delete()
+            cls.objects.bulk_create([item for items in items_by_transaction.values() for item in items])
+
+
+class SubscriptionItem(models.Model):
+    """Item of a subscription, copied from `data["items"]`"""
+
+    subscription = models.ForeignKey(Subscription, on_delete=models.CASCADE, related_name="items")
+    price = models.ForeignKey(
+        Price,
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        related_name="subscription_items",
+        db_constraint=False,
+    )
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        related_name="subscription_items",
+        db_constraint=False,
+    )
+    status = models.CharField(max_length=20, blank=True)
+    quantity = models.PositiveIntegerField(default=1)
+    recurring = models.BooleanField(default=True)
+    unit_amount = models.BigIntegerField(default=0)
+    currency_code = models.CharField(max_length=3, blank=True)
+
+    class Meta:
+        indexes: ClassVar = [
+            models.Index(fields=["product", "subscription"], name="paddle_subitem_product_subscr"),
+            models.Index(fields=["price", "subscription"], name="paddle_subitem_price_subscr"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.subscription_id} - {self.price_id}"
+
+    @classmethod
+    def build_from_paddle_data(cls, _subscription, data) -> list["SubscriptionItem"]:
+        items = []
+        for item in data.items or []:
+            _price = item.price
+            items.append(
+                cls(
+                    subscription=_subscription,
+                    price_id=_price.id if _price else item.price_id,
+                    product_id=_price.product_id if _price else None,
+                    status=item.status or "",
+                    quantity=item.quantity or 1,
+                    recurring=item.recurring if item.recurring is not None else True,
+                    unit_amount=_amount(_price.unit_price.amount) if _price else 0,
+                    currency_code=_price.unit_price.currency_code if _price else "",
+                )
+            )
+        return items
+
+    @classmethod
+    def replace_for_subscriptions(cls, items_by_subscription: dict) -> None:
+        """Replace the items of the given subscriptions, {subscription: [SubscriptionItem, ...]}"""
+        with atomic(using=router.db_for_write(cls)):
+            cls.objects.filter(subscription__in=list(items_by_subscription)).delete()
+            cls.objects.bulk_create([item for items in items_by_subscription.values() for item in items])
+
+
+class DailyMetrics(models.Model):
+    """
+    MRR metrics of a day and a currency, amounts in the lowest denomination of the currency.
+    The fields are the flows of the day, `with_levels()` and `mrr.get_metrics()` add the levels at the end of the day
+    (`mrr`, `active_count`).
+    """
+
+    date = models.DateField()
+    currency_code = models.CharField(max_length=3)
+    new_mrr = models.BigIntegerField(default=0)
+    expansion_mrr = models.BigIntegerField(default=0)
+    contraction_mrr = models.BigIntegerField(default=0)
+    churned_mrr = models.BigIntegerField(default=0)
+    new_count = models.IntegerField(default=0)
+    churned_count = models.IntegerField(default=0)
+
+    objects = DailyMetricsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = "Daily metrics"
+        constraints: ClassVar = [
+            models.UniqueConstraint(fields=["currency_code", "date"], name="paddle_metrics_currency_date"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.date} {self.currency_code}"
+
+    @property
+    def arr(self) -> int:
+        return self.mrr * 12
+
+
+class WebhookEvent(models.Model):
+    """
+    Webhook received and queued for the workers of `process_webhook_queue`, see `webhook_queue`.
+    The events of an entity share a partition and are processed one at a time, in the order received.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        PROCESSING = "processing", "Processing"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    event_id = models.CharField(max_length=50, unique=True)
+    event_type = models.CharField(max_length=50)
+    occurred_at = models.DateTimeField(null=True, blank=True)
+    entity_id = models.CharField(max_length=50)
+    partition = models.PositiveSmallIntegerField()
+    payload = models.JSONField(encoder=PaddleJSONEncoder, decoder=PaddleJSONDecoder)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    leased_by = models.CharField(max_length=100, blank=True, default="")
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes: ClassVar = [
+            models.Index(fields=["status", "partition", "id"], name="paddle_webhook_claim_idx"),
+            models.Index(fields=["entity_id", "id"], name="paddle_webhook_entity_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event_type} {self.event_id}"
+
+
 @receiver(signals.address_created)
 @receiver(signals.address_imported)
 @receiver(signals.address_updated)
+@tracing.receiver
 def address_event_handler(sender, payload, *args, **kwargs) -> None:
     if not isinstance(payload, address.Address):
         payload = address.Address.model_validate(payload)
@@ -691,6 +1301,7 @@ def address_event_handler(sender, payload, *args, **kwargs) -> None:
 
 @receiver(signals.adjustment_created)
 @receiver(signals.adjustment_updated)
+@tracing.receiver
 def adjustment_event_handler(sender, payload, *args, **kwargs) -> None:
     pass
 
@@ -698,6 +1309,7 @@ def adjustment_event_handler(sender, payload, *args, **kwargs) -> None:
 @receiver(signals.business_created)
 @receiver(signals.business_imported)
 @receiver(signals.business_updated)
+@tracing.receiver
 def business_event_handler(sender, payload, *args, **kwargs) -> None:
     if not isinstance(payload, business.Business):
         payload = business.Business.model_validate(payload)
@@ -711,6 +1323,7 @@ def business_event_handler(sender, payload, *args, **kwargs) -> None:
 @receiver(signals.customer_created)
 @receiver(signals.customer_imported)
 @receiver(signals.customer_updated)
+@tracing.receiver
 def customer_event_handler(sender, payload, *args, **kwargs) -> None:
     if not isinstance(payload, customer.Customer):
         payload = customer.Customer.model_validate(payload)
@@ -724,6 +1337,7 @@ def customer_event_handler(sender, payload, *args, **kwargs) -> None:
 @receiver(signals.discount_created)
 @receiver(signals.discount_imported)
 @receiver(signals.discount_updated)
+@tracing.receiver
 def discount_event_handler(sender, payload, *args, **kwargs) -> None:
     if not isinstance(payload, discount.Discount):
         payload = discount.Discount.model_validate(payload)
@@ -736,6 +1350,7 @@ def discount_event_handler(sender, payload, *args, **kwargs) -> None:
 
 @receiver(signals.payout_created)
 @receiver(signals.payout_paid)
+@tracing.receiver
 def payout_event_handler(sender, payload, *args, **kwargs) -> None:
     pass
 
@@ -743,6 +1358,7 @@ def payout_event_handler(sender, payload, *args, **kwargs) -> None:
 @receiver(signals.price_created)
 @receiver(signals.price_imported)
 @receiver(signals.price_updated)
+@tracing.receiver
 def price_event_handler(sender, payload, *args, **kwargs) -> None:
     if not isinstance(payload, price.Price):
         payload = price.Price.model_validate(payload)
@@ -751,11 +1367,13 @@ def price_event_handler(sender, payload, *args, **kwargs) -> None:
     _, _, error = Price.from_paddle_data(payload, occurred_at)
     if error:
         raise DjangoPaddleBillingError(error)
+    catalog.invalidate_catalog(using=primary_alias(Price))
 
 
 @receiver(signals.product_created)
 @receiver(signals.product_imported)
 @receiver(signals.product_updated)
+@tracing.receiver
 def product_event_handler(sender, payload, *args, **kwargs) -> None:
     if not isinstance(payload, product.Product):
         payload = product.Product.model_validate(payload)
@@ -764,10 +1382,12 @@ def product_event_handler(sender, payload, *args, **kwargs) -> None:
     _, _, error = Product.from_paddle_data(payload, occurred_at)
     if error:
         raise DjangoPaddleBillingError(error)
+    catalog.invalidate_catalog(using=primary_alias(Product))
 
 
 @receiver(signals.report_created)
 @receiver(signals.report_updated)
+@tracing.receiver
 def report_event_handler(sender, payload, *args, **kwargs) -> None:
     pass
 
@@ -781,6 +1401,7 @@ def report_event_handler(sender, payload, *args, **kwargs) -> None:
 @receiver(signals.subscription_resumed)
 @receiver(signals.subscription_trialing)
 @receiver(signals.subscription_updated)
+@tracing.receiver
 def subscription_event_handler(sender, payload, *args, **kwargs) -> None:
     if not isinstance(payload, subscription.Subscription):
         payload = subscription.Subscription.model_validate(payload)
@@ -800,6 +1421,7 @@ def subscription_event_handler(sender, payload, *args, **kwargs) -> None:
 @receiver(signals.transaction_payment_failed)
 @receiver(signals.transaction_ready)
 @receiver(signals.transaction_updated)
+@tracing.receiver
 def transaction_event_handler(sender, payload, *args, **kwargs) -> None:
     if not isinstance(payload, transaction.Transaction):
         payload = transaction.Transaction.model_validate(payload)
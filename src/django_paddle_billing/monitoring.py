@@ -0,0 +1,229 @@
+"""
+Webhook metrics: the duration of each processing phase and the outcome of each event, by event type.
+
+    paddle_webhook_events_total{event_type, outcome}
+    paddle_webhook_duration_seconds{event_type, outcome}
+    paddle_webhook_phase_duration_seconds{event_type, phase}
+
+The phases are `signature`, `parse`, `dispatch` (the receivers, without their queries) and `db`. The outcomes are
+`processed`, `stale` (skipped by `validate_occurred_at()`), `invalid_signature`, `error` (a receiver raised),
+`rejected` (IP not allowed, event type missing), `ignored` (unsupported event type), `queued` (stored for the
+workers of `process_webhook_queue`), `dispatched` (handed to a lane of `dispatch`) and `busy` (the lane was full). The
+processing of the queued and dispatched events is recorded apart.
+
+They are recorded by `PADDLE_BILLING["WEBHOOK_METRICS_BACKEND"]`, by default in memory and rendered in the Prometheus
+text format by `render_metrics()`.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+
+from django.db import connections
+from django.utils.module_loading import import_string
+
+from django_paddle_billing import settings as app_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_local = threading.local()
+
+
+class MetricsBackend:
+    """Receives the webhook metrics, subclass it to forward them elsewhere (StatsD, OpenTelemetry...)"""
+
+    def increment(self, name, labels, value=1) -> None:
+        raise NotImplementedError
+
+    def observe(self, name, labels, value) -> None:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        return ""
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class InMemoryMetricsBackend(MetricsBackend):
+    """Counters and histograms of the process, rendered in the Prometheus text format"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def increment(self, name, labels, value=1) -> None:
+        with self._lock:
+            self.counters[self._key(name, labels)] += value
+
+    def observe(self, name, labels, value) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = _Histogram(self.buckets)
+            histogram.counts[bisect_left(self.buckets, value)] += 1
+            histogram.sum += value
+            histogram.count += 1
+
+    def get_counter(self, name, **labels) -> float:
+        return self.counters.get(self._key(name, labels), 0)
+
+    def get_histogram(self, name, **labels) -> _Histogram | None:
+        return self.histograms.get(self._key(name, labels))
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    @staticmethod
+    def _format_labels(labels) -> str:
+        if not labels:
+            return ""
+        values = ",".join(f'{k}="{v}"' for k, v in labels)
+        return f"{{{values}}}"
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items(), key=lambda item: item[0])
+            histograms = [(key, list(h.counts), h.sum, h.count) for key, h in histograms]
+
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{self._format_labels(labels)} {value:g}")
+
+        for (name, labels), counts, total, count in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, bucket_count in zip([*self.buckets, "+Inf"], counts):
+                cumulative += bucket_count
+                le = bound if isinstance(bound, str) else f"{bound:g}"
+                lines.append(f"{name}_bucket{self._format_labels((*labels, ('le', le)))} {cumulative}")
+            lines.append(f"{name}_sum{self._format_labels(labels)} {total:g}")
+            lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=None)
+def _get_backend(path) -> MetricsBackend:
+    return import_string(path)()
+
+
+def get_backend() -> MetricsBackend:
+    return _get_backend(app_settings.WEBHOOK_METRICS_BACKEND)
+
+
+def render_metrics() -> str:
+    return get_backend().render()
+
+
+def mark_stale() -> None:
+    """Record that the webhook being processed in this thread was skipped as out of date"""
+    tracker = getattr(_local, "tracker", None)
+    if tracker is not None:
+        tracker.stale = True
+
+
+class WebhookTracker:
+    def __init__(self):
+        self.event_type = "unknown"
+        self.outcome = None
+        self.stale = False
+        self.phases = defaultdict(float)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    @contextmanager
+    def dispatch(self):
+        """Time the receivers, the time spent in queries is recorded apart as the `db` phase"""
+        db_time = 0.0
+
+        def timed_execute(execute, sql, params, many, context):
+            nonlocal db_time
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                db_time += time.perf_counter() - start
+
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timed_execute))
+                with self.phase("dispatch"):
+                    yield
+        finally:
+            self.phases["dispatch"] -= db_time
+            self.phases["db"] += db_time
+
+
+@contextmanager
+def track_webhook():
+    """Measure the webhook processed in the block, `outcome` defaults to `processed` (or `stale`)"""
+    tracker = WebhookTracker()
+    previous = getattr(_local, "tracker", None)
+    _local.tracker = tracker
+    start = time.perf_counter()
+    try:
+        yield tracker
+    except Exception:
+        tracker.outcome = "error"
+        raise
+    finally:
+        _local.tracker = previous
+        duration = time.perf_counter() - start
+        if tracker.outcome is None:
+            tracker.outcome = "stale" if tracker.stale else "processed"
+        _record(tracker, duration)
+
+
+def _record(tracker, duration) -> None:
+    try:
+        backend = get_backend()
+        labels = {"event_type": tracker.event_type, "outcome": tracker.outcome}
+        backend.increment("paddle_webhook_events_total", labels)
+        backend.observe("paddle_webhook_duration_seconds", labels, duration)
+        for phase, phase_duration in tracker.phases.items():
+            backend.observe(
+                "paddle_webhook_phase_duration_seconds",
+                {"event_type": tracker.event_type, "phase": phase},
+                phase_duration,
+            )
+    except Exception:
+        # Metrics must never fail a webhook
+        logger.exception("Webhook metrics: recording failed")
+
+    threshold = app_settings.WEBHOOK_SLOW_EVENT_SECONDS
+    if threshold is not None and duration >= threshold:
+        phases = ", ".join(f"{phase}={phase_duration:.3f}s" for phase, phase_duration in tracker.phases.items())
+        logger.warning("Slow webhook: %s (%s) took %.3fs [%s]", tracker.event_type, tracker.outcome, duration, phases)
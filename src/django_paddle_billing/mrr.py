@@ -0,0 +1,231 @@
+"""
+Daily MRR and churn metrics, per currency.
+
+Each `DailyMetrics` row holds the flows of the day (new, expansion, contraction, churned MRR and subscription
+counts). Subscription changes add to the row of their day only, so concurrent changes do not contend on the rows of
+the following days, and `rebuild_metrics` recomputes the rows from the stored subscriptions. The levels (MRR, active
+subscriptions) are the running totals of the flows, computed when read.
+
+Amounts are in the lowest denomination of the currency, normalized to a month. Discounts are not deducted.
+"""
+
+import datetime as dt
+import logging
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+from typing import NamedTuple
+
+from django.apps import apps
+from django.db import router
+from django.db.models import F, Sum
+from django.db.transaction import atomic
+from django.utils import timezone
+
+from django_paddle_billing import settings as app_settings
+from django_paddle_billing.querysets import ACTIVE_CHANGE, MRR_CHANGE
+
+logger = logging.getLogger(__name__)
+
+# Number of billing intervals in a month
+MONTHLY_FACTORS = {
+    "day": Decimal(365) / Decimal(12),
+    "week": Decimal(52) / Decimal(12),
+    "month": Decimal(1),
+    "year": Decimal(1) / Decimal(12),
+}
+
+FLOW_FIELDS = (
+    "new_mrr",
+    "expansion_mrr",
+    "contraction_mrr",
+    "churned_mrr",
+    "new_count",
+    "churned_count",
+)
+
+
+class MRRState(NamedTuple):
+    mrr: int
+    currency_code: str
+    active: bool
+
+
+def compute_mrr(data) -> tuple[int, str]:
+    """Monthly recurring amount and currency of a `paddle_billing_client` subscription"""
+    total = Decimal(0)
+    currency_code = data.currency_code or ""
+    for item in data.items or []:
+        _price = item.price
+        if _price is None or _price.billing_cycle is None or item.recurring is False:
+            continue
+        factor = MONTHLY_FACTORS.get(_price.billing_cycle.interval)
+        if factor is None:
+            continue
+        amount = Decimal(_price.unit_price.amount) * (item.quantity or 1)
+        total += amount * factor / _price.billing_cycle.frequency
+        currency_code = currency_code or _price.unit_price.currency_code
+    return int(total.quantize(Decimal(1), rounding=ROUND_HALF_UP)), currency_code
+
+
+def is_active(status) -> bool:
+    return status in app_settings.MRR_STATUSES
+
+
+def get_state(subscription) -> MRRState | None:
+    if subscription is None:
+        return None
+    mrr, currency_code = subscription.mrr, subscription.currency_code
+    # Stored before the metrics existed, its MRR is not computed until `rebuild_metrics` runs: without it, the whole
+    # MRR of its next change would count as new
+    if not currency_code and subscription.data is not None:
+        mrr, currency_code = compute_mrr(subscription.get_data())
+    if not currency_code:
+        return None
+    return MRRState(mrr, currency_code, is_active(subscription.status))
+
+
+def get_day(occurred_at=None) -> dt.date:
+    return timezone.localdate(occurred_at or timezone.now(), dt.timezone.utc)
+
+
+def compute_deltas(old: MRRState | None, new: MRRState | None) -> dict[str, dict[str, int]]:
+    """Deltas per currency between two states of a subscription, `None` (no currency) counting as inactive"""
+    deltas = defaultdict(lambda: defaultdict(int))
+    was_active = old is not None and old.active
+    now_active = new is not None and new.active
+    if was_active and now_active and old.currency_code == new.currency_code:
+        change = new.mrr - old.mrr
+        if change > 0:
+            deltas[new.currency_code]["expansion_mrr"] += change
+        elif change < 0:
+            deltas[new.currency_code]["contraction_mrr"] -= change
+        return deltas
+
+    if was_active:
+        previous = deltas[old.currency_code]
+        previous["churned_mrr"] += old.mrr
+        previous["churned_count"] += 1
+    if now_active:
+        current = deltas[new.currency_code]
+        current["new_mrr"] += new.mrr
+        current["new_count"] += 1
+    return deltas
+
+
+def apply_deltas(day: dt.date, deltas: dict[str, dict[str, int]]) -> None:
+    DailyMetrics = apps.get_model("django_paddle_billing", "DailyMetrics")
+
+    with atomic(using=router.db_for_write(DailyMetrics)):
+        for currency_code, flows in deltas.items():
+            changes = {name: F(name) + value for name, value in flows.items() if value and name in FLOW_FIELDS}
+            if not changes:
+                continue
+            DailyMetrics.objects.get_or_create(date=day, currency_code=currency_code)
+            DailyMetrics.objects.filter(date=day, currency_code=currency_code).update(**changes)
+
+
+def record_change(old: MRRState | None, new: MRRState | None, occurred_at=None) -> None:
+    if old == new:
+        return
+    apply_deltas(get_day(occurred_at), compute_deltas(old, new))
+
+
+def _subscription_days(data, status) -> tuple[dt.date | None, dt.date | None]:
+    started_at = data.started_at or data.first_billed_at or data.created_at
+    ended_at = None
+    if not is_active(status):
+        ended_at = data.canceled_at or data.paused_at
+    return (
+        get_day(started_at) if started_at else None,
+        get_day(ended_at) if ended_at else None,
+    )
+
+
+def rebuild_metrics(batch_size=1000) -> int:
+    """
+    Recompute the MRR of every subscription and the daily metrics, in one pass over the subscriptions.
+
+    Only the current state of subscriptions is stored, so their whole current MRR counts as new at their start,
+    and churns at their cancellation or pause: expansions and contractions are not reconstructed.
+    """
+    DailyMetrics = apps.get_model("django_paddle_billing", "DailyMetrics")
+    Subscription = apps.get_model("django_paddle_billing", "Subscription")
+
+    flows = defaultdict(lambda: defaultdict(int))
+    count = 0
+    batch = []
+    # Only the changed rows are written, bumping `updated_at` as `save()` would
+    fields = ["mrr", "currency_code", "updated_at"]
+    now = timezone.now()
+    queryset = Subscription.objects.exclude(data=None).only(
+        "id", "status", "mrr", "currency_code", "updated_at", "data"
+    )
+    for _subscription in queryset.iterator(batch_size):
+        data = _subscription.get_data()
+        state = compute_mrr(data)
+        if state != (_subscription.mrr, _subscription.currency_code):
+            _subscription.mrr, _subscription.currency_code = state
+            _subscription.updated_at = now
+            batch.append(_subscription)
+        if len(batch) >= batch_size:
+            Subscription.objects.bulk_update(batch, fields)
+            batch = []
+        count += 1
+
+        started_on, ended_on = _subscription_days(data, _subscription.status)
+        if started_on is None or (ended_on is None and not is_active(_subscription.status)):
+            continue
+        new = flows[(started_on, _subscription.currency_code)]
+        new["new_mrr"] += _subscription.mrr
+        new["new_count"] += 1
+        if ended_on is not None:
+            churned = flows[(ended_on, _subscription.currency_code)]
+            churned["churned_mrr"] += _subscription.mrr
+            churned["churned_count"] += 1
+    Subscription.objects.bulk_update(batch, fields)
+
+    rows = [
+        DailyMetrics(date=day, currency_code=currency_code, **values)
+        for (day, currency_code), values in sorted(flows.items())
+    ]
+
+    with atomic(using=router.db_for_write(DailyMetrics)):
+        DailyMetrics.objects.all().delete()
+        DailyMetrics.objects.bulk_create(rows, batch_size=batch_size)
+    logger.info("Metrics: rebuilt from %s subscriptions, %s daily rows", count, len(rows))
+    return len(rows)
+
+
+def get_metrics(start: dt.date, end: dt.date, currency_code=None) -> list:
+    """Daily metrics between two dates (inclusive), with `mrr` and `active_count` at the end of each day"""
+    DailyMetrics = apps.get_model("django_paddle_billing", "DailyMetrics")
+
+    queryset = DailyMetrics.objects.all()
+    if currency_code is not None:
+        queryset = queryset.filter(currency_code=currency_code)
+
+    # Levels at the start, then the running totals over the period
+    levels = defaultdict(lambda: {"mrr": 0, "active_count": 0})
+    opening = (
+        queryset.filter(date__lt=start)
+        .values("currency_code")
+        .annotate(mrr=Sum(MRR_CHANGE), active_count=Sum(ACTIVE_CHANGE))
+        .order_by()
+    )
+    for row in opening:
+        levels[row["currency_code"]] = {"mrr": row["mrr"], "active_count": row["active_count"]}
+
+    rows = list(queryset.filter(date__range=(start, end)).order_by("date", "currency_code"))
+    for row in rows:
+        level = levels[row.currency_code]
+        level["mrr"] += row.new_mrr + row.expansion_mrr - row.contraction_mrr - row.churned_mrr
+        level["active_count"] += row.new_count - row.churned_count
+        row.mrr, row.active_count = level["mrr"], level["active_count"]
+    return rows
+
+
+def get_current_mrr(currency_code: str) -> int:
+    """MRR at the end of the last day with metrics"""
+    DailyMetrics = apps.get_model("django_paddle_billing", "DailyMetrics")
+
+    return DailyMetrics.objects.filter(currency_code=currency_code).aggregate(mrr=Sum(MRR_CHANGE))["mrr"] or 0
@@ -0,0 +1,93 @@
+from django.db import NotSupportedError, migrations
+
+from django_paddle_billing.partitioning import is_partitioned
+
+
+def _is_postgresql(schema_editor) -> bool:
+    return schema_editor.connection.vendor == "postgresql"
+
+
+def _is_partitioned(schema_editor, model) -> bool:
+    # PostgreSQL cannot build indexes concurrently on partitioned tables
+    return is_partitioned(schema_editor.connection.alias, table=model._meta.db_table)
+
+
+def _ensure_not_in_transaction(schema_editor) -> None:
+    if schema_editor.connection.in_atomic_block:
+        msg = (
+            "Building indexes concurrently cannot be executed inside a transaction, "
+            "set `atomic = False` on the Migration class."
+        )
+        raise NotSupportedError(msg)
+
+
+class AddIndexConcurrentlyIfSupported(migrations.AddIndex):
+    """
+    AddIndex building the index with CREATE INDEX CONCURRENTLY on PostgreSQL, so large tables stay
+    writable while it is created, and with a regular CREATE INDEX on partitioned tables and the other databases.
+
+    Unlike `django.contrib.postgres.operations.AddIndexConcurrently`, it does not require psycopg
+    to be installed and can be shipped in migrations that also run on SQLite or MySQL.
+    """
+
+    atomic = False
+
+    def describe(self):
+        return f"Create index {self.index.name} (concurrently on PostgreSQL) on model {self.model_name}"
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if _is_postgresql(schema_editor) and not _is_partitioned(schema_editor, model):
+            _ensure_not_in_transaction(schema_editor)
+            schema_editor.add_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if _is_postgresql(schema_editor) and not _is_partitioned(schema_editor, model):
+            _ensure_not_in_transaction(schema_editor)
+            schema_editor.remove_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.remove_index(model, self.index)
+
+
+class RunInTransaction(migrations.SeparateDatabaseAndState):
+    """
+    Apply `operations` in one transaction from a migration that is not atomic, so that columns and their backfill
+    are applied together by the migration that also builds their indexes concurrently.
+    """
+
+    atomic = True
+
+    def __init__(self, operations):
+        super().__init__(database_operations=operations, state_operations=operations)
+
+    def deconstruct(self):
+        return self.__class__.__qualname__, [], {"operations": self.database_operations}
+
+    def describe(self):
+        return f"In one transaction: {'; '.join(operation.describe() for operation in self.database_operations)}"
+
+
+class RunPostgreSQLConcurrently(migrations.RunSQL):
+    """
+    RunSQL executed on PostgreSQL only, outside of a transaction, for PostgreSQL specific indexes
+    (GIN, trigram, ...) built with CREATE INDEX CONCURRENTLY.
+    """
+
+    atomic = False
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if _is_postgresql(schema_editor):
+            _ensure_not_in_transaction(schema_editor)
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if _is_postgresql(schema_editor):
+            _ensure_not_in_transaction(schema_editor)
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
@@ -0,0 +1,213 @@
+"""
+Opt-in monthly range partitioning of the transaction table on PostgreSQL.
+
+The table is partitioned by `paddle_created_at`, the creation time of the transaction at Paddle, which never changes
+once a row is written. The local `created_at` would put the whole history in the month of its first sync.
+
+PostgreSQL requires the partition key in every unique constraint, so the primary key of a partitioned table is
+(id, paddle_created_at). The uniqueness of `id` alone is kept by the `<table>_ids` table, maintained by triggers: a
+concurrent insert of the same transaction still fails with an `IntegrityError`, as `update_or_create()` expects.
+Lookups by primary key still work, but probe each partition's index.
+"""
+
+import datetime as dt
+import logging
+
+from django.apps import apps
+from django.db import connections, transaction
+
+from django_paddle_billing.exceptions import DjangoPaddleBillingError
+
+logger = logging.getLogger(__name__)
+
+
+def _get_table():
+    return apps.get_model("django_paddle_billing", "Transaction")._meta.db_table
+
+
+def _month_start(value: dt.date) -> dt.date:
+    return value.replace(day=1)
+
+
+def _next_month(value: dt.date) -> dt.date:
+    return (value.replace(day=28) + dt.timedelta(days=4)).replace(day=1)
+
+
+def get_partition_name(table: str, month: dt.date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def get_partition_sql(table: str, month: dt.date, quote) -> tuple[str, list[str]]:
+    """Statement creating the partition of `month`, with its parameters"""
+    name = get_partition_name(table, month)
+    return (
+        f"CREATE TABLE {quote(name)} PARTITION OF {quote(table)} FOR VALUES FROM (%s) TO (%s)",
+        [month.isoformat(), _next_month(month).isoformat()],
+    )
+
+
+def get_ids_table(table: str) -> str:
+    return f"{table}_ids"
+
+
+def get_partitioned_table_sql(table: str, legacy: str, quote) -> list[str]:
+    """Statements creating the partitioned table with the columns of `legacy`, and its default partition"""
+    return [
+        (
+            f"CREATE TABLE {quote(table)} (LIKE {quote(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE (paddle_created_at)"
+        ),
+        f"ALTER TABLE {quote(table)} ADD PRIMARY KEY (id, paddle_created_at)",
+        f"CREATE TABLE {quote(table + '_default')} PARTITION OF {quote(table)} DEFAULT",
+    ]
+
+
+def get_ids_tracking_sql(table: str, source: str, quote) -> list[str]:
+    """Statements creating the table keeping `id` unique with the ids of `source`, and the triggers maintaining it"""
+    ids = get_ids_table(table)
+    function = f"{table}_track_ids"
+    # Identifiers are quoted by `quote()`
+    return [
+        f"CREATE TABLE {quote(ids)} (id varchar(50) PRIMARY KEY)",
+        f"INSERT INTO {quote(ids)} (id) SELECT id FROM {quote(source)}",  # noqa: S608
+        (
+            f"CREATE FUNCTION {quote(function)}() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN "  # noqa: S608
+            f"IF TG_OP = 'INSERT' THEN INSERT INTO {quote(ids)} (id) VALUES (NEW.id); RETURN NEW; END IF; "
+            f"DELETE FROM {quote(ids)} WHERE id = OLD.id; RETURN OLD; END $$"
+        ),
+        # A row moved to another partition is deleted then inserted, which releases then takes its id again
+        (
+            f"CREATE TRIGGER {quote(function)} AFTER INSERT OR DELETE ON {quote(table)} "
+            f"FOR EACH ROW EXECUTE FUNCTION {quote(function)}()"
+        ),
+    ]
+
+
+def _ensure_postgresql(connection):
+    if connection.vendor != "postgresql":
+        msg = "Transaction partitioning is only supported on PostgreSQL"
+        raise DjangoPaddleBillingError(msg)
+
+
+def is_partitioned(using="default", table=None) -> bool:
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [table or _get_table()],
+        )
+        return cursor.fetchone() is not None
+
+
+def create_partitions(start: dt.date, end: dt.date, using="default") -> list[str]:
+    """Create the monthly partitions covering [start, end], return the names of the ones created"""
+    connection = connections[using]
+    _ensure_postgresql(connection)
+    table = _get_table()
+    quote = connection.ops.quote_name
+
+    created = []
+    month = _month_start(start)
+    with connection.cursor() as cursor:
+        while month <= end:
+            name = get_partition_name(table, month)
+            cursor.execute("SELECT to_regclass(%s)", [name])
+            if cursor.fetchone()[0] is None:
+                cursor.execute(*get_partition_sql(table, month, quote))
+                created.append(name)
+                logger.info("Partitioning: created partition %s", name)
+            month = _next_month(month)
+    return created
+
+
+def create_future_partitions(months_ahead=3, using="default") -> list[str]:
+    today = dt.datetime.now(tz=dt.timezone.utc).date()
+    end = today
+    for _ in range(months_ahead):
+        end = _next_month(end)
+    return create_partitions(today, end, using=using)
+
+
+def convert_to_partitioned(months_ahead=3, using="default") -> None:
+    """
+    Rebuild the transaction table as a partitioned table and copy the existing rows into it.
+
+    The whole conversion runs in one transaction holding an exclusive lock on the table, so webhooks
+    writing transactions wait until it completes: run it during a maintenance window on large tables.
+    """
+    connection = connections[using]
+    _ensure_postgresql(connection)
+    table = _get_table()
+    legacy = f"{table}_legacy"
+    quote = connection.ops.quote_name
+
+    if is_partitioned(using):
+        msg = f"{table} is already partitioned"
+        raise DjangoPaddleBillingError(msg)
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {quote(table)} IN ACCESS EXCLUSIVE MODE")
+
+        # Secondary indexes and foreign keys are recreated on the new table
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname NOT IN ("
+            "  SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'"
+            ")",
+            [table, table],
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass "
+            "AND contype = 'f'",
+            [table],
+        )
+        foreign_keys = cursor.fetchall()
+
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE confrelid = %s::regclass AND contype = 'f'",
+            [table],
+        )
+        if cursor.fetchone() is not None:
+            msg = f"{table} is referenced by foreign keys, which partitioned tables cannot serve"
+            raise DjangoPaddleBillingError(msg)
+
+        cursor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(legacy)}")
+        for name, _ in foreign_keys:
+            cursor.execute(f"ALTER TABLE {quote(legacy)} DROP CONSTRAINT {quote(name)}")
+        cursor.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = %s AND indexname NOT IN ("
+            "  SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'"
+            ")",
+            [legacy, legacy],
+        )
+        for (name,) in cursor.fetchall():
+            cursor.execute(f"DROP INDEX {quote(name)}")
+
+        for statement in get_partitioned_table_sql(table, legacy, quote):
+            cursor.execute(statement)
+
+        # Identifiers below are quoted by `quote_name()`, values are passed as parameters
+        cursor.execute(f"SELECT MIN(paddle_created_at) FROM {quote(legacy)}")  # noqa: S608
+        oldest = cursor.fetchone()[0]
+        today = dt.datetime.now(tz=dt.timezone.utc).date()
+        end = today
+        for _ in range(months_ahead):
+            end = _next_month(end)
+        create_partitions(oldest.date() if oldest else today, end, using=using)
+
+        cursor.execute(f"INSERT INTO {quote(table)} SELECT * FROM {quote(legacy)}")  # noqa: S608
+
+        # The primary key no longer keeps `id` unique on its own
+        for statement in get_ids_tracking_sql(table, legacy, quote):
+            cursor.execute(statement)
+        cursor.execute(f"DROP TABLE {quote(legacy)}")
+
+        for definition in index_definitions:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}")
+
+    logger.info("Partitioning: %s converted to a partitioned table", table)
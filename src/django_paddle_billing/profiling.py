@@ -0,0 +1,108 @@
+"""
+cProfile (and optionally tracemalloc) profiles of `sync_from_paddle --profile` runs and of a sampled fraction of the
+webhooks (`PADDLE_BILLING["PROFILE_WEBHOOKS"]`, between 0 and 1).
+
+The stats are written to `PROFILE_DIR` (default: `paddle-billing-profiles` in the temporary directory) and can be
+opened with `python -m pstats` or snakeviz.
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import random
+import tempfile
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.utils.text import slugify
+
+from django_paddle_billing import settings as app_settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_profile_dir() -> Path:
+    profile_dir = app_settings.PROFILE_DIR or Path(tempfile.gettempdir()) / "paddle-billing-profiles"
+    return Path(profile_dir)
+
+
+class Profile:
+    def __init__(self, name, *, memory=False):
+        self.name = name
+        self.memory = memory
+        self.path = None
+        self.duration = None
+        self.stats = None
+        self.peak_memory = None
+        self.top_allocations = []
+
+    def report(self, limit=20) -> str:
+        output = io.StringIO()
+        output.write(f"Profile {self.name}: {self.duration:.3f}s, stats written to {self.path}\n")
+        if self.stats is not None:
+            self.stats.stream = output
+            self.stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        if self.peak_memory is not None:
+            output.write(f"Peak traced memory: {self.peak_memory / 1024 / 1024:.1f} MiB\n")
+            for statistic in self.top_allocations[:limit]:
+                output.write(f"{statistic}\n")
+        return output.getvalue()
+
+
+@contextmanager
+def profile(name, memory=None, profile_dir=None):
+    """
+    Profile the block with cProfile, and tracemalloc when `memory` (default: `PROFILE_MEMORY`),
+    the stats are saved to `<profile_dir>/<name>-<timestamp>-<random>.prof`
+    """
+    memory = app_settings.PROFILE_MEMORY if memory is None else memory
+    result = Profile(name, memory=memory)
+    profiler = cProfile.Profile()
+
+    # tracemalloc may already be tracing for the application, leave it as it is then
+    start_tracing = memory and not tracemalloc.is_tracing()
+    if start_tracing:
+        tracemalloc.start()
+    elif memory:
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        result.duration = time.perf_counter() - start
+        if memory:
+            _, result.peak_memory = tracemalloc.get_traced_memory()
+            result.top_allocations = tracemalloc.take_snapshot().statistics("lineno")[:100]
+            if start_tracing:
+                tracemalloc.stop()
+
+        profile_dir = Path(profile_dir or get_profile_dir())
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        result.path = (
+            profile_dir / f"{slugify(result.name)}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.prof"
+        )
+        profiler.dump_stats(result.path)
+        result.stats = pstats.Stats(profiler)
+
+
+def should_profile_webhook() -> bool:
+    rate = app_settings.PROFILE_WEBHOOKS
+    return bool(rate) and random.random() < rate  # noqa: S311
+
+
+@contextmanager
+def profile_webhook():
+    """Profile the webhook processed in the block if it is sampled, and log the hot functions"""
+    if not should_profile_webhook():
+        yield None
+        return
+    with profile("webhook") as result:
+        yield result
+    logger.info(result.report(limit=app_settings.PROFILE_TOP))
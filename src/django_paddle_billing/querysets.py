@@ -0,0 +1,156 @@
+import typing
+
+from django.apps import apps
+from django.db import models
+from django.db.models import F, OuterRef, Prefetch, Q, Subquery, Sum
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast, Coalesce
+
+from django_paddle_billing import settings as app_settings
+
+
+def custom_data_key(key: str, prefix: str = "") -> Cast:
+    """
+    Text value of a `custom_data` key, usable both in queries and as an index expression.
+    The cast makes lookups compare plain text instead of JSON values on every backend.
+    """
+    return Cast(KT(f"{prefix}custom_data__{key}"), output_field=models.TextField())
+
+
+class PaddleSearchQuerySet(models.QuerySet):
+    """
+    QuerySet with a `search()` method shared by the admin and application code.
+
+    On PostgreSQL the `icontains` lookups are served by the trigram GIN indexes created in
+    migration 0004, and the `custom_data` key lookups by the expression indexes on `->>`.
+    Other databases fall back to the plain B-tree indexes, which still serve ID and exact lookups.
+    """
+
+    # Fields matched with `icontains`
+    search_fields: typing.ClassVar = ()
+    # Path to the model holding `custom_data`, e.g. "customer__" for a related model
+    custom_data_prefix: typing.ClassVar = ""
+    # Paddle ID prefix, a term starting with it is looked up by primary key only
+    id_prefix: typing.ClassVar = ""
+
+    def search(self, term: str) -> "PaddleSearchQuerySet":
+        term = (term or "").strip()
+        if not term:
+            return self
+
+        if self.id_prefix and term.startswith(self.id_prefix):
+            return self.filter(pk=term)
+
+        query = Q(pk=term)
+        for field in self.search_fields:
+            query |= Q(**{f"{field}__icontains": term})
+
+        aliases = {}
+        for key in app_settings.SEARCH_CUSTOM_DATA_KEYS:
+            alias = f"_search_{key}"
+            aliases[alias] = custom_data_key(key, self.custom_data_prefix)
+            query |= Q(**{alias: term})
+
+        return self.alias(**aliases).filter(query)
+
+
+def _get_account_id(account):
+    return getattr(account, "pk", account)
+
+
+def _recent_transactions_prefetch(limit: int) -> Prefetch:
+    Transaction = apps.get_model("django_paddle_billing", "Transaction")
+
+    # Sliced prefetches are limited per parent row with a window function,
+    # served by the (customer, created_at) and (subscription, created_at) indexes
+    return Prefetch(
+        "transactions",
+        queryset=Transaction.objects.order_by("-created_at")[:limit],
+        to_attr="recent_transactions",
+    )
+
+
+class CustomerQuerySet(PaddleSearchQuerySet):
+    search_fields: typing.ClassVar = ("email", "name")
+    id_prefix: typing.ClassVar = "ctm_"
+
+    def for_user(self, user) -> "CustomerQuerySet":
+        return self.filter(user_id=_get_account_id(user))
+
+    def with_subscriptions(self) -> "CustomerQuerySet":
+        return self.prefetch_related("subscriptions")
+
+    def recent_transactions(self, limit: int = 10) -> "CustomerQuerySet":
+        """Prefetch the latest `limit` transactions of each customer into `customer.recent_transactions`"""
+        return self.prefetch_related(_recent_transactions_prefetch(limit))
+
+
+class SubscriptionQuerySet(PaddleSearchQuerySet):
+    search_fields: typing.ClassVar = ("customer__email", "customer__name")
+    id_prefix: typing.ClassVar = "sub_"
+
+    def active(self) -> "SubscriptionQuerySet":
+        """Subscriptions in one of the `ENTITLEMENT_STATUSES`"""
+        return self.filter(status__in=app_settings.ENTITLEMENT_STATUSES)
+
+    def for_account(self, account) -> "SubscriptionQuerySet":
+        # Served by the (account, status) index, also when chained with `active()`
+        return self.filter(account_id=_get_account_id(account))
+
+    def with_customer(self) -> "SubscriptionQuerySet":
+        return self.select_related("customer")
+
+    def with_products(self) -> "SubscriptionQuerySet":
+        """
+        Prefetch the products without their `data`, enough to list names and statuses.
+        Use `prefetch_related("products")` instead when the product payloads are needed.
+        """
+        Product = apps.get_model("django_paddle_billing", "Product")
+        return self.prefetch_related(Prefetch("products", queryset=Product.objects.only("id", "name", "status")))
+
+    def recent_transactions(self, limit: int = 10) -> "SubscriptionQuerySet":
+        """Prefetch the latest `limit` transactions of each subscription into `subscription.recent_transactions`"""
+        return self.prefetch_related(_recent_transactions_prefetch(limit))
+
+
+class TransactionQuerySet(PaddleSearchQuerySet):
+    search_fields: typing.ClassVar = ("customer__email",)
+    id_prefix: typing.ClassVar = "txn_"
+
+    def for_account(self, account) -> "TransactionQuerySet":
+        return self.filter(subscription__account_id=_get_account_id(account))
+
+    def with_customer(self) -> "TransactionQuerySet":
+        return self.select_related("customer")
+
+    def with_subscription(self) -> "TransactionQuerySet":
+        return self.select_related("subscription")
+
+    def recent(self) -> "TransactionQuerySet":
+        return self.order_by("-created_at")
+
+    def billable_between(self, start, end) -> "TransactionQuerySet":
+        """Transactions billed in [start, end), served by the `billed_at` index"""
+        return self.filter(billed_at__gte=start, billed_at__lt=end)
+
+
+# Net changes of a day of `DailyMetrics`, the levels are their running totals
+MRR_CHANGE = F("new_mrr") + F("expansion_mrr") - F("contraction_mrr") - F("churned_mrr")
+ACTIVE_CHANGE = F("new_count") - F("churned_count")
+
+
+class DailyMetricsQuerySet(models.QuerySet):
+    def with_levels(self) -> "DailyMetricsQuerySet":
+        """
+        Annotate `mrr` and `active_count` at the end of each day, summing the changes of the currency up to the day.
+        Unlike a window function, the sums ignore the filters of the queryset.
+        """
+        up_to_day = (
+            self.model.objects.filter(currency_code=OuterRef("currency_code"), date__lte=OuterRef("date"))
+            .order_by()
+            .values("currency_code")
+        )
+        return self.annotate(
+            mrr=Coalesce(Subquery(up_to_day.annotate(total=Sum(MRR_CHANGE)).values("total")), 0),
+            active_count=Coalesce(Subquery(up_to_day.annotate(total=Sum(ACTIVE_CHANGE)).values("total")), 0),
+        )
@@ -0,0 +1,149 @@
+"""
+Revenue reports aggregated by the database over the transaction summary columns.
+
+Reports are grouped by any of `GROUP_BY_CHOICES` and computed one date range chunk at a time, so each query
+only reads the transactions billed in that range and the rows are streamed as they are produced.
+Grouping by product aggregates the transaction items instead of the transactions.
+"""
+
+import csv
+import datetime as dt
+import json
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, DateField, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+
+from django_paddle_billing import settings as app_settings
+
+GROUP_BY_CHOICES = ("day", "month", "product", "country", "currency")
+CHUNK_CHOICES = ("day", "month", "none")
+AMOUNT_COLUMNS = ("count", "net_amount", "tax_amount", "gross_amount")
+
+# Column of each dimension in the report rows
+DIMENSION_COLUMNS = {
+    "day": "day",
+    "month": "month",
+    "product": "product_id",
+    "country": "country_code",
+    "currency": "currency_code",
+}
+
+
+def get_columns(group_by: Iterable[str]) -> list[str]:
+    return [DIMENSION_COLUMNS[name] for name in group_by] + list(AMOUNT_COLUMNS)
+
+
+def revenue_queryset(start: dt.datetime, end: dt.datetime, group_by: Iterable[str], statuses=None):
+    """Revenue of the transactions billed in [start, end) as a values() queryset"""
+    Transaction = apps.get_model("django_paddle_billing", "Transaction")
+    TransactionItem = apps.get_model("django_paddle_billing", "TransactionItem")
+
+    group_by = list(group_by)
+    unknown = set(group_by) - set(GROUP_BY_CHOICES)
+    if unknown:
+        msg = f"Unknown group by: {', '.join(sorted(unknown))}"
+        raise ValueError(msg)
+    statuses = statuses or app_settings.REVENUE_STATUSES
+
+    if "product" in group_by:
+        queryset = TransactionItem.objects.filter(transaction__status__in=statuses)
+        prefix = "transaction__"
+    else:
+        queryset = Transaction.objects.filter(status__in=statuses)
+        prefix = ""
+    queryset = queryset.filter(billed_at__gte=start, billed_at__lt=end)
+
+    expressions = {
+        "day": TruncDate("billed_at", tzinfo=dt.timezone.utc),
+        "month": TruncMonth("billed_at", output_field=DateField(), tzinfo=dt.timezone.utc),
+        "country_code": F(f"{prefix}address__country_code"),
+    }
+    fields = []
+    aliases = {}
+    for name in group_by:
+        column = DIMENSION_COLUMNS[name]
+        if column in expressions:
+            aliases[column] = expressions[column]
+        else:
+            fields.append(column)
+
+    return (
+        queryset.values(*fields, **aliases)
+        .annotate(
+            count=Count("pk"),
+            net_amount=Sum("subtotal"),
+            tax_amount=Sum("tax"),
+            gross_amount=Sum("total"),
+        )
+        .order_by(*[DIMENSION_COLUMNS[name] for name in group_by])
+    )
+
+
+def _next_chunk(value: dt.datetime, chunk: str) -> dt.datetime:
+    if chunk == "day":
+        return value + dt.timedelta(days=1)
+    return (value.replace(day=28) + dt.timedelta(days=4)).replace(day=1)
+
+
+def _chunks(start: dt.datetime, end: dt.datetime, chunk: str) -> Iterator[tuple]:
+    if chunk == "none":
+        yield start, end
+        return
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(_next_chunk(chunk_start.replace(hour=0, minute=0, second=0, microsecond=0), chunk), end)
+        yield chunk_start, chunk_end
+        chunk_start = chunk_end
+
+
+def iter_revenue_report(
+    start: dt.datetime, end: dt.datetime, group_by: Iterable[str], chunk="month", statuses=None
+) -> Iterator[dict]:
+    """
+    Yield the report rows, querying one chunk of the date range at a time.
+
+    When no dimension is as fine as the chunks, the groups would span several chunks: they are summed
+    in memory and yielded at the end.
+    """
+    group_by = list(group_by)
+    if chunk not in CHUNK_CHOICES:
+        msg = f"Unknown chunk: {chunk}"
+        raise ValueError(msg)
+    streamed = chunk == "none" or "day" in group_by or ("month" in group_by and chunk == "month")
+
+    merged = defaultdict(lambda: dict.fromkeys(AMOUNT_COLUMNS, 0))
+    dimensions = [DIMENSION_COLUMNS[name] for name in group_by]
+    for chunk_start, chunk_end in _chunks(start, end, chunk):
+        for row in revenue_queryset(chunk_start, chunk_end, group_by, statuses).iterator():
+            if streamed:
+                yield row
+                continue
+            amounts = merged[tuple(row[column] for column in dimensions)]
+            for column in AMOUNT_COLUMNS:
+                amounts[column] += row[column] or 0
+
+    for key in sorted(merged, key=lambda values: tuple("" if value is None else str(value) for value in values)):
+        # Keys hold one value per dimension, as built above
+        yield {**dict(zip(dimensions, key)), **merged[key]}
+
+
+def write_csv(rows: Iterable[dict], stream, columns: list[str]) -> int:
+    writer = csv.DictWriter(stream, fieldnames=columns)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(rows: Iterable[dict], stream) -> int:
+    count = 0
+    for row in rows:
+        stream.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+        count += 1
+    return count
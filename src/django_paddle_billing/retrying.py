@@ -0,0 +1,70 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from apiclient.exceptions import APIRequestError
+
+from django_paddle_billing import settings as app_settings
+from django_paddle_billing import tracing
+
+logger = logging.getLogger(__name__)
+
+TOO_MANY_REQUESTS = 429
+
+_local = threading.local()
+
+
+@contextmanager
+def retry_rate_limited():
+    """Retry the rate limited requests of this thread, e.g. in `sync_from_paddle` where waiting blocks no user"""
+    previous = getattr(_local, "enabled", False)
+    _local.enabled = True
+    try:
+        yield
+    finally:
+        _local.enabled = previous
+
+
+def is_enabled() -> bool:
+    return app_settings.API_RETRY_RATE_LIMITED or getattr(_local, "enabled", False)
+
+
+def get_retry_delay(retry_after, attempt) -> float:
+    """Seconds to wait before retrying, from the `Retry-After` header or an exponential backoff"""
+    try:
+        delay = float(retry_after)
+    except (TypeError, ValueError):
+        delay = 2**attempt
+    return max(0.0, min(delay, app_settings.API_RETRY_MAX_WAIT))
+
+
+class RetryingRequestStrategy(tracing.TracingRequestStrategy):
+    """
+    Request strategy retrying the requests rate limited by Paddle, up to `API_MAX_RETRIES` times. Only within
+    `retry_rate_limited()`, or everywhere with `API_RETRY_RATE_LIMITED`: a retried request can block for
+    `API_MAX_RETRIES` times `API_RETRY_MAX_WAIT` seconds.
+    """
+
+    def _make_request(self, request_method, endpoint, *args, **kwargs):
+        retry_after = None
+
+        def send(*send_args, **send_kwargs):
+            nonlocal retry_after
+            response = request_method(*send_args, **send_kwargs)
+            retry_after = response.headers.get("Retry-After")
+            return response
+
+        send.__name__ = request_method.__name__
+
+        attempt = 0
+        while True:
+            try:
+                return super()._make_request(send, endpoint, *args, **kwargs)
+            except APIRequestError as e:
+                if e.status_code != TOO_MANY_REQUESTS or not is_enabled() or attempt >= app_settings.API_MAX_RETRIES:
+                    raise
+                delay = get_retry_delay(retry_after, attempt)
+                logger.warning("Paddle API: rate limited on %s, retrying in %.1fs", endpoint, delay)
+                time.sleep(delay)
+                attempt += 1
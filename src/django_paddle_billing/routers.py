@@ -0,0 +1,97 @@
+"""
+Optional database router sending the reads of the Paddle models to a replica.
+
+    DATABASE_ROUTERS = ["django_paddle_billing.routers.PaddleBillingRouter"]
+    PADDLE_BILLING = {"REPLICA_DATABASE": "replica"}
+
+Writes go to `PRIMARY_DATABASE`. After a save, the reads of the same thread (hence of the same request)
+stay on the primary for `REPLICA_PIN_SECONDS`, so they see their own writes despite the replication lag. Code reading
+from the primary on purpose uses `primary_alias()`, which does not pin the thread.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import router
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from django_paddle_billing import settings as app_settings
+
+APP_LABEL = "django_paddle_billing"
+
+_local = threading.local()
+
+
+def pin_to_primary(seconds=None) -> None:
+    """Read from the primary in this thread for the next `seconds` (default: `REPLICA_PIN_SECONDS`)"""
+    seconds = app_settings.REPLICA_PIN_SECONDS if seconds is None else seconds
+    _local.pinned_until = max(getattr(_local, "pinned_until", 0), time.monotonic() + seconds)
+
+
+def is_pinned() -> bool:
+    return getattr(_local, "pinned_until", 0) > time.monotonic()
+
+
+@contextmanager
+def use_database(alias):
+    """Route the reads and writes of the Paddle models in this thread to `alias`"""
+    previous = getattr(_local, "database", None)
+    _local.database = alias
+    try:
+        yield
+    finally:
+        _local.database = previous
+
+
+def primary_alias(model) -> str:
+    """Database the writes of `model` go to, to read from it without pinning the reads of the thread"""
+    return router.db_for_write(model)
+
+
+# Not on `post_delete`, any listener of it turns the fast bulk deletes into a select then a delete
+@receiver(post_save)
+@receiver(m2m_changed)
+def _pin_after_write(sender, **kwargs) -> None:
+    if sender._meta.app_label == APP_LABEL:
+        pin_to_primary()
+
+
+def is_installed() -> bool:
+    return any(isinstance(_router, PaddleBillingRouter) for _router in router.routers)
+
+
+class PaddleBillingRouter:
+    def _is_paddle_model(self, model) -> bool:
+        return model._meta.app_label == APP_LABEL
+
+    def db_for_read(self, model, **hints):
+        if not self._is_paddle_model(model):
+            return None
+        forced = getattr(_local, "database", None)
+        if forced is not None:
+            return forced
+        if app_settings.REPLICA_DATABASE is None or is_pinned():
+            return app_settings.PRIMARY_DATABASE
+        return app_settings.REPLICA_DATABASE
+
+    def db_for_write(self, model, **hints):
+        if not self._is_paddle_model(model):
+            return None
+        forced = getattr(_local, "database", None)
+        if forced is not None:
+            return forced
+        return app_settings.PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as the primary
+        databases = {app_settings.PRIMARY_DATABASE, app_settings.REPLICA_DATABASE}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if app_label == APP_LABEL and db == app_settings.REPLICA_DATABASE:
+            return False
+        return None
@@ -18,8 +18,46 @@ CONFIG_DEFAULTS = {
     ],
     "PADDLE_SANDBOX": False,
     "PADDLE_ACCOUNT_MODEL": settings.AUTH_USER_MODEL,
+    "API_RETRY_RATE_LIMITED": False,
+    "API_MAX_RETRIES": 3,
+    "API_RETRY_MAX_WAIT": 30,
     "ADMIN_READONLY": True,
     "ADMIN_JSON_EDITOR_WIDGET": JSONEditorWidget,
+    "SEARCH_CUSTOM_DATA_KEYS": ["account_id"],
+    "ENTITLEMENT_STATUSES": ["active", "trialing"],
+    "MRR_STATUSES": ["active", "past_due"],
+    "REVENUE_STATUSES": ["paid", "completed"],
+    "API_PERMISSION_CLASSES": ["rest_framework.permissions.IsAdminUser"],
+    "REFRESH_MAX_AGE": 60,
+    "REFRESH_LOCK_CACHE": "default",
+    "REFRESH_LOCK_TIMEOUT": 30,
+    "PRIMARY_DATABASE": "default",
+    "REPLICA_DATABASE": None,
+    "REPLICA_PIN_SECONDS": 5,
+    "WEBHOOK_METRICS_BACKEND": "django_paddle_billing.monitoring.InMemoryMetricsBackend",
+    "WEBHOOK_SLOW_EVENT_SECONDS": 1.0,
+    "WEBHOOK_QUEUE": False,
+    "WEBHOOK_QUEUE_PARTITIONS": 64,
+    "WEBHOOK_QUEUE_BATCH_SIZE": 50,
+    "WEBHOOK_QUEUE_LEASE_SECONDS": 60,
+    "WEBHOOK_QUEUE_MAX_ATTEMPTS": 10,
+    "WEBHOOK_DISPATCH_LANES": 0,
+    "WEBHOOK_DISPATCH_QUEUE_SIZE": 1000,
+    "WEBHOOK_DISPATCH_SUBMIT_TIMEOUT": 5.0,
+    "TRACING": False,
+    "PROFILE_WEBHOOKS": 0,
+    "PROFILE_MEMORY": False,
+    "PROFILE_DIR": None,
+    "PROFILE_TOP": 20,
+    "ENTITLEMENTS_CACHE": "default",
+    "ENTITLEMENTS_CACHE_TIMEOUT": 300,
+    "CATALOG_CACHE": "default",
+    "PARSED_DATA_CACHE_SIZE": 10000,
+    "JSON_CODEC": "compact",
+    "JSON_COMPRESSION": None,
+    "JSON_COMPRESSION_THRESHOLD": 4096,
+    "TRANSACTION_PARTITION_MONTHS_AHEAD": 3,
+    "TRANSACTION_ARCHIVE_DIR": None,
 }
 
 
@@ -0,0 +1,475 @@
+"""
+Synthetic Paddle billing data for scale testing, generated as validated `paddle_billing_client` models.
+
+The generation is driven by a seeded `random.Random` and streamed one customer (with their addresses, businesses,
+subscriptions and transactions) at a time, so that any number of customers can be loaded in constant memory.
+"""
+
+import datetime as dt
+import logging
+import random
+from itertools import islice
+from typing import Iterator, NamedTuple
+
+from django.db import router
+from django.db.transaction import atomic
+from paddle_billing_client.models import (
+    address,
+    business,
+    customer,
+    discount,
+    price,
+    product,
+    subscription,
+    transaction,
+)
+
+from django_paddle_billing.exceptions import DjangoPaddleBillingError
+from django_paddle_billing.models import (
+    Address,
+    Business,
+    Customer,
+    Discount,
+    Price,
+    Product,
+    Subscription,
+    SubscriptionItem,
+    Transaction,
+    TransactionItem,
+)
+
+logger = logging.getLogger(__name__)
+
+CURRENCIES = ("USD", "EUR", "GBP")
+CURRENCY_WEIGHTS = (60, 30, 10)
+COUNTRIES = {"US": "0", "GB": "0.2", "FR": "0.2", "DE": "0.19", "NL": "0.21", "ES": "0.21", "CA": "0.05", "AU": "0.1"}
+SUBSCRIPTION_STATUSES = ("active", "trialing", "past_due", "paused", "canceled")
+SUBSCRIPTION_STATUS_WEIGHTS = (70, 8, 5, 4, 13)
+INTERVALS = ("month", "year")
+INTERVAL_WEIGHTS = (80, 20)
+DISCOUNTED_SUBSCRIPTIONS = 0.1
+
+
+class Catalog(NamedTuple):
+    products: list[product.Product]
+    prices: list[price.Price]
+    discounts: list[discount.Discount]
+
+
+class CustomerBundle(NamedTuple):
+    customer: customer.Customer
+    addresses: list[address.Address]
+    businesses: list[business.Business]
+    subscriptions: list[subscription.Subscription]
+    transactions: list[transaction.Transaction]
+
+
+def _id(rng, prefix) -> str:
+    # Paddle IDs have 26 characters after the prefix
+    return f"{prefix}_{rng.getrandbits(104):026x}"
+
+
+def _iso(value: dt.datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S.000000Z")
+
+
+def _add_months(value: dt.datetime, months: int) -> dt.datetime:
+    month = value.month - 1 + months
+    year = value.year + month // 12
+    month = month % 12 + 1
+    return value.replace(year=year, month=month, day=min(value.day, 28))
+
+
+def generate_catalog(rng: random.Random, products=20, discounts=10) -> Catalog:
+    """Products with a monthly and a yearly price in each currency, and discounts"""
+    _products, _prices, _discounts = [], [], []
+    for i in range(products):
+        product_id = _id(rng, "pro")
+        _products.append(
+            product.Product.model_validate(
+                {
+                    "id": product_id,
+                    "name": f"Plan {i + 1}",
+                    "tax_category": "saas",
+                    "description": f"Synthetic plan {i + 1}",
+                    "status": "active",
+                    "custom_data": None,
+                }
+            )
+        )
+        monthly_amount = rng.randrange(5, 200) * 100
+        for currency_code in CURRENCIES:
+            for interval in INTERVALS:
+                amount = monthly_amount * 10 if interval == "year" else monthly_amount
+                _prices.append(
+                    price.Price.model_validate(
+                        {
+                            "id": _id(rng, "pri"),
+                            "product_id": product_id,
+                            "description": f"Plan {i + 1} {interval}ly {currency_code}",
+                            "unit_price": {"amount": str(amount), "currency_code": currency_code},
+                            "billing_cycle": {"interval": interval, "frequency": 1},
+                            "tax_mode": "account_setting",
+                            "status": "active",
+                            "quantity": {"minimum": 1, "maximum": 100},
+                        }
+                    )
+                )
+    for i in range(discounts):
+        _discounts.append(
+            discount.Discount.model_validate(
+                {
+                    "id": _id(rng, "dsc"),
+                    "description": f"Synthetic discount {i + 1}",
+                    "type": "percentage",
+                    "amount": str(rng.choice((10, 15, 20, 25, 50))),
+                    "enabled_for_checkout": True,
+                    "code": f"SYNTHETIC{i + 1}",
+                    "recur": rng.random() < 0.5,  # noqa: PLR2004
+                    "status": "active",
+                }
+            )
+        )
+    return Catalog(_products, _prices, _discounts)
+
+
+class DatasetGenerator:
+    """
+    Streams `CustomerBundle`s: each customer has an address (sometimes two), sometimes a business, usually one
+    subscription of 1 to 3 items, and one transaction per billing period of their subscriptions.
+    """
+
+    def __init__(self, seed=None, *, catalog=None, products=20, discounts=10, months=24, end=None):
+        self.rng = random.Random(seed)  # noqa: S311
+        self.catalog = catalog or generate_catalog(self.rng, products=products, discounts=discounts)
+        self.months = months
+        self.end = end or dt.datetime.now(tz=dt.timezone.utc).replace(microsecond=0)
+        self.start = _add_months(self.end, -months)
+        self.prices_by_plan = {}
+        for _price in self.catalog.prices:
+            key = (_price.unit_price.currency_code, _price.billing_cycle.interval)
+            self.prices_by_plan.setdefault(key, []).append(_price)
+
+    def _random_datetime(self, start, end) -> dt.datetime:
+        return start + dt.timedelta(seconds=self.rng.randrange(max(1, int((end - start).total_seconds()))))
+
+    def generate(self, customers) -> Iterator[CustomerBundle]:
+        for _ in range(customers):
+            yield self.generate_customer()
+
+    def generate_customer(self) -> CustomerBundle:
+        rng = self.rng
+        created_at = self._random_datetime(self.start, self.end)
+        customer_id = _id(rng, "ctm")
+        number = rng.getrandbits(40)
+        _customer = customer.Customer.model_validate(
+            {
+                "id": customer_id,
+                "name": f"Customer {number}",
+                "email": f"customer{number}@example.com",
+                "marketing_consent": rng.random() < 0.3,  # noqa: PLR2004
+                "status": "active",
+                "locale": "en",
+                "custom_data": None,
+                "created_at": _iso(created_at),
+                "updated_at": _iso(created_at),
+            }
+        )
+
+        addresses = []
+        for _ in range(2 if rng.random() < 0.1 else 1):  # noqa: PLR2004
+            addresses.append(
+                address.Address.model_validate(
+                    {
+                        "id": _id(rng, "add"),
+                        "country_code": rng.choice(list(COUNTRIES)),
+                        "postal_code": f"{rng.randrange(10000, 99999)}",
+                        "city": "Synthetic City",
+                        "first_line": f"{rng.randrange(1, 200)} Main Street",
+                        "status": "active",
+                        "created_at": _iso(created_at),
+                        "updated_at": _iso(created_at),
+                    }
+                )
+            )
+
+        businesses = []
+        if rng.random() < 0.3:  # noqa: PLR2004
+            businesses.append(
+                business.Business.model_validate(
+                    {
+                        "id": _id(rng, "biz"),
+                        "name": f"Business {number}",
+                        "company_number": f"{rng.getrandbits(30):09d}",
+                        "status": "active",
+                        "contacts": [{"name": f"Customer {number}", "email": f"customer{number}@example.com"}],
+                        "created_at": _iso(created_at),
+                        "updated_at": _iso(created_at),
+                    }
+                )
+            )
+
+        subscriptions, transactions = [], []
+        count = rng.choices((0, 1, 2), weights=(10, 80, 10))[0]
+        for _ in range(count):
+            _address = rng.choice(addresses)
+            _business = businesses[0] if businesses else None
+            _subscription, _transactions = self.generate_subscription(customer_id, _address, _business, created_at)
+            subscriptions.append(_subscription)
+            transactions.extend(_transactions)
+
+        return CustomerBundle(_customer, addresses, businesses, subscriptions, transactions)
+
+    def generate_subscription(self, customer_id, _address, _business, customer_created_at):
+        rng = self.rng
+        currency_code = rng.choices(CURRENCIES, weights=CURRENCY_WEIGHTS)[0]
+        interval = rng.choices(INTERVALS, weights=INTERVAL_WEIGHTS)[0]
+        status = rng.choices(SUBSCRIPTION_STATUSES, weights=SUBSCRIPTION_STATUS_WEIGHTS)[0]
+        # One price per product in each plan, small catalogs have fewer than 3
+        plan = self.prices_by_plan[(currency_code, interval)]
+        prices = rng.sample(plan, k=min(rng.choices((1, 2, 3), (70, 20, 10))[0], len(plan)))
+        quantities = [rng.choices((1, 2, 5, 10), weights=(80, 10, 7, 3))[0] for _ in prices]
+        _discount = None
+        if self.catalog.discounts and rng.random() < DISCOUNTED_SUBSCRIPTIONS:
+            _discount = rng.choice(self.catalog.discounts)
+
+        started_at = self._random_datetime(customer_created_at, self.end)
+        period_months = 12 if interval == "year" else 1
+        ended_at = None
+        if status in {"canceled", "paused"}:
+            ended_at = self._random_datetime(started_at, self.end)
+        billed_until = ended_at or self.end
+
+        periods = []
+        period_start = started_at
+        while period_start <= billed_until and status != "trialing":
+            periods.append(period_start)
+            period_start = _add_months(period_start, period_months)
+        next_billed_at = None if ended_at or status == "paused" else period_start
+        current_start = periods[-1] if periods else started_at
+
+        subscription_id = _id(rng, "sub")
+        items = [
+            {
+                "status": "trialing" if status == "trialing" else "active",
+                "quantity": quantity,
+                "recurring": True,
+                "created_at": _iso(started_at),
+                "updated_at": _iso(current_start),
+                "previously_billed_at": _iso(current_start) if periods else None,
+                "next_billed_at": _iso(next_billed_at) if next_billed_at else None,
+                "price": _price.model_dump(mode="json"),
+            }
+            for _price, quantity in zip(prices, quantities)
+        ]
+        _subscription = subscription.Subscription.model_validate(
+            {
+                "id": subscription_id,
+                "status": status,
+                "customer_id": customer_id,
+                "address_id": _address.id,
+                "business_id": _business.id if _business else None,
+                "currency_code": currency_code,
+                "created_at": _iso(started_at),
+                "updated_at": _iso(ended_at or current_start),
+                "started_at": _iso(started_at),
+                "first_billed_at": _iso(periods[0]) if periods else None,
+                "next_billed_at": _iso(next_billed_at) if next_billed_at else None,
+                "paused_at": _iso(ended_at) if status == "paused" else None,
+                "canceled_at": _iso(ended_at) if status == "canceled" else None,
+                "collection_mode": "automatic",
+                "current_billing_period": {
+                    "starts_at": _iso(current_start),
+                    "ends_at": _iso(_add_months(current_start, period_months)),
+                },
+                "billing_cycle": {"interval": interval, "frequency": 1},
+                "items": items,
+                "discount": {"id": _discount.id, "starts_at": _iso(started_at)} if _discount else None,
+                "custom_data": None,
+            }
+        )
+
+        tax_rate = COUNTRIES[_address.country_code]
+        transactions = []
+        for i, period_start in enumerate(periods):
+            is_last = i == len(periods) - 1
+            transaction_status = "past_due" if status == "past_due" and is_last else "completed"
+            transactions.append(
+                self.generate_transaction(
+                    _subscription,
+                    zip(prices, quantities),
+                    _discount,
+                    tax_rate=tax_rate,
+                    period=(period_start, _add_months(period_start, period_months)),
+                    status=transaction_status,
+                    origin="web" if i == 0 else "subscription_recurring",
+                )
+            )
+        return _subscription, transactions
+
+    def generate_transaction(self, _subscription, items, _discount, *, tax_rate, period, status, origin):
+        rng = self.rng
+        items = list(items)
+        period_start, period_end = period
+        billed_at = period_start + dt.timedelta(seconds=rng.randrange(60))
+        discount_rate = int(_discount.amount) if _discount and (_discount.recur or origin == "web") else 0
+
+        line_items = []
+        sums = {"subtotal": 0, "discount": 0, "tax": 0, "total": 0}
+        for _price, quantity in items:
+            unit_amount = int(_price.unit_price.amount)
+            subtotal = unit_amount * quantity
+            discount_amount = subtotal * discount_rate // 100
+            tax = round((subtotal - discount_amount) * float(tax_rate))
+            totals = {
+                "subtotal": subtotal,
+                "discount": discount_amount,
+                "tax": tax,
+                "total": subtotal - discount_amount + tax,
+            }
+            for key, value in totals.items():
+                sums[key] += value
+            unit_tax = round(unit_amount * float(tax_rate))
+            line_items.append(
+                {
+                    "id": _id(rng, "txnitm"),
+                    "price_id": _price.id,
+                    "quantity": quantity,
+                    "tax_rate": tax_rate,
+                    "unit_totals": {
+                        "subtotal": str(unit_amount),
+                        "discount": "0",
+                        "tax": str(unit_tax),
+                        "total": str(unit_amount + unit_tax),
+                    },
+                    "totals": {key: str(value) for key, value in totals.items()},
+                    "product": {"id": _price.product_id, "name": _price.description, "tax_category": "saas"},
+                }
+            )
+        fee = sums["total"] * 5 // 100 + 50 if status == "completed" else 0
+        grand_total = str(sums["total"])
+        paid = status == "completed"
+        return transaction.Transaction.model_validate(
+            {
+                "id": _id(rng, "txn"),
+                "status": status,
+                "customer_id": _subscription.customer_id,
+                "address_id": _subscription.address_id,
+                "business_id": _subscription.business_id,
+                "custom_data": None,
+                "currency_code": _subscription.currency_code,
+                "origin": origin,
+                "subscription_id": _subscription.id,
+                "invoice_id": _id(rng, "inv") if paid else None,
+                "invoice_number": f"{billed_at.year}-{rng.getrandbits(32)}" if paid else None,
+                "collection_mode": "automatic",
+                "discount_id": _discount.id if discount_rate else None,
+                "billing_period": {
+                    "starts_at": _iso(period_start),
+                    "ends_at": _iso(period_end),
+                },
+                "items": [
+                    {"price": _price.model_dump(mode="json"), "quantity": quantity} for _price, quantity in items
+                ],
+                "details": {
+                    "tax_rates_used": [
+                        {"tax_rate": tax_rate, "totals": {k: str(v) for k, v in sums.items()}},
+                    ],
+                    "totals": {
+                        **{key: str(value) for key, value in sums.items()},
+                        "credit": "0",
+                        "balance": "0" if paid else grand_total,
+                        "grand_total": grand_total,
+                        "fee": str(fee) if paid else None,
+                        "earnings": str(sums["total"] - sums["tax"] - fee) if paid else None,
+                        "currency_code": _subscription.currency_code,
+                    },
+                    "line_items": line_items,
+                },
+                "payments": [
+                    {
+                        "amount": grand_total,
+                        "status": "captured" if paid else "error",
+                        "created_at": _iso(billed_at),
+                        "captured_at": _iso(billed_at) if paid else None,
+                        "method_details": {"type": "card", "card": {"type": "visa", "last4": "4242"}},
+                    }
+                ],
+                "created_at": _iso(billed_at),
+                "updated_at": _iso(billed_at),
+                "billed_at": _iso(billed_at),
+            }
+        )
+
+
+def batched(iterable, size) -> Iterator[list]:
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+def load_catalog(catalog: Catalog) -> None:
+    for model, entities in ((Product, catalog.products), (Price, catalog.prices), (Discount, catalog.discounts)):
+        model.objects.bulk_create(
+            [model(pk=entity.id, **model.defaults_from_paddle_data(entity)) for entity in entities],
+            ignore_conflicts=True,
+        )
+
+
+def bulk_load(bundles: list[CustomerBundle]) -> int:
+    """
+    Insert the bundles with `bulk_create()`, mapping the models with the same `defaults_from_paddle_data()` as
+    `from_paddle_data()`. Customers are not linked to users, and the daily MRR metrics are not updated.
+    Returns the number of rows inserted.
+    """
+    rows = {model: [] for model in (Customer, Address, Business, Subscription, Transaction)}
+    products = []
+    subscription_items = []
+    transaction_items = []
+    for bundle in bundles:
+        rows[Customer].append(Customer(pk=bundle.customer.id, **Customer.defaults_from_paddle_data(bundle.customer)))
+        for _address in bundle.addresses:
+            defaults = Address.defaults_from_paddle_data(_address, bundle.customer.id)
+            rows[Address].append(Address(pk=_address.id, **defaults))
+        for _business in bundle.businesses:
+            defaults = Business.defaults_from_paddle_data(_business, bundle.customer.id)
+            rows[Business].append(Business(pk=_business.id, **defaults))
+        for data in bundle.subscriptions:
+            _subscription = Subscription(pk=data.id, **Subscription.defaults_from_paddle_data(data))
+            rows[Subscription].append(_subscription)
+            subscription_items.extend(SubscriptionItem.build_from_paddle_data(_subscription, data))
+            products.extend(
+                Subscription.products.through(subscription_id=data.id, product_id=product_id)
+                for product_id in {item.price.product_id for item in data.items}
+            )
+        for data in bundle.transactions:
+            _transaction = Transaction(pk=data.id, **Transaction.defaults_from_paddle_data(data))
+            rows[Transaction].append(_transaction)
+            transaction_items.extend(TransactionItem.build_from_paddle_data(_transaction, data))
+
+    with atomic(using=router.db_for_write(Customer)):
+        for model, instances in rows.items():
+            model.objects.bulk_create(instances)
+        Subscription.products.through.objects.bulk_create(products)
+        SubscriptionItem.objects.bulk_create(subscription_items)
+        TransactionItem.objects.bulk_create(transaction_items)
+    return sum(len(instances) for instances in rows.values()) + len(subscription_items) + len(transaction_items)
+
+
+def load_with_from_paddle_data(bundles: list[CustomerBundle]) -> int:
+    """Insert the bundles one entity at a time with `from_paddle_data()`, as the sync and the webhooks do"""
+    rows = 0
+    with atomic(using=router.db_for_write(Customer)):
+        for bundle in bundles:
+            results = [Customer.from_paddle_data(bundle.customer)]
+            results += [Address.from_paddle_data(data, bundle.customer.id) for data in bundle.addresses]
+            results += [Business.from_paddle_data(data, bundle.customer.id) for data in bundle.businesses]
+            results += [Subscription.from_paddle_data(data) for data in bundle.subscriptions]
+            results += [Transaction.from_paddle_data(data) for data in bundle.transactions]
+            for _, _, error in results:
+                if error:
+                    raise DjangoPaddleBillingError(error)
+            rows += len(results)
+    return rows
@@ -0,0 +1,185 @@
+"""
+Optional tracing spans around the Paddle API calls, the pages of the list generators, `from_paddle_data()`,
+the webhooks and their receivers and the sync stages.
+
+Spans are no-ops unless `PADDLE_BILLING["TRACING"]` is enabled, they are then created with the OpenTelemetry API
+(`pip install opentelemetry-api`) and exported by the SDK configured in the project:
+
+    paddle.sync              paddle.resource, paddle.rows_written
+    paddle.page              paddle.resource, paddle.page, paddle.page_size
+    paddle.client.<method>   paddle.operation (HTTP call and response parsing)
+    paddle.http              http.method, http.url, http.status_code
+    paddle.from_paddle_data  paddle.resource, paddle.id, paddle.created, paddle.error
+    paddle.webhook           paddle.event_type
+    paddle.receiver          paddle.receiver
+"""
+
+import functools
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+from apiclient.request_strategies import RequestStrategy
+from django.core.exceptions import ImproperlyConfigured
+
+from django_paddle_billing import settings as app_settings
+
+TRACER_NAME = "django_paddle_billing"
+
+_local = threading.local()
+
+
+class NoOpSpan:
+    def set_attribute(self, key, value) -> None:
+        pass
+
+    def set_attributes(self, attributes) -> None:
+        pass
+
+    def record_exception(self, exception, *args, **kwargs) -> None:
+        pass
+
+
+class NoOpTracer:
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None, **kwargs):
+        yield NoOpSpan()
+
+
+@lru_cache(maxsize=None)
+def _get_tracer(enabled):
+    if not enabled:
+        return NoOpTracer()
+    try:
+        # Optional dependency, only needed when tracing is enabled
+        from opentelemetry import trace  # noqa: PLC0415
+    except ImportError as e:
+        msg = 'PADDLE_BILLING["TRACING"] requires the OpenTelemetry API: pip install opentelemetry-api'
+        raise ImproperlyConfigured(msg) from e
+    return trace.get_tracer(TRACER_NAME)
+
+
+def get_tracer():
+    return _get_tracer(bool(app_settings.TRACING))
+
+
+def _clean(attributes) -> dict:
+    # OpenTelemetry attributes cannot be None
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+@contextmanager
+def span(name, **attributes):
+    """Span named `name`, the keyword arguments are its attributes, `__` standing for `.`"""
+    attributes = _clean({key.replace("__", "."): value for key, value in attributes.items()})
+    with get_tracer().start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+
+@contextmanager
+def sync_span(resource):
+    """Span of a sync stage, counting the rows written by the `from_paddle_data()` calls within it"""
+    counters = getattr(_local, "sync_counters", None)
+    if counters is None:
+        counters = _local.sync_counters = []
+    counter = [0]
+    counters.append(counter)
+    try:
+        with span("paddle.sync", paddle__resource=resource) as current:
+            try:
+                yield current
+            finally:
+                current.set_attribute("paddle.rows_written", counter[0])
+    finally:
+        counters.remove(counter)
+
+
+def paginate(resource, pages):
+    """Wrap the responses of `paddle_billing_client.pagination.paginate()` in a span per page"""
+    page = 0
+    response = None
+    while True:
+        if response is not None:
+            pagination = response.meta.pagination
+            # Last page, stop without an empty span
+            if pagination is not None and not (pagination.has_more and pagination.next):
+                return
+        with span("paddle.page", paddle__resource=resource, paddle__page=page) as current:
+            response = next(pages, None)
+            if response is None:
+                return
+            current.set_attribute("paddle.page_size", len(response.data))
+        yield response
+        page += 1
+
+
+def from_paddle_data(func):
+    """Decorate the `from_paddle_data()` classmethods (below `@classmethod`)"""
+
+    @functools.wraps(func)
+    def wrapper(cls, data, *args, **kwargs):
+        with span(
+            "paddle.from_paddle_data", paddle__resource=cls.__name__, paddle__id=getattr(data, "id", None)
+        ) as current:
+            instance, created, error = func(cls, data, *args, **kwargs)
+            current.set_attribute("paddle.created", bool(created))
+            if error:
+                current.set_attribute("paddle.error", str(error))
+            elif instance is not None:
+                for counter in getattr(_local, "sync_counters", ()):
+                    counter[0] += 1
+            return instance, created, error
+
+    return wrapper
+
+
+def receiver(func):
+    """Decorate a webhook receiver (below `@receiver`)"""
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span("paddle.receiver", paddle__receiver=name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class TracedPaddleClient:
+    """Proxy of `PaddleApiClient` wrapping each method call in a span"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        attribute = getattr(self._client, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def traced(*args, **kwargs):
+            with span(f"paddle.client.{name}", paddle__operation=name):
+                return attribute(*args, **kwargs)
+
+        return traced
+
+
+class TracingRequestStrategy(RequestStrategy):
+    """Request strategy recording each HTTP request to Paddle in a span"""
+
+    def _make_request(self, request_method, endpoint, *args, **kwargs):
+        method = request_method.__name__.upper()
+        with span("paddle.http", http__method=method, http__url=endpoint) as current:
+            status_code = None
+
+            def send(*send_args, **send_kwargs):
+                nonlocal status_code
+                response = request_method(*send_args, **send_kwargs)
+                status_code = response.status_code
+                return response
+
+            try:
+                return super()._make_request(send, endpoint, *args, **kwargs)
+            finally:
+                if status_code is not None:
+                    current.set_attribute("http.status_code", status_code)
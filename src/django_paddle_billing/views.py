@@ -8,8 +8,8 @@ from django.views.generic import View
 from paddle_billing_client.helpers import validate_webhook_signature
 from paddle_billing_client.models.notification import NotificationPayload
 
+from django_paddle_billing import dispatch, monitoring, profiling, signals, tracing, webhook_queue
 from django_paddle_billing import settings as app_settings
-from django_paddle_billing import signals
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -76,28 +76,69 @@ class PaddleWebhookView(View):
         - validating the payload signature
         - sending a django signal for each of the SUPPORTED_WEBHOOKS
         """
+        with monitoring.track_webhook() as tracker, profiling.profile_webhook() as profile:
+            try:
+                return self.handle(request, tracker)
+            finally:
+                if profile is not None:
+                    profile.name = f"webhook-{tracker.event_type}"
+
+    def handle(self, request, tracker):
         payload = request.body.decode("utf-8")
         paddle_ip = request.META.get(app_settings.PADDLE_IP_REQUEST_HEADER, "").split(", ")[0]
         if app_settings.PADDLE_SANDBOX and paddle_ip not in app_settings.PADDLE_SANDBOX_IPS:
+            tracker.outcome = "rejected"
             return HttpResponseBadRequest("IP not allowed")
         elif not app_settings.PADDLE_SANDBOX and paddle_ip not in app_settings.PADDLE_IPS:
+            tracker.outcome = "rejected"
             return HttpResponseBadRequest("IP not allowed")
 
-        is_valid = validate_webhook_signature(
-            request.META.get("HTTP_PADDLE_SIGNATURE", ""), request.body, app_settings.PADDLE_SECRET_KEY
-        )
+        with tracker.phase("signature"):
+            is_valid = validate_webhook_signature(
+                request.META.get("HTTP_PADDLE_SIGNATURE", ""), request.body, app_settings.PADDLE_SECRET_KEY
+            )
 
         if not is_valid:
+            tracker.outcome = "invalid_signature"
             return HttpResponseBadRequest("Invalid signature")
-        notification = NotificationPayload.model_validate(json.loads(payload))
+        with tracker.phase("parse"):
+            body = json.loads(payload)
+            notification = NotificationPayload.model_validate(body)
 
         if not notification.event_type:
+            tracker.outcome = "rejected"
             return HttpResponseBadRequest("'event_type' missing")
+        tracker.event_type = notification.event_type
 
-        if notification.event_type in self.SUPPORTED_WEBHOOKS.keys():
+        if notification.event_type in self.SUPPORTED_WEBHOOKS.keys() and app_settings.WEBHOOK_QUEUE:
+            # Processed by the `process_webhook_queue` workers
+            webhook_queue.enqueue(body)
+            tracker.outcome = "queued"
+        elif notification.event_type in self.SUPPORTED_WEBHOOKS.keys() and app_settings.WEBHOOK_DISPATCH_LANES:
+            # Processed in a lane of the entity, in parallel with the events of other entities. The failed events
+            # are stored in the webhook queue, Paddle does not deliver them again after this 200.
+            entity_id = (body.get("data") or {}).get("id") or ""
+            try:
+                dispatch.get_dispatcher().submit(
+                    entity_id,
+                    dispatch.dispatch_webhook,
+                    body,
+                    notification.event_type,
+                    notification.data,
+                    notification.occurred_at,
+                )
+            except dispatch.DispatchLaneFullError:
+                # Paddle delivers the event again later
+                tracker.outcome = "busy"
+                return HttpResponse("Busy", status=503)
+            tracker.outcome = "dispatched"
+        elif notification.event_type in self.SUPPORTED_WEBHOOKS.keys():
             signal = self.SUPPORTED_WEBHOOKS.get(notification.event_type)
             if signal:  # pragma: no cover
-                signal.send(sender=self.__class__, payload=notification.data, occurred_at=notification.occurred_at)
+                with tracker.dispatch(), tracing.span("paddle.webhook", paddle__event_type=notification.event_type):
+                    signal.send(sender=self.__class__, payload=notification.data, occurred_at=notification.occurred_at)
+        else:
+            tracker.outcome = "ignored"
 
         return HttpResponse()
 
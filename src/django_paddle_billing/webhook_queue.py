@@ -0,0 +1,171 @@
+"""
+Database-backed queue of the received webhooks, processed by `process_webhook_queue` workers on any node.
+
+With `PADDLE_BILLING["WEBHOOK_QUEUE"] = True`, the webhook view stores the verified events as `WebhookEvent` rows and
+answers Paddle at once. The workers claim batches with `SELECT ... FOR UPDATE SKIP LOCKED`, so that they never wait for
+each other, and hold the claimed events for `WEBHOOK_QUEUE_LEASE_SECONDS`: the events of a worker that stopped are
+claimed again once their lease expires. The lease of each event is extended when its processing starts, so a long batch
+does not expire behind the worker, and the event is skipped when another worker claimed it meanwhile.
+
+Each event belongs to one of `WEBHOOK_QUEUE_PARTITIONS` partitions, by the ID of its entity, and a worker can be
+limited to some partitions (`--partitions 0-15`). The events of an entity are processed one at a time in the order
+received: an event is only claimed when no earlier event of its entity is pending or being processed. Failed events
+are retried with an exponential backoff, up to `WEBHOOK_QUEUE_MAX_ATTEMPTS` times.
+"""
+
+import datetime as dt
+import logging
+import os
+import socket
+import zlib
+
+from django.db import router
+from django.db.models import Exists, F, OuterRef, Q
+from django.db.transaction import atomic
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from django_paddle_billing import settings as app_settings
+from django_paddle_billing.models import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = 300
+
+Status = WebhookEvent.Status
+
+
+def get_partition(entity_id, partitions=None) -> int:
+    """Partition of an entity, stable across processes and nodes"""
+    partitions = partitions or app_settings.WEBHOOK_QUEUE_PARTITIONS
+    return zlib.crc32(entity_id.encode()) % partitions
+
+
+def parse_partitions(value) -> list[int] | None:
+    """Partitions from a list like `0-7,12`, None for all partitions"""
+    if not value:
+        return None
+    partitions = []
+    for part in value.split(","):
+        first, _, last = part.strip().partition("-")
+        partitions.extend(range(int(first), int(last or first) + 1))
+    return partitions
+
+
+def get_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(notification: dict) -> None:
+    """Store a verified webhook notification, ignoring the deliveries of an event already stored"""
+    data = notification.get("data") or {}
+    entity_id = str(data.get("id") or "")
+    occurred_at = notification.get("occurred_at")
+    event = WebhookEvent(
+        event_id=notification["event_id"],
+        event_type=notification["event_type"],
+        occurred_at=parse_datetime(occurred_at) if occurred_at else None,
+        entity_id=entity_id,
+        partition=get_partition(entity_id),
+        payload=data,
+    )
+    WebhookEvent.objects.bulk_create([event], ignore_conflicts=True)
+
+
+def claim(worker_id, partitions=None, batch_size=None, lease_seconds=None) -> list[WebhookEvent]:
+    """Lease a batch of events, at most one per entity, in the order received"""
+    batch_size = batch_size or app_settings.WEBHOOK_QUEUE_BATCH_SIZE
+    lease_seconds = lease_seconds or app_settings.WEBHOOK_QUEUE_LEASE_SECONDS
+    using = router.db_for_write(WebhookEvent)
+    now = timezone.now()
+
+    earlier = WebhookEvent.objects.filter(
+        entity_id=OuterRef("entity_id"), id__lt=OuterRef("id"), status__in=[Status.PENDING, Status.PROCESSING]
+    )
+    queryset = (
+        WebhookEvent.objects.db_manager(using)
+        .filter(Q(status=Status.PENDING, available_at__lte=now) | Q(status=Status.PROCESSING, lease_expires_at__lt=now))
+        .exclude(Exists(earlier))
+    )
+    if partitions is not None:
+        queryset = queryset.filter(partition__in=partitions)
+
+    with atomic(using=using):
+        events = list(queryset.order_by("id").select_for_update(skip_locked=True)[:batch_size])
+        if events:
+            lease_expires_at = now + dt.timedelta(seconds=lease_seconds)
+            WebhookEvent.objects.db_manager(using).filter(pk__in=[event.pk for event in events]).update(
+                status=Status.PROCESSING,
+                leased_by=worker_id,
+                lease_expires_at=lease_expires_at,
+                attempts=F("attempts") + 1,
+            )
+            for event in events:
+                event.status = Status.PROCESSING
+                event.leased_by = worker_id
+                event.lease_expires_at = lease_expires_at
+                event.attempts += 1
+    return events
+
+
+def renew(event, worker_id, lease_seconds=None) -> bool:
+    """Extend the lease of an event still held by the worker, returns False when it was claimed by another one"""
+    lease_seconds = lease_seconds or app_settings.WEBHOOK_QUEUE_LEASE_SECONDS
+    lease_expires_at = timezone.now() + dt.timedelta(seconds=lease_seconds)
+    renewed = WebhookEvent.objects.filter(pk=event.pk, leased_by=worker_id, status=Status.PROCESSING).update(
+        lease_expires_at=lease_expires_at
+    )
+    if renewed:
+        event.lease_expires_at = lease_expires_at
+    return bool(renewed)
+
+
+def process(event, worker_id, lease_seconds=None) -> bool | None:
+    """
+    Send the signal of the event, then mark it done or schedule its retry. Returns whether it succeeded, or None when
+    the lease expired and the event was claimed by another worker, which processes it instead.
+    """
+    # The dispatch module imports this one
+    from django_paddle_billing.dispatch import send_webhook  # noqa: PLC0415
+
+    if not renew(event, worker_id, lease_seconds):
+        logger.warning("Webhook queue: %s was claimed by another worker, skipped", event)
+        return None
+
+    # Only while the worker still holds the lease
+    leased = WebhookEvent.objects.filter(pk=event.pk, leased_by=worker_id, status=Status.PROCESSING)
+    try:
+        send_webhook(event.event_type, event.payload, event.occurred_at, sender=WebhookEvent)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        if event.attempts >= app_settings.WEBHOOK_QUEUE_MAX_ATTEMPTS:
+            logger.exception("Webhook queue: %s failed after %s attempts", event, event.attempts)
+            leased.update(status=Status.FAILED, last_error=error, lease_expires_at=None)
+        else:
+            delay = min(2**event.attempts, MAX_RETRY_DELAY)
+            logger.warning("Webhook queue: %s failed, retrying in %ss: %s", event, delay, error)
+            leased.update(
+                status=Status.PENDING,
+                last_error=error,
+                available_at=timezone.now() + dt.timedelta(seconds=delay),
+                leased_by="",
+                lease_expires_at=None,
+            )
+        return False
+
+    leased.update(status=Status.DONE, processed_at=timezone.now(), lease_expires_at=None)
+    return True
+
+
+def release(events, worker_id) -> None:
+    """Give back the events leased by the worker without processing them, e.g. on shutdown"""
+    WebhookEvent.objects.filter(
+        pk__in=[event.pk for event in events], leased_by=worker_id, status=Status.PROCESSING
+    ).update(status=Status.PENDING, leased_by="", lease_expires_at=None, attempts=F("attempts") - 1)
+
+
+def purge(days) -> int:
+    """Delete the events processed more than `days` days ago"""
+    before = timezone.now() - dt.timedelta(days=days)
+    deleted, _ = WebhookEvent.objects.filter(status=Status.DONE, processed_at__lt=before).delete()
+    return deleted
@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import django
+import pytest
+from django.conf import settings
+from django.db import transaction
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+
+def pytest_configure():
+    if not settings.configured:
+        settings.configure(
+            SECRET_KEY="django-paddle-billing-tests",
+            INSTALLED_APPS=[
+                "django.contrib.admin",
+                "django.contrib.auth",
+                "django.contrib.contenttypes",
+                "django.contrib.sessions",
+                "django.contrib.messages",
+                "django_paddle_billing",
+            ],
+            DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+            DEFAULT_AUTO_FIELD="django.db.models.BigAutoField",
+            ROOT_URLCONF="django_paddle_billing.urls",
+            TEMPLATES=[
+                {
+                    "BACKEND": "django.template.backends.django.DjangoTemplates",
+                    "APP_DIRS": True,
+                    "OPTIONS": {
+                        "context_processors": [
+                            "django.template.context_processors.request",
+                            "django.contrib.auth.context_processors.auth",
+                            "django.contrib.messages.context_processors.messages",
+                        ]
+                    },
+                }
+            ],
+            USE_TZ=True,
+            PADDLE_BILLING={
+                "PADDLE_SECRET_KEY": "pdl_ntfset_test",
+                "PADDLE_SANDBOX": True,
+            },
+        )
+    django.setup()
+
+
+@pytest.fixture(scope="session")
+def django_db_setup():
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    yield
+    teardown_databases(old_config, verbosity=0)
+    teardown_test_environment()
+
+
+@pytest.fixture
+def db(django_db_setup):
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
@@ -0,0 +1,128 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import datetime as dt
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from django_paddle_billing.models import Customer, Subscription
+
+pytest.importorskip("rest_framework")
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from django_paddle_billing.api import BulkSubscriptionStatusView, SubscriptionViewSet
+
+factory = APIRequestFactory()
+
+
+def _get(view, path, user, **headers):
+    request = factory.get(path, HTTP_ACCEPT="application/json", **headers)
+    force_authenticate(request, user=user)
+    return view(request)
+
+
+@pytest.fixture
+def admin(db):
+    return get_user_model().objects.create(username="admin", is_staff=True)
+
+
+def test_subscriptions_sparse_fields_and_cursor(admin):
+    customer = Customer.objects.create(id="ctm_api", email="api@example.com")
+    for i in range(3):
+        Subscription.objects.create(id=f"sub_{i}", customer=customer, status="active", data={"id": f"sub_{i}"})
+    view = SubscriptionViewSet.as_view({"get": "list"})
+
+    response = _get(view, "/subscriptions/?page_size=2", admin)
+    assert [row["id"] for row in response.data["results"]] == ["sub_0", "sub_1"]
+    assert "data" not in response.data["results"][0]
+    assert response.data["next"]
+
+    response = _get(view, "/subscriptions/?fields=id,data&status=active", admin)
+    assert response.data["results"][0] == {"id": "sub_0", "data": {"id": "sub_0"}}
+
+
+def test_subscriptions_conditional_get(admin):
+    customer = Customer.objects.create(id="ctm_api", email="api@example.com")
+    subscription = Subscription.objects.create(id="sub_api", customer=customer, status="active")
+    Subscription.objects.filter(pk=subscription.pk).update(updated_at=timezone.now() - dt.timedelta(minutes=1))
+    view = SubscriptionViewSet.as_view({"get": "list"})
+
+    response = _get(view, "/subscriptions/", admin)
+    etag = response["ETag"]
+    last_modified = response["Last-Modified"]
+
+    assert _get(view, "/subscriptions/", admin, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert _get(view, "/subscriptions/", admin, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+
+    subscription.status = "canceled"
+    subscription.save()
+    assert _get(view, "/subscriptions/", admin, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_validators_of_a_page(admin):
+    customer = Customer.objects.create(id="ctm_api", email="api@example.com")
+    for i in range(3):
+        Subscription.objects.create(id=f"sub_{i}", customer=customer, status="active")
+    view = SubscriptionViewSet.as_view({"get": "list"})
+    etag = _get(view, "/subscriptions/?page_size=2", admin)["ETag"]
+
+    # A change on another page leaves this one current
+    Subscription.objects.get(pk="sub_2").save()
+    assert _get(view, "/subscriptions/?page_size=2", admin, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    Subscription.objects.filter(pk="sub_1").delete()
+    assert _get(view, "/subscriptions/?page_size=2", admin, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    # A row added after the last page changes its next link
+    etag = _get(view, "/subscriptions/?page_size=2", admin)["ETag"]
+    Subscription.objects.create(id="sub_3", customer=customer, status="active")
+    assert _get(view, "/subscriptions/?page_size=2", admin, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_updated_after(admin):
+    customer = Customer.objects.create(id="ctm_api", email="api@example.com")
+    Subscription.objects.create(id="sub_old", customer=customer, status="active")
+    Subscription.objects.filter(pk="sub_old").update(updated_at=dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc))
+    Subscription.objects.create(id="sub_new", customer=customer, status="active")
+    view = SubscriptionViewSet.as_view({"get": "list"})
+
+    response = _get(view, "/subscriptions/?updated_after=2024-06-01T00:00:00Z", admin)
+    assert [row["id"] for row in response.data["results"]] == ["sub_new"]
+    assert _get(view, "/subscriptions/?updated_after=yesterday", admin).status_code == 400
+
+
+def test_no_last_modified_during_the_second_of_the_last_change(admin, monkeypatch):
+    customer = Customer.objects.create(id="ctm_api", email="api@example.com")
+    subscription = Subscription.objects.create(id="sub_api", customer=customer, status="active")
+    monkeypatch.setattr(timezone, "now", lambda: subscription.updated_at)
+    view = SubscriptionViewSet.as_view({"get": "list"})
+
+    response = _get(view, "/subscriptions/", admin)
+
+    # Another change in the same second would not be newer than this Last-Modified
+    assert response["ETag"]
+    assert "Last-Modified" not in response
+
+
+def test_api_requires_staff(db):
+    user = get_user_model().objects.create(username="user")
+    view = SubscriptionViewSet.as_view({"get": "list"})
+
+    assert _get(view, "/subscriptions/", user).status_code == 403
+
+
+def test_bulk_subscription_status_endpoint(admin):
+    customer = Customer.objects.create(id="ctm_api", email="api@example.com")
+    Subscription.objects.create(id="sub_api", customer=customer, account=admin, status="trialing")
+    request = factory.post("/subscription-status/", {"account_ids": [str(admin.pk), "999"]}, format="json")
+    force_authenticate(request, user=admin)
+
+    response = BulkSubscriptionStatusView.as_view()(request)
+
+    assert response.data == {
+        str(admin.pk): {"status": "trialing", "active": True, "products": []},
+        "999": {"status": None, "active": False, "products": []},
+    }
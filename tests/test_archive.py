@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import datetime as dt
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+
+from django_paddle_billing import partitioning
+from django_paddle_billing.models import Customer, Transaction
+from django_paddle_billing.settings import settings as default_settings
+
+
+def test_archive_transactions(db, tmp_path, monkeypatch):
+    monkeypatch.setitem(default_settings, "TRANSACTION_ARCHIVE_DIR", str(tmp_path))
+    customer = Customer.objects.create(id="ctm_archive", email="archive@example.com")
+    # Synced today, the archive goes by the creation time at Paddle
+    old = Transaction.objects.create(
+        id="txn_old",
+        customer=customer,
+        data={"id": "txn_old", "items": []},
+        paddle_created_at=dt.datetime(2023, 1, 15, tzinfo=dt.timezone.utc),
+    )
+    Transaction.objects.create(id="txn_new", customer=customer, data={"id": "txn_new"})
+
+    updated_at = old.updated_at
+    call_command("archive_transactions", "--before=2024-01-01")
+
+    old.refresh_from_db()
+    assert old.data is None
+    assert old.archived_at is not None
+    assert old.updated_at > updated_at
+    assert Transaction.objects.get(pk="txn_new").data == {"id": "txn_new"}
+    assert (tmp_path / "transactions-2023-01.jsonl.gz").exists()
+    assert old.get_archived_data() == {"id": "txn_old", "items": []}
+
+
+def test_partitioning_sql():
+    quote = connection.ops.quote_name
+    table = Transaction._meta.db_table
+
+    sql, params = partitioning.get_partition_sql(table, dt.date(2023, 12, 1), quote)
+    assert sql == f'CREATE TABLE "{table}_p2023_12" PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s)'
+    assert params == ["2023-12-01", "2024-01-01"]
+
+    create, primary_key, default = partitioning.get_partitioned_table_sql(table, "legacy", quote)
+    assert create.startswith(f'CREATE TABLE "{table}" (LIKE "legacy" ')
+    assert create.endswith("PARTITION BY RANGE (paddle_created_at)")
+    assert primary_key == f'ALTER TABLE "{table}" ADD PRIMARY KEY (id, paddle_created_at)'
+    assert default == f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT'
+
+    _, _, function, trigger = partitioning.get_ids_tracking_sql(table, "legacy", quote)
+    assert function.startswith(f'CREATE FUNCTION "{table}_track_ids"() RETURNS trigger LANGUAGE plpgsql')
+    # Takes the id of an inserted row, releases the id of a deleted one
+    assert function.count(f'"{table}_ids"') == 2
+    assert "(id) VALUES (NEW.id); RETURN NEW;" in function
+    assert "WHERE id = OLD.id; RETURN OLD;" in function
+    assert trigger == (
+        f'CREATE TRIGGER "{table}_track_ids" AFTER INSERT OR DELETE ON "{table}" '
+        f'FOR EACH ROW EXECUTE FUNCTION "{table}_track_ids"()'
+    )
+
+
+@pytest.mark.usefixtures("db")
+def test_ids_table_keeps_ids_unique():
+    customer = Customer.objects.create(id="ctm_ids", email="ids@example.com")
+    Transaction.objects.create(id="txn_ids_1", customer=customer)
+    Transaction.objects.create(id="txn_ids_2", customer=customer)
+    table = Transaction._meta.db_table
+    ids = partitioning.get_ids_table(table)
+
+    # The table and its backfill are plain SQL, the triggers need PostgreSQL
+    create, backfill, _, _ = partitioning.get_ids_tracking_sql(table, table, connection.ops.quote_name)
+    with connection.cursor() as cursor:
+        cursor.execute(create)
+        cursor.execute(backfill)
+        cursor.execute(f'SELECT id FROM "{ids}" ORDER BY id')  # noqa: S608
+        assert cursor.fetchall() == [("txn_ids_1",), ("txn_ids_2",)]
+        with pytest.raises(IntegrityError), transaction.atomic():
+            cursor.execute(f'INSERT INTO "{ids}" (id) VALUES (%s)', ["txn_ids_1"])  # noqa: S608
+
+
+def test_partition_transactions_requires_postgresql(db):
+    with pytest.raises(CommandError):
+        call_command("partition_transactions", convert=True)
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="Partitioning requires PostgreSQL")
+@pytest.mark.usefixtures("db")
+def test_partitioned_transactions(tmp_path, monkeypatch):
+    monkeypatch.setitem(default_settings, "TRANSACTION_ARCHIVE_DIR", str(tmp_path))
+    customer = Customer.objects.create(id="ctm_partition", email="partition@example.com")
+    Transaction.objects.create(
+        id="txn_old",
+        customer=customer,
+        data={"id": "txn_old"},
+        paddle_created_at=dt.datetime(2023, 1, 15, tzinfo=dt.timezone.utc),
+    )
+
+    call_command("partition_transactions", convert=True, months_ahead=1)
+    assert partitioning.is_partitioned()
+
+    Transaction.objects.create(id="txn_new", customer=customer, data={"id": "txn_new"})
+    # Another partition, the id is still unique
+    with pytest.raises(IntegrityError), transaction.atomic():
+        Transaction.objects.create(id="txn_old", customer=customer)
+
+    call_command("archive_transactions", "--before=2024-01-01")
+
+    old = Transaction.objects.get(pk="txn_old")
+    assert old.data is None
+    assert old.get_archived_data() == {"id": "txn_old"}
+    assert Transaction.objects.get(pk="txn_new").data == {"id": "txn_new"}
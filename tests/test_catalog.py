@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from paddle_billing_client.models import price, product
+
+from django_paddle_billing.catalog import get_catalog, invalidate_catalog
+from django_paddle_billing.models import Price, Product
+
+
+def _create_price(price_id, product_id, currency_code="USD"):
+    data = price.Price(
+        id=price_id,
+        product_id=product_id,
+        description=price_id,
+        tax_mode="account_setting",
+        unit_price={"amount": "1000", "currency_code": currency_code},
+    )
+    Price.from_paddle_data(data)
+
+
+def test_catalog_indexes_products_and_prices(db):
+    cache.clear()
+    Product.from_paddle_data(product.Product(id="pro_1", name="Pro", tax_category="saas", status="active"))
+    _create_price("pri_1", "pro_1")
+    _create_price("pri_2", "pro_1", currency_code="EUR")
+
+    catalog = get_catalog()
+
+    assert catalog.get_product("pro_1").name == "Pro"
+    assert catalog.get_price("pri_2").unit_price.currency_code == "EUR"
+    assert [_price.id for _price in catalog.get_prices_for_product("pro_1")] == ["pri_1", "pri_2"]
+    assert [_price.id for _price in catalog.get_prices_for_currency("USD")] == ["pri_1"]
+    assert catalog.get_prices_for_currency("GBP") == []
+
+
+def test_catalog_reads_are_query_free_until_invalidated(db):
+    cache.clear()
+    Product.from_paddle_data(product.Product(id="pro_1", name="Pro", tax_category="saas", status="active"))
+    catalog = get_catalog()
+
+    with CaptureQueriesContext(connection) as queries:
+        assert get_catalog() is catalog
+    assert len(queries) == 0
+
+    Product.from_paddle_data(product.Product(id="pro_2", name="Team", tax_category="saas", status="active"))
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        invalidate_catalog()
+        # The version is bumped once the transaction commits
+        assert get_catalog() is catalog
+
+    assert get_catalog() is not catalog
+    assert get_catalog().get_product("pro_2").name == "Team"
@@ -0,0 +1,178 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import hashlib
+import hmac
+import json
+import threading
+import time
+
+import pytest
+from django.test import Client
+
+from django_paddle_billing import dispatch
+from django_paddle_billing.exceptions import DjangoPaddleBillingError
+from django_paddle_billing.models import WebhookEvent
+from django_paddle_billing.settings import settings as default_settings
+
+
+def test_events_of_an_entity_stay_in_order():
+    dispatcher = dispatch.OrderedDispatcher(lanes=4, queue_size=100)
+    applied = {}
+    running = set()
+    overlaps = []
+    lock = threading.Lock()
+
+    def apply(entity_id, sequence):
+        with lock:
+            overlaps.append(len(running))
+            running.add(entity_id)
+        time.sleep((sequence + len(applied)) % 3 / 1000)
+        with lock:
+            running.discard(entity_id)
+            applied.setdefault(entity_id, []).append(sequence)
+
+    futures = [
+        dispatcher.submit(entity_id, apply, entity_id, sequence)
+        for sequence in range(10)
+        for entity_id in [f"sub_{i}" for i in range(20)]
+    ]
+    dispatcher.shutdown()
+
+    assert all(future.done() for future in futures)
+    assert applied == {f"sub_{i}": list(range(10)) for i in range(20)}
+    # Different entities are processed in parallel
+    assert max(overlaps) > 0
+
+
+def test_full_lanes_reject_events():
+    dispatcher = dispatch.OrderedDispatcher(lanes=1, queue_size=1, submit_timeout=0.01)
+    started = threading.Event()
+    release = threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    first = dispatcher.submit("txn_1", block)
+    started.wait()
+    queued = dispatcher.submit("txn_2", len, "queued")
+    with pytest.raises(dispatch.DispatchLaneFullError):
+        dispatcher.submit("txn_3", len, "rejected")
+
+    release.set()
+    dispatcher.shutdown()
+    assert first.result() is None
+    assert queued.result() == 6
+    with pytest.raises(DjangoPaddleBillingError):
+        dispatcher.submit("txn_4", len, "closed")
+
+
+def test_shutdown_without_drain_cancels_the_queued_events():
+    dispatcher = dispatch.OrderedDispatcher(lanes=1, queue_size=10)
+    started = threading.Event()
+    release = threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    first = dispatcher.submit("ctm_1", block)
+    started.wait()
+    queued = [dispatcher.submit("ctm_1", len, "queued") for _ in range(3)]
+    assert dispatcher.pending() == 3
+
+    threading.Timer(0.05, release.set).start()
+    dispatcher.shutdown(drain=False)
+    assert first.done()
+    assert all(future.cancelled() for future in queued)
+
+
+def test_shutdown_waits_for_the_pending_submits():
+    dispatcher = dispatch.OrderedDispatcher(lanes=1, queue_size=1, submit_timeout=5)
+    started = threading.Event()
+    release = threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    dispatcher.submit("sub_1", block)
+    started.wait()
+    dispatcher.submit("sub_1", len, "queued")
+    # Waits for room in the full lane while the dispatcher shuts down
+    late = []
+    submitting = threading.Thread(target=lambda: late.append(dispatcher.submit("sub_1", len, "late")))
+    submitting.start()
+    time.sleep(0.05)
+    stopping = threading.Thread(target=dispatcher.shutdown)
+    stopping.start()
+    time.sleep(0.05)
+
+    release.set()
+    submitting.join()
+    stopping.join()
+    # Queued before the lane stopped, so it completes
+    assert late[0].result(timeout=1) == 4
+
+
+@pytest.mark.usefixtures("db")
+def test_failed_events_are_stored_in_the_webhook_queue(monkeypatch):
+    def send_webhook(*args):
+        raise ValueError(args[0])
+
+    monkeypatch.setattr(dispatch, "send_webhook", send_webhook)
+    notification = {
+        "event_id": "evt_failed",
+        "event_type": "customer.updated",
+        "occurred_at": "2024-01-01T00:00:00Z",
+        "data": {"id": "ctm_failed"},
+    }
+
+    dispatch.dispatch_webhook(notification, "customer.updated", notification["data"])
+
+    event = WebhookEvent.objects.get()
+    assert (event.event_id, event.entity_id, event.status) == ("evt_failed", "ctm_failed", WebhookEvent.Status.PENDING)
+
+
+def post_webhook(body):
+    body = json.dumps(body)
+    signature = hmac.new(
+        default_settings["PADDLE_SECRET_KEY"].encode(), f"1700000000:{body}".encode(), hashlib.sha256
+    ).hexdigest()
+    return Client().post(
+        "/webhook/",
+        body,
+        content_type="application/json",
+        HTTP_PADDLE_SIGNATURE=f"ts=1700000000;h1={signature}",
+        HTTP_X_FORWARDED_FOR=default_settings["PADDLE_SANDBOX_IPS"][0],
+    )
+
+
+def test_webhook_view_hands_events_to_the_lanes(monkeypatch):
+    submitted = []
+
+    class Dispatcher:
+        full = False
+
+        def submit(self, key, func, *args):
+            if self.full:
+                raise dispatch.DispatchLaneFullError(key)
+            submitted.append((key, func, args[1]))
+
+    monkeypatch.setitem(default_settings, "WEBHOOK_DISPATCH_LANES", 4)
+    monkeypatch.setattr(dispatch, "get_dispatcher", Dispatcher)
+    body = {
+        "notification_id": "ntf_lanes",
+        "event_id": "evt_lanes",
+        "event_type": "customer.updated",
+        "occurred_at": "2024-01-01T00:00:00Z",
+        "data": {"id": "ctm_lanes", "email": "lanes@example.com", "status": "active", "marketing_consent": False},
+    }
+
+    assert post_webhook(body).status_code == 200
+    assert submitted == [("ctm_lanes", dispatch.dispatch_webhook, "customer.updated")]
+
+    # Paddle delivers the event again when the lane is full
+    Dispatcher.full = True
+    assert post_webhook(body).status_code == 503
@@ -1,6 +1,18 @@
+import datetime as dt
 import json
 
-from django_paddle_billing.encoders import PrettyJSONEncoder
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from django_paddle_billing import encoders
+from django_paddle_billing.encoders import (
+    COMPRESSED_KEY,
+    CompressedPaddleJSONEncoder,
+    PaddleJSONDecoder,
+    PaddleJSONEncoder,
+    PrettyJSONEncoder,
+)
+from django_paddle_billing.settings import settings as default_settings
 
 
 def test_pretty_json_encoder_produces_readable_output():
@@ -25,3 +37,58 @@ def test_pretty_json_encoder_handles_nested_input():
     encoded = encoder.encode(data)
     expected = json.dumps(data, indent=4, sort_keys=True)
     assert encoded == expected
+
+
+@pytest.fixture
+def codec_settings(monkeypatch):
+    def configure(**kwargs):
+        for name, value in kwargs.items():
+            monkeypatch.setitem(default_settings, name, value)
+
+    return configure
+
+
+def test_paddle_json_encoder_is_compact_by_default(codec_settings):
+    codec_settings(JSON_CODEC="compact", JSON_COMPRESSION=None)
+    data = {"key": "value", "list": [1, 2, 3]}
+
+    assert json.dumps(data, cls=PaddleJSONEncoder) == '{"key":"value","list":[1,2,3]}'
+
+
+def test_paddle_json_encoder_pretty_codec(codec_settings):
+    codec_settings(JSON_CODEC="pretty")
+    data = {"key": "value", "number": 123}
+
+    assert json.dumps(data, cls=PaddleJSONEncoder) == json.dumps(data, indent=4, sort_keys=True)
+
+
+def test_paddle_json_encoder_orjson_codec(codec_settings):
+    pytest.importorskip("orjson")
+    codec_settings(JSON_CODEC="orjson")
+    data = {"key": "value", "at": dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)}
+
+    encoded = json.dumps(data, cls=PaddleJSONEncoder)
+
+    assert encoded == '{"key":"value","at":"2024-01-01T00:00:00Z"}'
+    assert json.loads(encoded, cls=PaddleJSONDecoder) == {"key": "value", "at": "2024-01-01T00:00:00Z"}
+
+
+def test_compressed_encoder_round_trip(codec_settings):
+    codec_settings(JSON_CODEC="compact", JSON_COMPRESSION="zlib", JSON_COMPRESSION_THRESHOLD=100)
+    small = {"key": "value"}
+    large = {"items": [{"price": "1000", "currency_code": "USD"}] * 50}
+
+    assert json.dumps(small, cls=CompressedPaddleJSONEncoder) == '{"key":"value"}'
+    encoded = json.dumps(large, cls=CompressedPaddleJSONEncoder)
+    assert COMPRESSED_KEY in json.loads(encoded)
+    assert len(encoded) < len(json.dumps(large))
+    assert json.loads(encoded, cls=PaddleJSONDecoder) == large
+
+
+def test_zstd_payload_without_zstandard(codec_settings, monkeypatch):
+    codec_settings(JSON_CODEC="compact")
+    monkeypatch.setattr(encoders, "zstandard", None)
+    stored = json.dumps({COMPRESSED_KEY: "zstd", "data": "KLUv/SAHOQAAeyJrIjoxfQ=="})
+
+    with pytest.raises(ImproperlyConfigured, match="zstd"):
+        json.loads(stored, cls=PaddleJSONDecoder)
@@ -0,0 +1,130 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from paddle_billing_client.models.subscription import Subscription as SubscriptionData
+
+from django_paddle_billing import entitlements
+from django_paddle_billing.entitlements import (
+    bulk_subscription_status,
+    get_entitlements,
+    has_active_subscription,
+    invalidate_entitlements,
+)
+from django_paddle_billing.models import Customer, Product, Subscription
+
+
+def _subscribe(status="active"):
+    account = get_user_model().objects.create(username="account")
+    customer = Customer.objects.create(id="ctm_1", email="account@example.com")
+    product = Product.objects.create(id="pro_1", name="Pro", status="active")
+    subscription = Subscription.objects.create(id="sub_1", customer=customer, account=account, status=status)
+    subscription.products.add(product)
+    return account, subscription
+
+
+def test_has_active_subscription(db):
+    cache.clear()
+    account, _ = _subscribe()
+
+    assert has_active_subscription(account, "pro_1")
+    assert has_active_subscription(account)
+    assert not has_active_subscription(account, "pro_2")
+    assert get_entitlements(account.pk) == frozenset({"pro_1"})
+
+
+def test_inactive_subscription_is_not_entitled(db):
+    cache.clear()
+    account, _ = _subscribe(status="canceled")
+
+    assert not has_active_subscription(account, "pro_1")
+
+
+def test_entitlements_are_cached_until_invalidated(db):
+    cache.clear()
+    account, subscription = _subscribe()
+
+    with CaptureQueriesContext(connection) as queries:
+        assert has_active_subscription(account, "pro_1")
+        assert has_active_subscription(account, "pro_1")
+        assert has_active_subscription(account.pk, "pro_1")
+    assert len(queries) == 1
+
+    Subscription.objects.filter(pk=subscription.pk).update(status="canceled")
+    assert has_active_subscription(account.pk, "pro_1")
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        invalidate_entitlements(account.pk)
+        # A check before the commit must not cache the state being replaced
+        assert has_active_subscription(account.pk, "pro_1")
+    assert not has_active_subscription(account.pk, "pro_1")
+
+
+def test_entitlements_are_loaded_from_the_database_written_to(db, monkeypatch):
+    cache.clear()
+    account, _ = _subscribe()
+    routed = []
+
+    def primary_alias(model):
+        routed.append(model.__name__)
+        return "default"
+
+    # A replica may lag behind the invalidation, the snapshot would stay cached until the next one
+    monkeypatch.setattr(entitlements, "primary_alias", primary_alias)
+    assert has_active_subscription(account.pk, "pro_1")
+    assert routed == ["Subscription"]
+
+
+def test_moving_a_subscription_invalidates_both_accounts(db):
+    cache.clear()
+    account, subscription = _subscribe()
+    other = get_user_model().objects.create(username="other")
+    assert has_active_subscription(account.pk, "pro_1")
+    assert not has_active_subscription(other.pk, "pro_1")
+
+    data = SubscriptionData.model_validate(
+        {
+            "id": subscription.pk,
+            "status": "active",
+            "customer_id": "ctm_1",
+            "custom_data": {"account_id": other.pk},
+            "items": [
+                {
+                    "quantity": 1,
+                    "recurring": True,
+                    "price": {
+                        "id": "pri_1",
+                        "product_id": "pro_1",
+                        "description": "Pro",
+                        "unit_price": {"amount": "100", "currency_code": "USD"},
+                        "tax_mode": "account_setting",
+                    },
+                }
+            ],
+        }
+    )
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        Subscription.from_paddle_data(data)
+
+    assert not has_active_subscription(account.pk, "pro_1")
+    assert has_active_subscription(other.pk, "pro_1")
+
+
+def test_bulk_subscription_status(db):
+    account, subscription = _subscribe()
+    Subscription.objects.create(id="sub_2", customer=subscription.customer, account=account, status="canceled")
+    other = get_user_model().objects.create(username="other")
+
+    with CaptureQueriesContext(connection) as queries:
+        statuses = bulk_subscription_status([str(account.pk), other.pk, 999], chunk_size=2)
+
+    assert statuses == {
+        account.pk: {"status": "active", "active": True, "products": ["pro_1"]},
+        other.pk: {"status": None, "active": False, "products": []},
+        999: {"status": None, "active": False, "products": []},
+    }
+    assert len(queries) == 2
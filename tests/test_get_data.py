@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+from paddle_billing_client.models import product
+
+from django_paddle_billing.models import Product, parsed_data_cache
+
+
+def test_get_data_is_memoized_until_data_is_assigned():
+    instance = Product(
+        id="pro_1", name="Pro", status="active", data={"id": "pro_1", "name": "Pro", "tax_category": "saas"}
+    )
+
+    parsed = instance.get_data()
+    assert instance.get_data() is parsed
+
+    instance.data = {"id": "pro_1", "name": "Pro Plus", "tax_category": "saas"}
+    assert instance.get_data() is not parsed
+    assert instance.get_data().name == "Pro Plus"
+
+    instance.data = None
+    assert instance.get_data() is None
+
+
+def test_from_paddle_data_reuses_validated_payload(db):
+    payload = product.Product(id="pro_1", name="Pro", tax_category="saas", status="active")
+
+    instance, _, _ = Product.from_paddle_data(payload)
+
+    assert instance.get_data() is payload
+    assert Product.objects.get(pk="pro_1").get_data() == payload
+
+
+def test_rows_loaded_again_are_not_validated_again(db, monkeypatch):
+    Product.from_paddle_data(product.Product(id="pro_1", name="Pro", tax_category="saas", status="active"))
+    parsed_data_cache.clear()
+    validated = []
+    model_validate = product.Product.model_validate
+    monkeypatch.setattr(product.Product, "model_validate", lambda data: validated.append(data) or model_validate(data))
+
+    first = Product.objects.get(pk="pro_1").get_data()
+    second = Product.objects.get(pk="pro_1").get_data()
+    assert second == first
+    assert len(validated) == 1
+
+    # Each row gets a copy of its own
+    second.name = "Renamed"
+    assert first.name == "Pro"
+    assert Product.objects.get(pk="pro_1").get_data().name == "Pro"
+
+    # A new version of the row is validated again
+    instance = Product.objects.get(pk="pro_1")
+    instance.data = {"id": "pro_1", "name": "Pro Plus", "tax_category": "saas"}
+    instance.save()
+    assert Product.objects.get(pk="pro_1").get_data().name == "Pro Plus"
+    assert len(validated) == 2
+
+    # Even when written without bumping `updated_at`
+    Product.objects.filter(pk="pro_1").update(data={"id": "pro_1", "name": "Pro Max", "tax_category": "saas"})
+    assert Product.objects.get(pk="pro_1").get_data().name == "Pro Max"
+    assert len(validated) == 3
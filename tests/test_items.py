@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+from django.core.management import call_command
+from django.db.models import Sum
+from paddle_billing_client.models.transaction import Transaction as TransactionData
+
+from django_paddle_billing.models import Customer, Product, Transaction, TransactionItem
+
+TOTALS = {"subtotal": "1000", "discount": "0", "tax": "200", "total": "1200"}
+
+
+def _transaction_data(transaction_id, quantity=1):
+    return TransactionData.model_validate(
+        {
+            "id": transaction_id,
+            "status": "completed",
+            "customer_id": "ctm_items",
+            "currency_code": "EUR",
+            "billed_at": "2024-01-01T00:00:05Z",
+            "details": {
+                "line_items": [
+                    {
+                        "id": f"txnitm_{transaction_id}",
+                        "price_id": "pri_1",
+                        "quantity": quantity,
+                        "tax_rate": "0.2",
+                        "unit_totals": TOTALS,
+                        "totals": TOTALS,
+                        "product": {"id": "pro_1", "name": "Pro", "tax_category": "saas", "status": "active"},
+                    }
+                ]
+            },
+        }
+    )
+
+
+def test_transaction_items_are_written_and_replaced(db):
+    Customer.objects.create(id="ctm_items", email="items@example.com")
+    Product.objects.create(id="pro_1", name="Pro", status="active")
+
+    Transaction.from_paddle_data(_transaction_data("txn_1"))
+    Transaction.from_paddle_data(_transaction_data("txn_2"))
+    Transaction.from_paddle_data(_transaction_data("txn_2", quantity=3))
+
+    revenue = TransactionItem.objects.values("product__name").annotate(revenue=Sum("total"), seats=Sum("quantity"))
+    assert list(revenue) == [{"product__name": "Pro", "revenue": 2400, "seats": 4}]
+    assert TransactionItem.objects.get(transaction_id="txn_1").currency_code == "EUR"
+
+
+def test_backfill_items(db):
+    Customer.objects.create(id="ctm_items", email="items@example.com")
+    Transaction.objects.create(id="txn_1", customer_id="ctm_items", data=_transaction_data("txn_1").dict())
+
+    call_command("backfill_items")
+
+    assert TransactionItem.objects.filter(transaction_id="txn_1", price_id="pri_1").count() == 1
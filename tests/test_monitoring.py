@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import hashlib
+import hmac
+import json
+
+import pytest
+from django.test import Client
+
+from django_paddle_billing import monitoring
+from django_paddle_billing.settings import settings as default_settings
+
+CUSTOMER = {"id": "ctm_monitoring", "email": "monitoring@example.com", "status": "active", "marketing_consent": False}
+
+
+@pytest.fixture
+def backend():
+    backend = monitoring.get_backend()
+    backend.reset()
+    return backend
+
+
+def post_webhook(occurred_at, secret_key=None, event_type="customer.updated", data=None):
+    body = json.dumps(
+        {
+            "notification_id": "ntf_monitoring",
+            "event_id": "evt_monitoring",
+            "event_type": event_type,
+            "occurred_at": occurred_at,
+            "data": data or CUSTOMER,
+        }
+    )
+    signature = hmac.new(
+        (secret_key or default_settings["PADDLE_SECRET_KEY"]).encode(),
+        f"1700000000:{body}".encode(),
+        hashlib.sha256,
+    ).hexdigest()
+    return Client().post(
+        "/webhook/",
+        body,
+        content_type="application/json",
+        HTTP_PADDLE_SIGNATURE=f"ts=1700000000;h1={signature}",
+        HTTP_X_FORWARDED_FOR=default_settings["PADDLE_SANDBOX_IPS"][0],
+    )
+
+
+def test_webhook_outcomes(db, backend):
+    assert post_webhook("2024-01-02T00:00:00Z").status_code == 200
+    assert post_webhook("2024-01-01T00:00:00Z").status_code == 200
+    assert post_webhook("2024-01-03T00:00:00Z", secret_key="wrong").status_code == 400
+
+    events = "paddle_webhook_events_total"
+    assert backend.get_counter(events, event_type="customer.updated", outcome="processed") == 1
+    assert backend.get_counter(events, event_type="customer.updated", outcome="stale") == 1
+    assert backend.get_counter(events, event_type="unknown", outcome="invalid_signature") == 1
+
+    phases = "paddle_webhook_phase_duration_seconds"
+    for phase in ("signature", "parse", "dispatch", "db"):
+        assert backend.get_histogram(phases, event_type="customer.updated", phase=phase).count == 2
+
+
+def test_render_prometheus_text(backend):
+    backend.increment("paddle_webhook_events_total", {"event_type": "price.updated", "outcome": "processed"})
+    backend.observe("paddle_webhook_duration_seconds", {"event_type": "price.updated", "outcome": "processed"}, 0.2)
+
+    text = monitoring.render_metrics()
+    assert 'paddle_webhook_events_total{event_type="price.updated",outcome="processed"} 1' in text
+    assert 'paddle_webhook_duration_seconds_bucket{event_type="price.updated",outcome="processed",le="0.25"} 1' in text
+    assert 'paddle_webhook_duration_seconds_bucket{event_type="price.updated",outcome="processed",le="0.1"} 0' in text
+    assert 'paddle_webhook_duration_seconds_count{event_type="price.updated",outcome="processed"} 1' in text
+
+
+def test_slow_webhook_is_logged(backend, monkeypatch, caplog):
+    monkeypatch.setitem(default_settings, "WEBHOOK_SLOW_EVENT_SECONDS", 0)
+    with monitoring.track_webhook() as tracker:
+        tracker.event_type = "price.updated"
+    assert "Slow webhook: price.updated (processed)" in caplog.text
+
+
+def test_address_webhook(db, backend):
+    address = {"id": "add_monitoring", "country_code": "FR", "status": "active", "customer_id": "ctm_monitoring"}
+    assert post_webhook("2024-01-01T00:00:00Z", event_type="address.created", data=address).status_code == 200
+    assert backend.get_counter("paddle_webhook_events_total", event_type="address.created", outcome="processed") == 1
@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import datetime as dt
+
+from paddle_billing_client.models.subscription import Subscription as SubscriptionData
+
+from django_paddle_billing import mrr
+from django_paddle_billing.models import Customer, DailyMetrics, Product, Subscription
+
+JANUARY = dt.datetime(2024, 1, 10, tzinfo=dt.timezone.utc)
+
+
+def _subscription_data(status="active", quantity=1, interval="month", canceled_at=None):
+    return SubscriptionData.model_validate(
+        {
+            "id": "sub_mrr",
+            "status": status,
+            "customer_id": "ctm_mrr",
+            "currency_code": "USD",
+            "started_at": "2024-01-01T00:00:00Z",
+            "canceled_at": canceled_at,
+            "items": [
+                {
+                    "quantity": quantity,
+                    "recurring": True,
+                    "price": {
+                        "id": "pri_mrr",
+                        "product_id": "pro_mrr",
+                        "description": "Seat",
+                        "unit_price": {"amount": "1200", "currency_code": "USD"},
+                        "billing_cycle": {"interval": interval, "frequency": 1},
+                        "tax_mode": "account_setting",
+                    },
+                }
+            ],
+        }
+    )
+
+
+def _setup():
+    Customer.objects.create(id="ctm_mrr", email="mrr@example.com")
+    Product.objects.create(id="pro_mrr", name="Seat", status="active")
+
+
+def test_compute_mrr_normalizes_billing_cycles():
+    assert mrr.compute_mrr(_subscription_data(quantity=2)) == (2400, "USD")
+    assert mrr.compute_mrr(_subscription_data(interval="year")) == (100, "USD")
+
+
+def test_subscription_changes_update_daily_metrics(db):
+    _setup()
+    Subscription.from_paddle_data(_subscription_data(quantity=2), JANUARY)
+    Subscription.from_paddle_data(_subscription_data(quantity=3), JANUARY + dt.timedelta(hours=1))
+    # A stale event is ignored
+    Subscription.from_paddle_data(_subscription_data(quantity=1), JANUARY)
+    Subscription.from_paddle_data(_subscription_data(quantity=1), JANUARY + dt.timedelta(days=1))
+    Subscription.from_paddle_data(_subscription_data(status="canceled"), JANUARY + dt.timedelta(days=2))
+
+    rows = (
+        DailyMetrics.objects.with_levels()
+        .order_by("date")
+        .values_list(
+            "mrr", "active_count", "new_mrr", "expansion_mrr", "contraction_mrr", "churned_mrr", "churned_count"
+        )
+    )
+    assert list(rows) == [
+        (3600, 1, 2400, 1200, 0, 0, 0),
+        (1200, 1, 0, 0, 2400, 0, 0),
+        (0, 0, 0, 0, 0, 1200, 1),
+    ]
+    assert mrr.get_current_mrr("USD") == 0
+
+
+def test_subscription_stored_before_the_metrics_is_not_new(db):
+    _setup()
+    data = _subscription_data(quantity=2)
+    # No MRR computed yet, `rebuild_metrics` has not run
+    Subscription.objects.create(id=data.id, customer_id="ctm_mrr", status="active", data=data.dict())
+
+    Subscription.from_paddle_data(_subscription_data(quantity=3), JANUARY)
+
+    row = DailyMetrics.objects.get()
+    assert (row.new_mrr, row.new_count, row.expansion_mrr) == (0, 0, 1200)
+
+
+def test_subscription_without_currency_counts_as_inactive(db):
+    _setup()
+    Subscription.from_paddle_data(_subscription_data(quantity=2), JANUARY)
+    data = _subscription_data().model_copy(update={"currency_code": None, "items": []})
+
+    _subscription, _, error = Subscription.from_paddle_data(data, JANUARY + dt.timedelta(days=1))
+
+    assert error is None
+    assert _subscription.mrr == 0
+    rows = DailyMetrics.objects.with_levels().order_by("date").values_list("mrr", "churned_mrr", "churned_count")
+    assert list(rows) == [(2400, 0, 0), (0, 2400, 1)]
+    assert mrr.compute_deltas(None, None) == {}
+
+
+def test_rebuild_metrics(db):
+    _setup()
+    Subscription.from_paddle_data(
+        _subscription_data(status="canceled", canceled_at="2024-03-01T00:00:00Z"), JANUARY + dt.timedelta(days=60)
+    )
+    DailyMetrics.objects.all().delete()
+    Subscription.objects.update(mrr=0, currency_code="")
+    updated_at = Subscription.objects.get().updated_at
+
+    assert mrr.rebuild_metrics() == 2
+    assert Subscription.objects.get().updated_at > updated_at
+
+    rows = mrr.get_metrics(dt.date(2024, 1, 1), dt.date(2024, 12, 31), "USD")
+    assert [(row.date, row.mrr, row.new_mrr, row.churned_mrr) for row in rows] == [
+        (dt.date(2024, 1, 1), 1200, 1200, 0),
+        (dt.date(2024, 3, 1), 0, 0, 1200),
+    ]
+    # The levels carry over from the days before the period
+    rows = mrr.get_metrics(dt.date(2024, 2, 1), dt.date(2024, 12, 31))
+    assert [(row.date, row.mrr, row.active_count) for row in rows] == [(dt.date(2024, 3, 1), 0, 0)]
+    rows = mrr.get_metrics(dt.date(2024, 1, 1), dt.date(2024, 2, 1))
+    assert [(row.date, row.mrr, row.active_count) for row in rows] == [(dt.date(2024, 1, 1), 1200, 1)]
+    assert mrr.get_current_mrr("USD") == 0
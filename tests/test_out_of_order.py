@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import datetime as dt
+import random
+
+from django.db.models import QuerySet
+from paddle_billing_client.models.customer import Customer as CustomerData
+
+from django_paddle_billing import synthetic
+from django_paddle_billing.models import Customer, Subscription
+
+OCCURRED_AT = dt.datetime(2024, 7, 1, tzinfo=dt.timezone.utc)
+
+
+def test_shuffled_and_duplicated_events_keep_the_newest_state(db):
+    generator = synthetic.DatasetGenerator(seed=3, products=3, discounts=0, months=3)
+    bundle = next(bundle for bundle in generator.generate(10) if bundle.subscriptions)
+    synthetic.load_catalog(generator.catalog)
+    synthetic.bulk_load([bundle._replace(subscriptions=[], transactions=[])])
+
+    events = []
+    for version, status in enumerate(["active", "past_due", "active", "paused", "canceled"]):
+        data = bundle.subscriptions[0].model_copy(deep=True)
+        data.status = status
+        data.items[0].quantity = version + 1
+        events.append((OCCURRED_AT + dt.timedelta(seconds=version), data))
+    deliveries = events + events[:3]
+    rng = random.Random(0)  # noqa: S311
+    rng.shuffle(deliveries)
+
+    for occurred_at, data in deliveries:
+        _, _, error = Subscription.from_paddle_data(data, occurred_at)
+        assert error is None
+
+    subscription = Subscription.objects.get(pk=bundle.subscriptions[0].id)
+    assert subscription.occurred_at == events[-1][0]
+    assert subscription.status == "canceled"
+    assert subscription.items.get(price_id=events[-1][1].items[0].price.id).quantity == 5
+
+
+def test_concurrently_created_row_is_updated(db, monkeypatch):
+    data = CustomerData.model_validate(
+        {"id": "ctm_race", "email": "race@example.com", "status": "active", "marketing_consent": False}
+    )
+    Customer.objects.create(id="ctm_race", email="old@example.com", occurred_at=OCCURRED_AT)
+
+    # The first lookup misses the row, as if a concurrent event created it meanwhile
+    misses = []
+    get = QuerySet.get
+
+    def get_missing_once(self, *args, **kwargs):
+        if self.model is Customer and not misses:
+            misses.append(kwargs)
+            raise Customer.DoesNotExist
+        return get(self, *args, **kwargs)
+
+    monkeypatch.setattr(QuerySet, "get", get_missing_once)
+    _, created, error = Customer.from_paddle_data(data, OCCURRED_AT + dt.timedelta(seconds=1))
+    monkeypatch.undo()
+
+    assert error is None
+    assert not created
+    assert misses == [{"pk": "ctm_race"}]
+    assert Customer.objects.get(pk="ctm_race").email == "race@example.com"
@@ -0,0 +1,51 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import pstats
+from io import StringIO
+
+from django.core.management import call_command
+
+from django_paddle_billing import profiling
+from django_paddle_billing.management.commands import sync_from_paddle
+from django_paddle_billing.settings import settings as default_settings
+
+
+def hot_function():
+    return sum(i * i for i in range(10_000))
+
+
+def test_profile(tmp_path):
+    with profiling.profile("test run", memory=True, profile_dir=tmp_path) as profile:
+        hot_function()
+
+    assert profile.path.parent == tmp_path
+    assert profile.path.name.startswith("test-run-")
+    assert "hot_function" in str(pstats.Stats(str(profile.path)).stats)
+    assert profile.peak_memory > 0
+
+    report = profile.report(limit=10)
+    assert "hot_function" in report
+    assert "Peak traced memory" in report
+
+
+def test_sync_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(sync_from_paddle.Command, "sync", lambda self: hot_function())
+    out = StringIO()
+    call_command("sync_from_paddle", "--profile", f"--profile-dir={tmp_path}", stdout=out)
+
+    assert "hot_function" in out.getvalue()
+    assert [path.name.startswith("sync_from_paddle-") for path in tmp_path.iterdir()] == [True]
+
+
+def test_webhook_sampling(tmp_path, monkeypatch):
+    monkeypatch.setitem(default_settings, "PROFILE_DIR", str(tmp_path))
+
+    monkeypatch.setitem(default_settings, "PROFILE_WEBHOOKS", 0)
+    with profiling.profile_webhook() as profile:
+        assert profile is None
+
+    monkeypatch.setitem(default_settings, "PROFILE_WEBHOOKS", 1)
+    with profiling.profile_webhook() as profile:
+        profile.name = "webhook-customer.updated"
+    assert profile.path.name.startswith("webhook-customerupdated-")
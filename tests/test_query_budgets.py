@@ -0,0 +1,281 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+"""
+Upper bounds on the number of queries of the hot paths: webhooks, sync pages, admin changelists and read APIs.
+
+Raising a budget is a deliberate change of this table. A test over budget fails with the queries it ran, the
+statements run more than once (usually a query per row) listed first.
+"""
+
+import datetime as dt
+import hashlib
+import hmac
+import json
+import re
+from collections import Counter
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from django_paddle_billing import mrr, synthetic
+from django_paddle_billing.models import (
+    Address,
+    Business,
+    Customer,
+    DailyMetrics,
+    Discount,
+    Price,
+    Product,
+    Subscription,
+    Transaction,
+)
+from django_paddle_billing.settings import settings as default_settings
+from django_paddle_billing.views import PaddleWebhookView
+
+# Rows per changelist, API and sync page
+PAGE_SIZE = 20
+
+BUDGETS = {
+    # One webhook, updating an existing row
+    "webhook:address": 2,
+    "webhook:adjustment": 0,
+    "webhook:business": 2,
+    "webhook:customer": 3,
+    "webhook:discount": 2,
+    "webhook:payout": 0,
+    "webhook:price": 2,
+    "webhook:product": 2,
+    "webhook:report": 0,
+    "webhook:subscription": 8,
+    "webhook:transaction": 6,
+    # One page of PAGE_SIZE entities, addresses and businesses: a page for each of PAGE_SIZE customers
+    "sync:Product": 40,
+    "sync:Price": 40,
+    "sync:Discount": 40,
+    "sync:Customer": 60,
+    "sync:Address": 47,
+    "sync:Business": 11,
+    "sync:Subscription": 160,
+    "sync:Transaction": 120,
+    # One changelist page of PAGE_SIZE rows
+    "admin:Address": 3,
+    "admin:Business": 3,
+    "admin:Customer": 3,
+    "admin:DailyMetrics": 6,
+    "admin:Discount": 3,
+    "admin:Price": 3,
+    "admin:Product": 3,
+    "admin:Subscription": 3,
+    "admin:Transaction": 4,
+    # List of PAGE_SIZE rows and retrieve, the validators come from the rows read
+    "api:customers": 1,
+    "api:products": 1,
+    "api:prices": 1,
+    "api:subscriptions": 2,
+    "api:transactions": 1,
+    "api:customers:retrieve": 1,
+    "api:products:retrieve": 1,
+    "api:prices:retrieve": 1,
+    "api:subscriptions:retrieve": 2,
+    "api:transactions:retrieve": 1,
+    "api:subscription-status": 1,
+}
+
+END = dt.datetime(2024, 6, 30, tzinfo=dt.timezone.utc)
+
+# Webhook payloads of the entities not stored
+PAYLOADS = {
+    "adjustment": {
+        "id": "adj_budget",
+        "action": "refund",
+        "transaction_id": "txn_budget",
+        "customer_id": "ctm_budget",
+        "currency_code": "USD",
+        "status": "pending_approval",
+        "items": [{"item_id": "txnitm_budget", "type": "full", "amount": "1200"}],
+        "totals": {"subtotal": "1000", "tax": "200", "total": "1200", "fee": "60", "earnings": "940"},
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    },
+    "payout": {"id": "pay_budget", "status": "paid", "amount": "100000", "currency_code": "USD"},
+    "report": {
+        "id": "rep_budget",
+        "status": "ready",
+        "type": "transactions",
+        "filters": [],
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    },
+}
+
+
+def normalize(sql) -> str:
+    return re.sub(r"'[^']*'|\b\d+\b", "?", sql)
+
+
+def format_overrun(name, budget, queries) -> str:
+    counts = Counter(normalize(query["sql"]) for query in queries)
+    lines = [f"{name}: {len(queries)} queries, budget {budget} (+{len(queries) - budget})"]
+    repeated = [(sql, count) for sql, count in counts.most_common() if count > 1]
+    if repeated:
+        lines.append("Repeated statements:")
+        lines.extend(f"  {count} x {sql}" for sql, count in repeated)
+    lines.append("Queries:")
+    lines.extend(f"  {i}. {query['sql']}" for i, query in enumerate(queries, 1))
+    return "\n".join(lines)
+
+
+@contextmanager
+def query_budget(name):
+    with CaptureQueriesContext(connection) as context:
+        yield
+    budget = BUDGETS[name]
+    if len(context) > budget:
+        pytest.fail(format_overrun(name, budget, context.captured_queries), pytrace=False)
+
+
+@pytest.fixture
+def dataset(db):
+    generator = synthetic.DatasetGenerator(seed=1, products=PAGE_SIZE, discounts=PAGE_SIZE, months=3, end=END)
+    synthetic.load_catalog(generator.catalog)
+    bundles = list(generator.generate(PAGE_SIZE))
+    synthetic.bulk_load(bundles)
+    return SimpleNamespace(catalog=generator.catalog, bundles=bundles)
+
+
+@pytest.fixture
+def admin_user(db):
+    return get_user_model().objects.create(username="admin", is_staff=True, is_superuser=True)
+
+
+def entity_payloads(dataset) -> dict:
+    bundle = next(bundle for bundle in dataset.bundles if bundle.subscriptions and bundle.businesses)
+    return {
+        "address": bundle.addresses[0],
+        "business": bundle.businesses[0],
+        "customer": bundle.customer,
+        "discount": dataset.catalog.discounts[0],
+        "price": dataset.catalog.prices[0],
+        "product": dataset.catalog.products[0],
+        "subscription": bundle.subscriptions[0],
+        "transaction": bundle.transactions[-1],
+    }
+
+
+def post_webhook(event_type, data):
+    body = json.dumps(
+        {
+            "notification_id": "ntf_budget",
+            "event_id": "evt_budget",
+            "event_type": event_type,
+            "occurred_at": "2024-07-01T00:00:00Z",
+            "data": data,
+        }
+    )
+    signature = hmac.new(
+        default_settings["PADDLE_SECRET_KEY"].encode(), f"1700000000:{body}".encode(), hashlib.sha256
+    ).hexdigest()
+    return Client().post(
+        "/webhook/",
+        body,
+        content_type="application/json",
+        HTTP_PADDLE_SIGNATURE=f"ts=1700000000;h1={signature}",
+        HTTP_X_FORWARDED_FOR=default_settings["PADDLE_SANDBOX_IPS"][0],
+    )
+
+
+@pytest.mark.parametrize("event_type", sorted(PaddleWebhookView.SUPPORTED_WEBHOOKS))
+def test_webhook_query_budget(dataset, event_type):
+    entity = event_type.split(".")[0]
+    payload = entity_payloads(dataset).get(entity)
+    data = payload.model_dump(mode="json") if payload else PAYLOADS[entity]
+
+    with query_budget(f"webhook:{entity}"):
+        response = post_webhook(event_type, data)
+    assert response.status_code == 200
+
+
+def sync_page(monkeypatch, model, generator, get_entities, *args):
+    def pages(cls, **kwargs):
+        yield SimpleNamespace(data=get_entities(**kwargs))
+
+    monkeypatch.setattr(model, generator, classmethod(pages))
+    with query_budget(f"sync:{model.__name__}"):
+        model.sync_from_paddle(*args)
+
+
+def test_sync_page_query_budget(dataset, monkeypatch):
+    catalog, bundles = dataset.catalog, dataset.bundles
+    sync_page(monkeypatch, Product, "api_list_products_generator", lambda: catalog.products[:PAGE_SIZE])
+    sync_page(monkeypatch, Price, "api_list_prices_generator", lambda: catalog.prices[:PAGE_SIZE])
+    sync_page(monkeypatch, Discount, "api_list_discounts_generator", lambda: catalog.discounts[:PAGE_SIZE])
+    customers = [bundle.customer for bundle in bundles]
+    sync_page(monkeypatch, Customer, "api_list_customers_generator", lambda: customers, False, False, False)
+
+    # Addresses and businesses are listed for each of the PAGE_SIZE customers
+    addresses = {bundle.customer.id: bundle.addresses for bundle in bundles}
+    businesses = {bundle.customer.id: bundle.businesses for bundle in bundles}
+    sync_page(
+        monkeypatch, Address, "api_list_addresses_for_customer_generator", lambda customer_id: addresses[customer_id]
+    )
+    sync_page(
+        monkeypatch, Business, "api_list_businesses_for_customer_generator", lambda customer_id: businesses[customer_id]
+    )
+
+    subscriptions = [data for bundle in bundles for data in bundle.subscriptions][:PAGE_SIZE]
+    sync_page(monkeypatch, Subscription, "api_list_subscriptions_generator", lambda: subscriptions)
+    transactions = [data for bundle in bundles for data in bundle.transactions][:PAGE_SIZE]
+    sync_page(monkeypatch, Transaction, "api_list_transactions_generator", lambda: transactions)
+
+
+@override_settings(ROOT_URLCONF="tests.urls")
+@pytest.mark.parametrize(
+    "model", [Address, Business, Customer, DailyMetrics, Discount, Price, Product, Subscription, Transaction]
+)
+def test_admin_changelist_query_budget(dataset, admin_user, monkeypatch, model):
+    if model is DailyMetrics:
+        mrr.rebuild_metrics()
+    request = RequestFactory().get("/")
+    request.user = admin_user
+    model_admin = admin.site._registry[model]
+    monkeypatch.setattr(model_admin, "list_per_page", PAGE_SIZE)
+
+    with query_budget(f"admin:{model.__name__}"):
+        response = model_admin.changelist_view(request)
+        response.render()
+    assert response.status_code == 200
+
+
+def test_api_query_budget(dataset, admin_user):
+    pytest.importorskip("rest_framework")
+    # Django REST framework is optional, imported once known to be installed
+    from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: PLC0415
+
+    from django_paddle_billing import api  # noqa: PLC0415
+
+    factory = APIRequestFactory()
+
+    def call(view, path, **kwargs):
+        request = factory.get(path, HTTP_ACCEPT="application/json")
+        force_authenticate(request, user=admin_user)
+        return view(request, **kwargs)
+
+    for prefix, viewset, _ in api.router.registry:
+        pk = viewset.queryset.order_by("pk").values_list("pk", flat=True).first()
+        with query_budget(f"api:{prefix}"):
+            assert call(viewset.as_view({"get": "list"}), f"/?page_size={PAGE_SIZE}").status_code == 200
+        with query_budget(f"api:{prefix}:retrieve"):
+            assert call(viewset.as_view({"get": "retrieve"}), f"/{pk}/", pk=pk).status_code == 200
+
+    account_ids = [str(admin_user.pk), *range(PAGE_SIZE)]
+    request = factory.post("/subscription-status/", {"account_ids": account_ids}, format="json")
+    force_authenticate(request, user=admin_user)
+    with query_budget("api:subscription-status"):
+        assert api.BulkSubscriptionStatusView.as_view()(request).status_code == 200
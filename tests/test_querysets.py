@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import datetime as dt
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from django_paddle_billing.models import Customer, Product, Subscription, Transaction
+
+
+def _subscription(account, status="active"):
+    customer = Customer.objects.create(id=f"ctm_{status}", email=f"{status}@example.com")
+    subscription = Subscription.objects.create(id=f"sub_{status}", customer=customer, account=account, status=status)
+    subscription.products.add(Product.objects.get_or_create(id="pro_1", name="Pro", status="active")[0])
+    return subscription
+
+
+def test_active_subscriptions_for_account_with_products(db):
+    account = get_user_model().objects.create(username="account")
+    active = _subscription(account)
+    _subscription(account, status="canceled")
+
+    with CaptureQueriesContext(connection) as queries:
+        subscriptions = list(Subscription.objects.for_account(account).active().with_customer().with_products())
+        assert subscriptions == [active]
+        assert subscriptions[0].customer.email == "active@example.com"
+        assert [product.name for product in subscriptions[0].products.all()] == ["Pro"]
+    assert len(queries) == 2
+
+
+def test_recent_transactions_are_limited_per_subscription(db):
+    account = get_user_model().objects.create(username="account")
+    subscription = _subscription(account)
+    for i in range(3):
+        Transaction.objects.create(id=f"txn_{i}", customer=subscription.customer, subscription=subscription)
+
+    (subscription,) = Subscription.objects.recent_transactions(limit=2)
+
+    assert len(subscription.recent_transactions) == 2
+
+
+def test_billable_between(db):
+    account = get_user_model().objects.create(username="account")
+    subscription = _subscription(account)
+    january = dt.datetime(2024, 1, 15, tzinfo=dt.timezone.utc)
+    Transaction.objects.create(id="txn_jan", customer=subscription.customer, billed_at=january)
+    Transaction.objects.create(id="txn_feb", customer=subscription.customer, billed_at=january.replace(month=2))
+
+    transactions = Transaction.objects.billable_between(january.replace(day=1), january.replace(month=2, day=1))
+
+    assert [transaction.pk for transaction in transactions] == ["txn_jan"]
@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import threading
+import time
+
+from django.core.cache import cache
+from paddle_billing_client.models.address import Address as AddressData
+from paddle_billing_client.models.customer import Customer as CustomerData
+from paddle_billing_client.models.product import Product as ProductData
+
+from django_paddle_billing import catalog, models
+from django_paddle_billing.concurrency import SingleFlight, cache_lock
+from django_paddle_billing.models import Address, Customer, Product
+
+
+def test_single_flight_collapses_concurrent_calls():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["result"] * 5
+
+
+def test_cache_lock():
+    cache.clear()
+    with cache_lock("lock", timeout=5) as acquired:
+        assert acquired
+        with cache_lock("lock", timeout=5, wait=0) as acquired_again:
+            assert not acquired_again
+    with cache_lock("lock", timeout=5, wait=0) as acquired:
+        assert acquired
+
+
+def test_refresh_from_paddle_skips_fresh_rows(db, monkeypatch):
+    cache.clear()
+    calls = []
+
+    def api_get_data(pk):
+        calls.append(pk)
+        return CustomerData.model_validate(
+            {"id": pk, "email": "fresh@example.com", "status": "active", "marketing_consent": False}
+        )
+
+    monkeypatch.setattr(Customer, "api_get_data", api_get_data)
+
+    customer = Customer.refresh_from_paddle("ctm_refresh", max_age=60)
+    assert customer.email == "fresh@example.com"
+    assert Customer.refresh_from_paddle("ctm_refresh", max_age=60) == customer
+    assert calls == ["ctm_refresh"]
+
+    Customer.refresh_from_paddle("ctm_refresh", max_age=0)
+    assert calls == ["ctm_refresh", "ctm_refresh"]
+
+
+def test_catalog_is_invalidated_only_when_fetched(db, monkeypatch):
+    cache.clear()
+    invalidations = []
+    monkeypatch.setattr(catalog, "invalidate_catalog", lambda using=None: invalidations.append(using))
+    monkeypatch.setattr(
+        Product,
+        "api_get_data",
+        lambda pk: ProductData.model_validate(
+            {"id": pk, "name": "Pro", "status": "active", "tax_category": "standard"}
+        ),
+    )
+
+    Product.refresh_from_paddle("pro_refresh", max_age=60)
+    Product.refresh_from_paddle("pro_refresh", max_age=60)
+    assert invalidations == ["default"]
+
+
+def test_address_is_fetched_through_its_customer(db, monkeypatch):
+    cache.clear()
+    customer = Customer.objects.create(id="ctm_address", email="address@example.com")
+    Address.objects.create(id="add_refresh", customer=customer, country_code="US")
+    calls = []
+
+    class Client:
+        def get_address_for_customer(self, customer_id, address_id):
+            calls.append((customer_id, address_id))
+            data = AddressData.model_validate({"id": address_id, "country_code": "FR", "status": "active"})
+            return type("Response", (), {"data": data})
+
+    monkeypatch.setattr(models, "paddle_client", Client())
+
+    address = Address.refresh_from_paddle("add_refresh", max_age=0)
+    assert calls == [("ctm_address", "add_refresh")]
+    assert (address.customer_id, address.country_code) == ("ctm_address", "FR")
@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import datetime as dt
+import io
+import json
+
+from django.core.management import call_command
+
+from django_paddle_billing import reporting
+from django_paddle_billing.models import Address, Customer, Transaction, TransactionItem
+
+UTC = dt.timezone.utc
+
+
+def _transactions():
+    customer = Customer.objects.create(id="ctm_report", email="report@example.com")
+    Address.objects.create(id="add_fr", customer=customer, country_code="FR")
+    for i, (day, currency, total, status) in enumerate(
+        [
+            (1, "EUR", 1200, "completed"),
+            (1, "EUR", 600, "paid"),
+            (20, "USD", 1000, "completed"),
+            (2, "EUR", 50, "ready"),
+        ]
+    ):
+        billed_at = dt.datetime(2024, 1 if day < 15 else 2, day, 12, tzinfo=UTC)
+        transaction = Transaction.objects.create(
+            id=f"txn_{i}",
+            customer=customer,
+            address_id="add_fr",
+            status=status,
+            currency_code=currency,
+            subtotal=total,
+            tax=0,
+            total=total,
+            billed_at=billed_at,
+        )
+        TransactionItem.objects.create(
+            transaction=transaction, product_id="pro_1", total=total, currency_code=currency, billed_at=billed_at
+        )
+
+
+def test_revenue_by_day_and_currency(db):
+    _transactions()
+
+    rows = list(
+        reporting.iter_revenue_report(
+            dt.datetime(2024, 1, 1, tzinfo=UTC), dt.datetime(2024, 3, 1, tzinfo=UTC), ["day", "currency"]
+        )
+    )
+
+    assert [(row["day"], row["currency_code"], row["count"], row["gross_amount"]) for row in rows] == [
+        (dt.date(2024, 1, 1), "EUR", 2, 1800),
+        (dt.date(2024, 2, 20), "USD", 1, 1000),
+    ]
+
+
+def test_revenue_by_product_and_country_is_merged_across_chunks(db):
+    _transactions()
+
+    rows = list(
+        reporting.iter_revenue_report(
+            dt.datetime(2024, 1, 1, tzinfo=UTC), dt.datetime(2024, 3, 1, tzinfo=UTC), ["product", "country"]
+        )
+    )
+
+    assert rows == [
+        {
+            "product_id": "pro_1",
+            "country_code": "FR",
+            "count": 3,
+            "net_amount": 0,
+            "tax_amount": 0,
+            "gross_amount": 2800,
+        }
+    ]
+
+
+def test_revenue_report_command(db):
+    _transactions()
+    stdout = io.StringIO()
+
+    call_command(
+        "revenue_report",
+        "--start=2024-01-01",
+        "--end=2024-03-01",
+        "--group-by=month,currency",
+        "--format=jsonl",
+        stdout=stdout,
+        stderr=io.StringIO(),
+    )
+
+    rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [(row["month"], row["currency_code"], row["gross_amount"]) for row in rows] == [
+        ("2024-01-01", "EUR", 1800),
+        ("2024-02-01", "USD", 1000),
+    ]
@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import json
+from types import SimpleNamespace
+
+import pytest
+import requests
+from apiclient import HeaderAuthentication
+from apiclient.exceptions import ClientError
+from paddle_billing_client.client import PaddleApiClient
+
+from django_paddle_billing import retrying
+from django_paddle_billing.settings import settings as default_settings
+
+PRODUCTS = {
+    "data": [{"id": "pro_retrying", "name": "Pro", "tax_category": "saas", "status": "active"}],
+    "meta": {
+        "request_id": "req_retrying",
+        "pagination": {"per_page": 50, "next": "", "has_more": False, "estimated_total": 1},
+    },
+}
+
+
+def get_client(statuses):
+    client = PaddleApiClient(
+        base_url="https://sandbox-api.paddle.com",
+        authentication_method=HeaderAuthentication(token="test"),
+        request_strategy=retrying.RetryingRequestStrategy(),
+    )
+    calls = []
+
+    def get(url, **kwargs):
+        response = requests.Response()
+        response.status_code = statuses[len(calls)]
+        calls.append(url)
+        response._content = json.dumps(PRODUCTS if response.status_code == 200 else {"error": {}}).encode()
+        response.headers["Content-Type"] = "application/json"
+        response.headers["Retry-After"] = "0"
+        return response
+
+    client.set_session(SimpleNamespace(get=get))
+    return client, calls
+
+
+def test_rate_limited_requests_are_retried(monkeypatch):
+    monkeypatch.setitem(default_settings, "API_MAX_RETRIES", 2)
+    client, calls = get_client([429, 429, 200])
+    with retrying.retry_rate_limited():
+        assert client.list_products().data[0].id == "pro_retrying"
+    assert len(calls) == 3
+
+    client, calls = get_client([429, 429, 429])
+    with pytest.raises(ClientError), retrying.retry_rate_limited():
+        client.list_products()
+    assert len(calls) == 3
+
+
+def test_requests_are_not_retried_by_default(monkeypatch):
+    client, calls = get_client([429, 200])
+    with pytest.raises(ClientError):
+        client.list_products()
+    assert len(calls) == 1
+
+    monkeypatch.setitem(default_settings, "API_RETRY_RATE_LIMITED", True)
+    client, calls = get_client([429, 200])
+    assert client.list_products().data[0].id == "pro_retrying"
+    assert len(calls) == 2
+
+
+def test_retry_delay(monkeypatch):
+    monkeypatch.setitem(default_settings, "API_RETRY_MAX_WAIT", 10)
+    assert retrying.get_retry_delay("2", 0) == 2
+    assert retrying.get_retry_delay(None, 2) == 4
+    assert retrying.get_retry_delay("3600", 0) == 10
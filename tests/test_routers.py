@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+
+from django_paddle_billing import routers
+from django_paddle_billing.entitlements import get_entitlements
+from django_paddle_billing.models import Customer, Subscription
+from django_paddle_billing.settings import settings as default_settings
+
+
+@pytest.fixture
+def router(monkeypatch):
+    monkeypatch.setitem(default_settings, "REPLICA_DATABASE", "replica")
+    monkeypatch.setattr(routers._local, "pinned_until", 0, raising=False)
+    return routers.PaddleBillingRouter()
+
+
+@pytest.mark.usefixtures("db")
+def test_reads_go_to_the_replica_until_a_write(router):
+    assert router.db_for_read(Subscription) == "replica"
+    assert router.db_for_read(get_user_model()) is None
+
+    # Routing a write does not pin the thread, the write does
+    assert router.db_for_write(Subscription) == "default"
+    assert router.db_for_read(Subscription) == "replica"
+    Customer.objects.create(id="ctm_pin", email="pin@example.com")
+    assert router.db_for_read(Subscription) == "default"
+
+
+@pytest.mark.usefixtures("db")
+def test_entitlement_checks_do_not_pin(router):
+    cache.clear()
+    account = get_user_model().objects.create(username="account")
+    routers._local.pinned_until = 0
+
+    assert get_entitlements(account.pk) == frozenset()
+    assert routers.primary_alias(Subscription) == "default"
+    assert not routers.is_pinned()
+    assert router.db_for_read(Subscription) == "replica"
+
+
+def test_use_database(router):
+    with routers.use_database("other"):
+        assert router.db_for_read(Subscription) == "other"
+        assert router.db_for_write(Subscription) == "other"
+    assert router.db_for_read(Subscription) == "replica"
+
+
+def test_no_migrations_on_the_replica(router):
+    assert router.allow_migrate("replica", "django_paddle_billing") is False
+    assert router.allow_migrate("default", "django_paddle_billing") is None
+
+
+def test_sync_database_requires_the_router():
+    with pytest.raises(CommandError):
+        call_command("sync_from_paddle", database="other")
@@ -0,0 +1,41 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+from django_paddle_billing.models import Customer, Subscription
+
+
+def _customers():
+    alice = Customer.objects.create(
+        id="ctm_alice", email="alice@example.com", name="Alice", custom_data={"account_id": "42"}
+    )
+    bob = Customer.objects.create(id="ctm_bob", email="bob@example.org", name="Bob Builder")
+    return alice, bob
+
+
+def test_customer_search_matches_email_name_and_custom_data(db):
+    alice, bob = _customers()
+
+    assert list(Customer.objects.search("EXAMPLE.COM")) == [alice]
+    assert list(Customer.objects.search("builder")) == [bob]
+    assert list(Customer.objects.search("42")) == [alice]
+
+
+def test_customer_search_by_paddle_id(db):
+    alice, _ = _customers()
+
+    assert list(Customer.objects.search("ctm_alice")) == [alice]
+    assert list(Customer.objects.search("ctm_unknown")) == []
+
+
+def test_subscription_search_matches_customer_email(db):
+    alice, bob = _customers()
+    subscription = Subscription.objects.create(id="sub_1", customer=alice, status="active")
+    Subscription.objects.create(id="sub_2", customer=bob, status="active")
+
+    assert list(Subscription.objects.search("alice@")) == [subscription]
+
+
+def test_empty_search_returns_everything(db):
+    _customers()
+
+    assert Customer.objects.search("  ").count() == 2
@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import datetime as dt
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from django_paddle_billing import synthetic
+from django_paddle_billing.models import Customer, Subscription, SubscriptionItem, Transaction, TransactionItem
+
+END = dt.datetime(2024, 6, 30, tzinfo=dt.timezone.utc)
+
+
+def test_generation_is_seeded():
+    def ids(seed):
+        generator = synthetic.DatasetGenerator(seed=seed, products=3, discounts=2, months=6, end=END)
+        return [
+            (bundle.customer.id, [s.id for s in bundle.subscriptions], [t.id for t in bundle.transactions])
+            for bundle in generator.generate(20)
+        ]
+
+    assert ids(1) == ids(1)
+    assert ids(1) != ids(2)
+
+
+def test_generation_with_a_small_catalog():
+    generator = synthetic.DatasetGenerator(seed=1, products=1, months=6, end=END)
+    subscriptions = [s for bundle in generator.generate(100) for s in bundle.subscriptions]
+
+    assert subscriptions
+    assert all(len(s.items) == 1 for s in subscriptions)
+
+
+@pytest.mark.parametrize("use_from_paddle_data", [False, True])
+def test_generate_paddle_dataset(db, use_from_paddle_data):
+    out = StringIO()
+    options = {"customers": 30, "seed": 1, "months": 6, "end_date": END.date(), "batch_size": 7}
+    call_command("generate_paddle_dataset", use_from_paddle_data=use_from_paddle_data, stdout=out, **options)
+    assert "Successfully generated 30 customers" in out.getvalue()
+
+    generator = synthetic.DatasetGenerator(seed=1, months=6, end=END)
+    bundles = list(generator.generate(30))
+    assert Customer.objects.count() == 30
+    assert Subscription.objects.count() == sum(len(bundle.subscriptions) for bundle in bundles)
+    assert Transaction.objects.count() == sum(len(bundle.transactions) for bundle in bundles)
+    assert SubscriptionItem.objects.count() == sum(len(s.items) for b in bundles for s in b.subscriptions)
+    assert TransactionItem.objects.count() == sum(len(t.items) for b in bundles for t in b.transactions)
+    assert Subscription.objects.filter(status="active", mrr__gt=0).exists()
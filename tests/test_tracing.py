@@ -0,0 +1,94 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import json
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+import requests
+from apiclient import HeaderAuthentication
+from paddle_billing_client.client import PaddleApiClient
+from paddle_billing_client.models.product import ProductsResponse
+
+from django_paddle_billing import models, tracing
+
+PRODUCTS = {
+    "data": [
+        {"id": "pro_tracing1", "name": "Basic", "tax_category": "saas", "status": "active"},
+        {"id": "pro_tracing2", "name": "Pro", "tax_category": "saas", "status": "active"},
+    ],
+    "meta": {
+        "request_id": "req_tracing",
+        "pagination": {"per_page": 50, "next": "", "has_more": False, "estimated_total": 2},
+    },
+}
+
+
+class RecordingTracer:
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None, **kwargs):
+        span = SimpleNamespace(name=name, attributes=dict(attributes or {}))
+        span.set_attribute = span.attributes.__setitem__
+        self.spans.append(span)
+        yield span
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    tracer = RecordingTracer()
+    monkeypatch.setattr(tracing, "get_tracer", lambda: tracer)
+    return tracer
+
+
+def test_sync_spans(db, tracer, monkeypatch):
+    monkeypatch.setattr(
+        models.paddle_client._client, "list_products", lambda **kwargs: ProductsResponse.model_validate(PRODUCTS)
+    )
+
+    with tracing.sync_span("Product"):
+        models.Product.sync_from_paddle()
+
+    spans = {span.name: span for span in tracer.spans}
+    assert spans["paddle.sync"].attributes == {"paddle.resource": "Product", "paddle.rows_written": 2}
+    assert spans["paddle.page"].attributes == {"paddle.resource": "Product", "paddle.page": 0, "paddle.page_size": 2}
+    assert spans["paddle.client.list_products"].attributes == {"paddle.operation": "list_products"}
+    assert [span.attributes["paddle.id"] for span in tracer.spans if span.name == "paddle.from_paddle_data"] == [
+        "pro_tracing1",
+        "pro_tracing2",
+    ]
+
+
+def test_http_span(tracer):
+    client = PaddleApiClient(
+        base_url="https://sandbox-api.paddle.com",
+        authentication_method=HeaderAuthentication(token="test"),
+        request_strategy=tracing.TracingRequestStrategy(),
+    )
+
+    def get(url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(PRODUCTS).encode()
+        response.headers["Content-Type"] = "application/json"
+        return response
+
+    client.set_session(SimpleNamespace(get=get))
+    assert len(client.list_products().data) == 2
+
+    (span,) = tracer.spans
+    assert span.name == "paddle.http"
+    assert span.attributes == {
+        "http.method": "GET",
+        "http.url": "https://sandbox-api.paddle.com/products",
+        "http.status_code": 200,
+    }
+
+
+def test_no_op_by_default():
+    with tracing.span("paddle.test", paddle__resource="Product") as span:
+        span.set_attribute("paddle.rows_written", 1)
+    assert isinstance(tracing.get_tracer(), tracing.NoOpTracer)
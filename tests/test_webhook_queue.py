@@ -0,0 +1,144 @@
+# SPDX-FileCopyrightText: 2023-present Benjamin Gervan <benjamin@websideproject.com>
+#
+# SPDX-License-Identifier: MIT
+import datetime as dt
+import hashlib
+import hmac
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.utils import timezone
+
+from django_paddle_billing import webhook_queue
+from django_paddle_billing.management.commands.process_webhook_queue import Command
+from django_paddle_billing.models import Customer, WebhookEvent
+from django_paddle_billing.settings import settings as default_settings
+
+
+def notification(event_id, email, occurred_at, customer_id="ctm_queue"):
+    return {
+        "notification_id": f"ntf_{event_id}",
+        "event_id": event_id,
+        "event_type": "customer.updated",
+        "occurred_at": occurred_at,
+        "data": {"id": customer_id, "email": email, "status": "active", "marketing_consent": False},
+    }
+
+
+def post_webhook(body):
+    body = json.dumps(body)
+    signature = hmac.new(
+        default_settings["PADDLE_SECRET_KEY"].encode(), f"1700000000:{body}".encode(), hashlib.sha256
+    ).hexdigest()
+    return Client().post(
+        "/webhook/",
+        body,
+        content_type="application/json",
+        HTTP_PADDLE_SIGNATURE=f"ts=1700000000;h1={signature}",
+        HTTP_X_FORWARDED_FOR=default_settings["PADDLE_SANDBOX_IPS"][0],
+    )
+
+
+@pytest.mark.usefixtures("db")
+def test_queued_webhooks_are_processed_by_the_worker(monkeypatch):
+    monkeypatch.setitem(default_settings, "WEBHOOK_QUEUE", True)
+    assert post_webhook(notification("evt_1", "first@example.com", "2024-01-01T00:00:00Z")).status_code == 200
+    assert post_webhook(notification("evt_2", "second@example.com", "2024-01-02T00:00:00Z")).status_code == 200
+    # Paddle delivers an event again when the response was lost
+    assert post_webhook(notification("evt_1", "first@example.com", "2024-01-01T00:00:00Z")).status_code == 200
+    assert WebhookEvent.objects.count() == 2
+    assert not Customer.objects.exists()
+
+    out = StringIO()
+    call_command("process_webhook_queue", once=True, stdout=out)
+
+    assert "Successfully processed 2 events (0 failed)" in out.getvalue()
+    assert Customer.objects.get(pk="ctm_queue").email == "second@example.com"
+    assert set(WebhookEvent.objects.values_list("status", flat=True)) == {"done"}
+
+
+@pytest.mark.usefixtures("db")
+def test_events_of_an_entity_are_claimed_in_order():
+    webhook_queue.enqueue(notification("evt_a1", "a1@example.com", "2024-01-01T00:00:00Z", "ctm_a"))
+    webhook_queue.enqueue(notification("evt_a2", "a2@example.com", "2024-01-02T00:00:00Z", "ctm_a"))
+    webhook_queue.enqueue(notification("evt_b1", "b1@example.com", "2024-01-01T00:00:00Z", "ctm_b"))
+
+    events = webhook_queue.claim("worker-1")
+    assert [event.event_id for event in events] == ["evt_a1", "evt_b1"]
+    # Leased events and the events behind them are not claimed by other workers
+    assert webhook_queue.claim("worker-2") == []
+
+    assert webhook_queue.process(events[0], "worker-1")
+    assert [event.event_id for event in webhook_queue.claim("worker-2")] == ["evt_a2"]
+
+    partition = webhook_queue.get_partition("ctm_b")
+    other_partitions = [p for p in range(default_settings["WEBHOOK_QUEUE_PARTITIONS"]) if p != partition]
+    WebhookEvent.objects.filter(event_id="evt_b1").update(lease_expires_at=timezone.now())
+    assert webhook_queue.claim("worker-3", other_partitions) == []
+    assert [event.event_id for event in webhook_queue.claim("worker-3", [partition])] == ["evt_b1"]
+
+
+@pytest.mark.usefixtures("db")
+def test_events_claimed_again_after_their_lease_are_skipped():
+    webhook_queue.enqueue(notification("evt_slow", "slow@example.com", "2024-01-01T00:00:00Z"))
+    (event,) = webhook_queue.claim("worker-1", lease_seconds=1)
+    # The batch of worker-1 took longer than the lease
+    WebhookEvent.objects.update(lease_expires_at=timezone.now() - dt.timedelta(seconds=1))
+    (claimed,) = webhook_queue.claim("worker-2")
+
+    assert webhook_queue.process(event, "worker-1") is None
+    assert not Customer.objects.exists()
+    webhook_queue.release([event], "worker-1")
+    assert WebhookEvent.objects.get().leased_by == "worker-2"
+
+    assert webhook_queue.process(claimed, "worker-2")
+    assert WebhookEvent.objects.get().status == WebhookEvent.Status.DONE
+
+
+@pytest.mark.usefixtures("db")
+def test_the_lease_is_extended_when_processing_starts():
+    webhook_queue.enqueue(notification("evt_late", "late@example.com", "2024-01-01T00:00:00Z"))
+    (event,) = webhook_queue.claim("worker-1", lease_seconds=1)
+    # Expired while the earlier events of the batch were processed, not claimed by another worker yet
+    WebhookEvent.objects.update(lease_expires_at=timezone.now() - dt.timedelta(seconds=1))
+
+    assert webhook_queue.renew(event, "worker-1", lease_seconds=60)
+    assert webhook_queue.claim("worker-2") == []
+    assert webhook_queue.process(event, "worker-1")
+
+
+@pytest.mark.usefixtures("db")
+def test_failed_events_are_retried(monkeypatch):
+    monkeypatch.setitem(default_settings, "WEBHOOK_QUEUE_MAX_ATTEMPTS", 2)
+    webhook_queue.enqueue(notification("evt_bad", "not an email", "2024-01-01T00:00:00Z"))
+    WebhookEvent.objects.update(payload={"id": "ctm_queue"})
+
+    (event,) = webhook_queue.claim("worker-1")
+    assert not webhook_queue.process(event, "worker-1")
+    event.refresh_from_db()
+    assert event.status == "pending"
+    assert event.available_at > timezone.now()
+    assert "ValidationError" in event.last_error
+
+    WebhookEvent.objects.update(available_at=timezone.now() - dt.timedelta(seconds=1))
+    (event,) = webhook_queue.claim("worker-1")
+    assert not webhook_queue.process(event, "worker-1")
+    event.refresh_from_db()
+    assert event.status == "failed"
+    assert event.attempts == 2
+
+
+@pytest.mark.usefixtures("db")
+def test_lanes_give_back_the_events_not_started_on_shutdown():
+    webhook_queue.enqueue(notification("evt_stop", "stop@example.com", "2024-01-01T00:00:00Z"))
+    events = webhook_queue.claim("worker-1")
+    command = Command()
+    command.stopping = True
+    command.lease_seconds = None
+
+    assert command.process_event(events[0], "worker-1") is None
+    event = WebhookEvent.objects.get()
+    assert (event.status, event.leased_by, event.attempts) == (WebhookEvent.Status.PENDING, "", 0)